@@ -23,6 +23,51 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
 
+    # Eksekusi service CPU-bound dari route async (services/executor.py)
+    # executor_backend: "thread" atau "process" (method_pool_workers proses)
+    executor_backend: str = "thread"
+    method_pool_workers: int = 4
+    method_timeout_seconds: float = 60.0
+
+    # Batas service yang berjalan bersamaan per kelas endpoint
+    analytics_concurrency: int = 4
+    export_concurrency: int = 2
+    forecast_concurrency: int = 2
+    recommendation_concurrency: int = 4
+    ingest_concurrency: int = 1
+
+    # Cache deret waktu agregat dari database (forecast-from-database)
+    series_cache_size: int = 128
+
+    # Cache profil data per hash isi file
+    profile_cache_size: int = 32
+
+    # Ingestion upload delivery ke database (baris per batch insert)
+    ingest_batch_size: int = 50_000
+
+    # Cache dataset bersama antar worker (Arrow IPC yang di-memory-map)
+    # dataset_cache_dir kosong = /dev/shm jika cukup besar, selain itu
+    # artifact_dir/datasets
+    dataset_cache_enabled: bool = True
+    dataset_cache_dir: str = ""
+    dataset_cache_max_bytes: int = 1_073_741_824
+
+    # Instrumentasi request: header Server-Timing dan metric Prometheus di
+    # /metrics. metrics_sample_rate = porsi request yang diukur (0 = mati)
+    metrics_sample_rate: float = 1.0
+    server_timing_enabled: bool = True
+
+    # Job queue lokal (tabel SQLite dan hasil di artifact_dir/jobs)
+    job_workers: int = 2
+    job_result_ttl_seconds: int = 86_400
+
+    # Model Artifacts (prediksi durasi delivery, index rekomendasi)
+    artifact_dir: str = "artifacts"
+
+    # Index Rekomendasi (dibangun dari DeliveryData)
+    recommendation_index_top_k: int = 20
+    recommendation_index_refresh_seconds: int = 300
+
     class Config:
         env_file = ".env"
         case_sensitive = False
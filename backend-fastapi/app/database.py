@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine
+import logging
+from typing import Dict, List
+
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .services.metrics import instrument_engine
 
 # For SQLite, add check_same_thread=False
 connect_args = {}
@@ -13,6 +17,9 @@ engine = create_engine(
     connect_args=connect_args,
     echo=settings.debug,
 )
+instrument_engine(engine)
+
+logger = logging.getLogger(__name__)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -33,3 +40,79 @@ def init_db():
     from .models import User, Restaurant, DeliveryData
 
     Base.metadata.create_all(bind=engine)
+    missing = missing_columns()
+    if missing:
+        # Tabel milik Prisma tidak di-ALTER otomatis: schema.prisma sumbernya
+        logger.warning(
+            "Kolom belum ada di database: %s. Jalankan `npm run db:push` "
+            "(schema.prisma) atau, untuk database SQLite, "
+            "`python -m app.database`",
+            ", ".join(
+                f"{table}.{column}"
+                for table, columns in missing.items()
+                for column in columns
+            ),
+        )
+
+
+def missing_columns() -> Dict[str, List[str]]:
+    """
+    Kolom model yang belum ada di tabel yang sudah ada
+    (create_all hanya membuat tabel baru, tidak meng-ALTER tabel lama)
+    """
+    from .models import User, Restaurant, DeliveryData
+
+    inspector = inspect(engine)
+    missing = {}
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        columns = [
+            column.name for column in table.columns if column.name not in existing
+        ]
+        if columns:
+            missing[table.name] = columns
+    return missing
+
+
+def add_missing_columns() -> Dict[str, List[str]]:
+    """
+    Menambahkan kolom nullable baru dari model ke tabel yang sudah ada (hanya
+    SQLite, dijalankan manual lewat `python -m app.database`). Kolom
+    DeliveryData juga tercatat di prisma/schema.prisma sehingga
+    `prisma db push` tidak menghapusnya
+    Returns:
+        {tabel: [kolom yang ditambahkan]}
+    """
+    if engine.dialect.name != "sqlite":
+        raise ValueError(
+            "Kolom hanya ditambahkan otomatis di SQLite; database lain "
+            "disinkronkan lewat prisma/schema.prisma"
+        )
+    missing = missing_columns()
+    with engine.begin() as conn:
+        for table_name, columns in missing.items():
+            table = Base.metadata.tables[table_name]
+            for name in columns:
+                column = table.c[name]
+                if not column.nullable:
+                    raise ValueError(
+                        f"Kolom {table_name}.{name} NOT NULL tidak bisa ditambahkan"
+                    )
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(
+                        f'ALTER TABLE "{table_name}" ADD COLUMN "{name}" {column_type}'
+                    )
+                )
+    return missing
+
+
+if __name__ == "__main__":
+    # Lewat modul app.database (bukan __main__) agar memakai Base yang sama
+    # dengan model
+    from . import database
+
+    added = database.add_missing_columns()
+    print(added or "Tidak ada kolom yang perlu ditambahkan")
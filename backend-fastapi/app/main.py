@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from .config import settings
 from .database import init_db
+from .services.metrics import MetricsMiddleware, TimedJSONResponse, render_metrics
 from .routers import (
     users_router,
     restaurants_router,
@@ -11,6 +13,8 @@ from .routers import (
     forecasting_router,
     recommendation_router,
     analytics_data_router,
+    delivery_model_router,
+    jobs_router,
 )
 
 app = FastAPI(
@@ -24,6 +28,8 @@ app = FastAPI(
     - **Restaurants Management** - CRUD untuk data restoran
     - **Delivery Data** - CRUD dan analisis data pengiriman pizza
     - **Analytics** - Analisis data menggunakan Polars
+    - **Delivery Model** - Prediksi durasi delivery (ridge regression) dengan batch scoring
+    - **Jobs** - Job queue lokal untuk upload, cleaning, dan forecasting yang berat
     
     ## Tech Stack:
     - FastAPI (Python web framework)
@@ -33,6 +39,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=TimedJSONResponse,
 )
 
 # Configure CORS
@@ -42,8 +49,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Server-Timing + histogram per endpoint/stage (paling luar agar CORS ikut terukur)
+app.add_middleware(MetricsMiddleware)
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -72,6 +83,14 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Metric Prometheus (latensi, baris, bytes, memori per endpoint dan stage)"""
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # Include routers
 app.include_router(users_router, prefix="/api/v1/users", tags=["Users"])
 
@@ -103,5 +122,11 @@ app.include_router(
     analytics_data_router, prefix="/api/v1/analytics-data", tags=["Analytics Data"]
 )
 
+app.include_router(
+    delivery_model_router, prefix="/api/v1/delivery-model", tags=["Delivery Model"]
+)
+
+app.include_router(jobs_router, prefix="/api/v1/jobs", tags=["Jobs"])
+
 
 # Run with: uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
@@ -75,7 +75,11 @@ class DeliveryData(Base):
 
     uploadedBy = Column(String(50))
     uploadedAt = Column(DateTime, server_default=func.now())
+    # Waktu upsert terakhir yang mengubah isi baris (uploadedAt tetap)
+    updatedAt = Column(DateTime, nullable=True)
     validatedAt = Column(DateTime, nullable=True)
     validatedBy = Column(String(50), nullable=True)
     qualityScore = Column(Float)
     version = Column(Integer, default=1)
+    # Hash isi baris untuk upsert idempoten (lihat services/ingestion.py)
+    rowHash = Column(String(16), nullable=True)
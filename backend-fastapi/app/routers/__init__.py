@@ -6,3 +6,5 @@ from .export_clean import router as export_clean_router
 from .forecasting import router as forecasting_router
 from .recommendation import router as recommendation_router
 from .analytics_data import router as analytics_data_router
+from .delivery_model import router as delivery_model_router
+from .jobs import router as jobs_router
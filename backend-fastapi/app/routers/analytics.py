@@ -1,10 +1,26 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from typing import Dict, Any
+import polars as pl
+from ..services.dataset_cache import load_upload
+from ..services.executor import run_service
 from ..services.polars_service import PolarsDataProcessor
 
 router = APIRouter()
 
 
+def _full_analysis(df: pl.DataFrame) -> Dict[str, Any]:
+    """Semua metrics dalam satu panggilan service (satu giliran executor)"""
+    return {
+        "summary": PolarsDataProcessor.get_sales_summary(df),
+        "delivery_performance": PolarsDataProcessor.get_delivery_performance(df),
+        "orders_by_hour": PolarsDataProcessor.get_orders_by_hour(df),
+        "orders_by_month": PolarsDataProcessor.get_orders_by_month(df),
+        "traffic_analysis": PolarsDataProcessor.get_traffic_analysis(df),
+        "pizza_analysis": PolarsDataProcessor.get_pizza_analysis(df),
+        "payment_analysis": PolarsDataProcessor.get_payment_analysis(df),
+    }
+
+
 @router.post("/upload-excel")
 async def upload_excel(file: UploadFile = File(...)):
     """Upload dan proses file Excel menggunakan Polars"""
@@ -15,7 +31,7 @@ async def upload_excel(file: UploadFile = File(...)):
 
     try:
         contents = await file.read()
-        df = PolarsDataProcessor.read_excel_file(contents)
+        df = await run_service("analytics", load_upload, contents, file.filename)
 
         return {
             "filename": file.filename,
@@ -37,8 +53,10 @@ async def upload_and_clean_excel(file: UploadFile = File(...)):
 
     try:
         contents = await file.read()
-        df = PolarsDataProcessor.read_excel_file(contents)
-        cleaned_df = PolarsDataProcessor.clean_delivery_data(df)
+        df = await run_service("analytics", load_upload, contents, file.filename)
+        cleaned_df = await run_service(
+            "analytics", PolarsDataProcessor.clean_delivery_data, df
+        )
 
         return {
             "filename": file.filename,
@@ -60,8 +78,10 @@ async def analyze_summary(file: UploadFile = File(...)):
 
     try:
         contents = await file.read()
-        df = PolarsDataProcessor.read_excel_file(contents)
-        summary = PolarsDataProcessor.get_sales_summary(df)
+        df = await run_service("analytics", load_upload, contents, file.filename)
+        summary = await run_service(
+            "analytics", PolarsDataProcessor.get_sales_summary, df
+        )
 
         return summary
     except Exception as e:
@@ -78,8 +98,10 @@ async def analyze_delivery_performance(file: UploadFile = File(...)):
 
     try:
         contents = await file.read()
-        df = PolarsDataProcessor.read_excel_file(contents)
-        performance = PolarsDataProcessor.get_delivery_performance(df)
+        df = await run_service("analytics", load_upload, contents, file.filename)
+        performance = await run_service(
+            "analytics", PolarsDataProcessor.get_delivery_performance, df
+        )
 
         return performance
     except Exception as e:
@@ -96,8 +118,10 @@ async def analyze_orders_by_hour(file: UploadFile = File(...)):
 
     try:
         contents = await file.read()
-        df = PolarsDataProcessor.read_excel_file(contents)
-        result = PolarsDataProcessor.get_orders_by_hour(df)
+        df = await run_service("analytics", load_upload, contents, file.filename)
+        result = await run_service(
+            "analytics", PolarsDataProcessor.get_orders_by_hour, df
+        )
 
         return result
     except Exception as e:
@@ -114,8 +138,10 @@ async def analyze_orders_by_month(file: UploadFile = File(...)):
 
     try:
         contents = await file.read()
-        df = PolarsDataProcessor.read_excel_file(contents)
-        result = PolarsDataProcessor.get_orders_by_month(df)
+        df = await run_service("analytics", load_upload, contents, file.filename)
+        result = await run_service(
+            "analytics", PolarsDataProcessor.get_orders_by_month, df
+        )
 
         return result
     except Exception as e:
@@ -132,8 +158,10 @@ async def analyze_traffic(file: UploadFile = File(...)):
 
     try:
         contents = await file.read()
-        df = PolarsDataProcessor.read_excel_file(contents)
-        result = PolarsDataProcessor.get_traffic_analysis(df)
+        df = await run_service("analytics", load_upload, contents, file.filename)
+        result = await run_service(
+            "analytics", PolarsDataProcessor.get_traffic_analysis, df
+        )
 
         return result
     except Exception as e:
@@ -150,8 +178,10 @@ async def analyze_pizza(file: UploadFile = File(...)):
 
     try:
         contents = await file.read()
-        df = PolarsDataProcessor.read_excel_file(contents)
-        result = PolarsDataProcessor.get_pizza_analysis(df)
+        df = await run_service("analytics", load_upload, contents, file.filename)
+        result = await run_service(
+            "analytics", PolarsDataProcessor.get_pizza_analysis, df
+        )
 
         return result
     except Exception as e:
@@ -168,8 +198,10 @@ async def analyze_payment(file: UploadFile = File(...)):
 
     try:
         contents = await file.read()
-        df = PolarsDataProcessor.read_excel_file(contents)
-        result = PolarsDataProcessor.get_payment_analysis(df)
+        df = await run_service("analytics", load_upload, contents, file.filename)
+        result = await run_service(
+            "analytics", PolarsDataProcessor.get_payment_analysis, df
+        )
 
         return result
     except Exception as e:
@@ -186,16 +218,8 @@ async def analyze_full(file: UploadFile = File(...)):
 
     try:
         contents = await file.read()
-        df = PolarsDataProcessor.read_excel_file(contents)
+        df = await run_service("analytics", load_upload, contents, file.filename)
 
-        return {
-            "summary": PolarsDataProcessor.get_sales_summary(df),
-            "delivery_performance": PolarsDataProcessor.get_delivery_performance(df),
-            "orders_by_hour": PolarsDataProcessor.get_orders_by_hour(df),
-            "orders_by_month": PolarsDataProcessor.get_orders_by_month(df),
-            "traffic_analysis": PolarsDataProcessor.get_traffic_analysis(df),
-            "pizza_analysis": PolarsDataProcessor.get_pizza_analysis(df),
-            "payment_analysis": PolarsDataProcessor.get_payment_analysis(df),
-        }
+        return await run_service("analytics", _full_analysis, df)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -10,7 +10,7 @@ router = APIRouter()
 
 
 @router.get("/all-data")
-async def get_all_data_for_analytics(
+def get_all_data_for_analytics(
     restaurant_id: Optional[str] = Query(None), db: Session = Depends(get_db)
 ):
     """Get all delivery data for analytics, forecasting, and recommendation"""
@@ -51,7 +51,7 @@ async def get_all_data_for_analytics(
 
 
 @router.get("/summary")
-async def get_data_summary(
+def get_data_summary(
     restaurant_id: Optional[str] = Query(None), db: Session = Depends(get_db)
 ):
     """Get summary of delivery data for dashboard"""
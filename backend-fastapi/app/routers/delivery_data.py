@@ -1,4 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -10,6 +18,10 @@ from ..schemas.delivery_data import (
     DeliveryDataFilter,
 )
 from ..models import DeliveryData
+from ..services.executor import run_local
+from ..services.ingestion import INGEST_MODES, ingest_delivery_upload
+from ..services.job_queue import get_job, submit_job
+from ..services.series_cache import invalidate_series_cache
 
 router = APIRouter()
 
@@ -30,6 +42,7 @@ def create_delivery_data(delivery: DeliveryDataCreate, db: Session = Depends(get
     new_delivery = DeliveryData(**delivery.model_dump())
     db.add(new_delivery)
     db.commit()
+    invalidate_series_cache()
     db.refresh(new_delivery)
     return new_delivery
 
@@ -52,9 +65,84 @@ def create_bulk_delivery_data(
             created_count += 1
 
     db.commit()
+    invalidate_series_cache()
     return {"created": created_count, "total": len(deliveries)}
 
 
+@router.post("/ingest")
+async def ingest_delivery_file(
+    file: UploadFile = File(...),
+    restaurant_id: str = Query(..., description="ID restoran untuk semua baris"),
+    uploaded_by: Optional[str] = Query(None, description="ID/email pengunggah"),
+    batch_size: Optional[int] = Query(None, description="Baris per batch insert"),
+    mode: str = Query(
+        "insert",
+        description="insert (tolak Order ID yang sudah ada) | "
+        "upsert (perbarui baris yang berubah, naikkan version)",
+    ),
+    background: bool = Query(
+        False, description="Jalankan sebagai job; pantau via /ingest/{job_id}"
+    ),
+):
+    """
+    Ingest file delivery (Excel/CSV/Parquet/JSON) ke database: validasi dan
+    cleansing vektor dengan Polars lalu bulk insert per batch
+    Mode upsert: re-upload export yang sudah dikoreksi hanya menulis baris
+    yang isinya berubah (idempoten, version dinaikkan per perubahan)
+    """
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+    if mode not in INGEST_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Mode ingest harus salah satu dari: {', '.join(INGEST_MODES)}",
+        )
+
+    contents = await file.read()
+    if background:
+        try:
+            job = submit_job(
+                "ingest",
+                {
+                    "restaurant_id": restaurant_id,
+                    "uploaded_by": uploaded_by,
+                    "batch_size": batch_size,
+                    "mode": mode,
+                },
+                contents=contents,
+                filename=file.filename,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"success": True, "job_id": job["id"], "status": job["status"]}
+
+    try:
+        result = await run_local(
+            "ingest",
+            ingest_delivery_upload,
+            contents,
+            file.filename,
+            restaurant_id,
+            uploaded_by,
+            batch_size,
+            mode=mode,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"success": True, **result}
+
+
+@router.get("/ingest/{job_id}")
+def get_ingest_status(job_id: str):
+    """Progress dan status job ingest (hasil lengkap di /api/v1/jobs/{job_id}/result)"""
+    job = get_job(job_id)
+    if job is None or job["kind"] != "ingest":
+        raise HTTPException(status_code=404, detail="Job ingest tidak ditemukan")
+    return job
+
+
 @router.get("/", response_model=List[DeliveryDataResponse])
 def get_delivery_data(
     skip: int = 0,
@@ -101,6 +189,7 @@ def update_delivery_data(
         setattr(delivery, key, value)
 
     db.commit()
+    invalidate_series_cache()
     db.refresh(delivery)
     return delivery
 
@@ -114,6 +203,7 @@ def delete_delivery_data(delivery_id: str, db: Session = Depends(get_db)):
 
     db.delete(delivery)
     db.commit()
+    invalidate_series_cache()
     return None
 
 
@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..database import get_db
+from ..services.dataset_cache import load_delivery_frame, load_upload
+from ..services.executor import run_service
+from ..services.polars_service import PolarsDataProcessor
+from ..services.delivery_model import (
+    FEATURE_COLUMNS,
+    TARGET_COLUMN,
+    DeliveryDurationModel,
+    list_model_versions,
+    load_model,
+    save_model,
+)
+
+router = APIRouter()
+
+
+@router.post("/train")
+def train_delivery_model(
+    restaurant_id: Optional[str] = Query(None, description="Filter restoran"),
+    alpha: float = Query(1.0, description="Kekuatan regularisasi ridge"),
+    test_fraction: float = Query(0.2, description="Porsi data holdout"),
+    db: Session = Depends(get_db),
+):
+    """Melatih model durasi delivery dari tabel DeliveryData"""
+    try:
+        df = load_delivery_frame(db, restaurant_id).select(
+            FEATURE_COLUMNS + [TARGET_COLUMN]
+        )
+        model = DeliveryDurationModel.fit(df, alpha=alpha, test_fraction=test_fraction)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    model = save_model(model)
+    return {"success": True, "model": model.to_dict()}
+
+
+@router.post("/train/upload")
+async def train_delivery_model_from_file(
+    file: UploadFile = File(...),
+    alpha: float = Query(1.0, description="Kekuatan regularisasi ridge"),
+    test_fraction: float = Query(0.2, description="Porsi data holdout"),
+):
+    """Melatih model durasi delivery dari file upload"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    try:
+        contents = await file.read()
+
+        df = await run_service("forecast", load_upload, contents, file.filename)
+
+        model = await run_service(
+            "forecast",
+            DeliveryDurationModel.fit,
+            df,
+            alpha=alpha,
+            test_fraction=test_fraction,
+        )
+        model = save_model(model)
+
+        return {"success": True, "model": model.to_dict()}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/predict")
+async def predict_delivery_duration(
+    file: UploadFile = File(...),
+    version: Optional[int] = Query(None, description="Versi model (default terbaru)"),
+    id_column: str = Query("orderId", description="Kolom ID pesanan pada output"),
+):
+    """Batch scoring durasi delivery untuk semua baris dalam file"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    model = load_model(version)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Model not found")
+
+    try:
+        contents = await file.read()
+
+        df = await run_service("forecast", load_upload, contents, file.filename)
+
+        df = await run_service(
+            "forecast", PolarsDataProcessor.normalize_delivery_columns, df
+        )
+        predictions = await run_service("forecast", model.predict, df)
+
+        return {
+            "success": True,
+            "model_version": model.version,
+            "rows": len(df),
+            "order_ids": df[id_column].to_list() if id_column in df.columns else None,
+            "predicted_duration": predictions.round(2).tolist(),
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/versions")
+def get_model_versions():
+    """Daftar versi model yang tersedia"""
+    return {"versions": list_model_versions()}
+
+
+@router.get("/info")
+def get_model_info(
+    version: Optional[int] = Query(None, description="Versi model (default terbaru)")
+):
+    """Metadata, koefisien, dan metrik model"""
+    model = load_model(version)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Model not found")
+    return model.to_dict()
@@ -1,6 +1,18 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import json
+from ..database import get_db
+from ..services.dataset_cache import load_delivery_frame, load_upload
+from ..services.executor import run_local, run_service
 from ..services.polars_service import PolarsDataProcessor
+from ..services.profile_cache import dataset_hash, get_profile
+from ..services.series_cache import delivery_fingerprint
+from ..services.upload_validation import (
+    CATEGORY_DOMAINS,
+    cleanse_delivery_upload,
+    validate_headers,
+)
 
 router = APIRouter()
 
@@ -14,18 +26,9 @@ async def export_to_csv(file: UploadFile = File(...)):
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
+        df = await run_service("export", load_upload, contents, file.filename)
 
-        csv_data = PolarsDataProcessor.export_to_csv(df)
+        csv_data = await run_service("export", PolarsDataProcessor.export_to_csv, df)
 
         return {
             "success": True,
@@ -47,18 +50,9 @@ async def export_to_json(file: UploadFile = File(...)):
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
+        df = await run_service("export", load_upload, contents, file.filename)
 
-        json_data = PolarsDataProcessor.export_to_json(df)
+        json_data = await run_service("export", PolarsDataProcessor.export_to_json, df)
 
         return {
             "success": True,
@@ -80,18 +74,11 @@ async def export_to_parquet(file: UploadFile = File(...)):
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
+        df = await run_service("export", load_upload, contents, file.filename)
 
-        parquet_data = PolarsDataProcessor.export_to_parquet(df)
+        parquet_data = await run_service(
+            "export", PolarsDataProcessor.export_to_parquet, df
+        )
 
         import base64
 
@@ -113,6 +100,7 @@ async def clean_data(
     drop_duplicates: bool = Query(True),
     trim_strings: bool = Query(True),
     fill_null_strategy: Optional[str] = Query(None),
+    dry_run: bool = Query(False, description="Hanya tampilkan rencana dan dampak"),
 ):
     """Membersihkan data dengan berbagai strategi"""
     if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
@@ -121,16 +109,7 @@ async def clean_data(
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
+        df = await run_service("export", load_upload, contents, file.filename)
 
         original_rows = len(df)
 
@@ -142,13 +121,66 @@ async def clean_data(
                 if df[col].dtype in [pl.Float64, pl.Int64, pl.Int32]
             }
 
-        cleaned_df = PolarsDataProcessor.clean_data(
-            df,
+        plan = PolarsDataProcessor.build_cleaning_plan(
             drop_nulls=drop_nulls,
             drop_duplicates=drop_duplicates,
             fill_null_strategy=fill_strategy,
             trim_strings=trim_strings,
         )
+        if dry_run:
+            explanation = await run_service(
+                "export", PolarsDataProcessor.explain_cleaning_plan, df, plan
+            )
+            return {"success": True, "dry_run": True, "plan": plan, **explanation}
+
+        cleaned_df = await run_service(
+            "export", PolarsDataProcessor.apply_cleaning_plan, df, plan
+        )
+
+        return {
+            "success": True,
+            "original_rows": original_rows,
+            "cleaned_rows": len(cleaned_df),
+            "removed_rows": original_rows - len(cleaned_df),
+            "columns": cleaned_df.columns,
+            "preview": cleaned_df.head(10).to_dicts(),
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/clean-plan")
+async def clean_with_plan(
+    file: UploadFile = File(...),
+    plan: str = Form(..., description="Cleaning plan dalam format JSON (list operasi)"),
+    dry_run: bool = Query(False, description="Hanya tampilkan rencana dan dampak"),
+):
+    """Membersihkan data dengan cleaning plan deklaratif (satu lazy query)"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    try:
+        steps = json.loads(plan)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Plan bukan JSON valid: {e}")
+    if not isinstance(steps, list) or not all(isinstance(s, dict) for s in steps):
+        raise HTTPException(status_code=400, detail="Plan harus berupa list operasi")
+
+    try:
+        contents = await file.read()
+
+        df = await run_service("export", load_upload, contents, file.filename)
+
+        if dry_run:
+            explanation = await run_service(
+                "export", PolarsDataProcessor.explain_cleaning_plan, df, steps
+            )
+            return {"success": True, "dry_run": True, "plan": steps, **explanation}
+
+        original_rows = len(df)
+        cleaned_df = await run_service(
+            "export", PolarsDataProcessor.apply_cleaning_plan, df, steps
+        )
 
         return {
             "success": True,
@@ -158,6 +190,202 @@ async def clean_data(
             "columns": cleaned_df.columns,
             "preview": cleaned_df.head(10).to_dicts(),
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/validate-upload")
+async def validate_upload(
+    file: UploadFile = File(...),
+    restaurant_id: Optional[str] = Query(None, description="ID restoran"),
+    uploaded_by: Optional[str] = Query(None, description="ID/email pengunggah"),
+    include_data: bool = Query(True, description="Sertakan data hasil cleansing"),
+):
+    """Validasi dan cleansing file upload delivery (port cleansing.ts)"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    try:
+        contents = await file.read()
+
+        df = await run_service("export", load_upload, contents, file.filename)
+
+        header_errors = validate_headers(df.columns)
+        data, errors, quality_score = await run_service(
+            "export",
+            cleanse_delivery_upload,
+            df,
+            restaurant_id=restaurant_id,
+            uploaded_by=uploaded_by,
+        )
+
+        return {
+            "success": True,
+            "totalRows": len(df),
+            "qualityScore": quality_score,
+            "headerErrors": header_errors,
+            "errors": errors.to_dicts(),
+            "data": data.to_dicts() if include_data else None,
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/profile")
+async def profile_data(
+    file: UploadFile = File(...),
+    top_k: int = Query(5, description="Jumlah nilai teratas per kolom"),
+    bins: int = Query(10, description="Jumlah bin histogram"),
+    approximate: Optional[bool] = Query(
+        None, description="n_unique/quantile aproksimasi (kosong = otomatis)"
+    ),
+):
+    """Profil kualitas data (null, distinct, quantile, histogram, nilai invalid)"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    try:
+        contents = await file.read()
+
+        def compute():
+            df = load_upload(contents, file.filename)
+            return PolarsDataProcessor.profile_dataframe(
+                df,
+                top_k=top_k,
+                bins=bins,
+                approximate=approximate,
+                valid_values=CATEGORY_DOMAINS,
+            )
+
+        key = ("file", dataset_hash(contents), top_k, bins, approximate)
+        profile, cached = await run_local("export", get_profile, key, compute)
+
+        return {"success": True, "cached": cached, **profile}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/profile/db")
+def profile_database(
+    restaurant_id: Optional[str] = Query(None, description="Filter restoran"),
+    top_k: int = Query(5, description="Jumlah nilai teratas per kolom"),
+    bins: int = Query(10, description="Jumlah bin histogram"),
+    approximate: Optional[bool] = Query(
+        None, description="n_unique/quantile aproksimasi (kosong = otomatis)"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Profil kualitas data DeliveryData (termasuk distribusi qualityScore)"""
+    try:
+
+        def compute():
+            df = load_delivery_frame(db, restaurant_id)
+            return PolarsDataProcessor.profile_dataframe(
+                df,
+                top_k=top_k,
+                bins=bins,
+                approximate=approximate,
+                valid_values=CATEGORY_DOMAINS,
+            )
+
+        key = (
+            "db",
+            restaurant_id,
+            delivery_fingerprint(db, restaurant_id),
+            top_k,
+            bins,
+            approximate,
+        )
+        profile, cached = get_profile(key, compute)
+
+        return {"success": True, "cached": cached, **profile}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/outliers")
+async def handle_outliers(
+    file: UploadFile = File(...),
+    columns: Optional[List[str]] = Query(
+        None, description="Kolom numerik (kosong = semua kolom numerik)"
+    ),
+    method: str = Query("iqr", description="iqr, zscore, atau mad"),
+    mode: str = Query("flag", description="flag, clip, atau drop"),
+    threshold: Optional[float] = Query(None, description="Pengali batas outlier"),
+):
+    """Menangani outlier beberapa kolom sekaligus dengan statistik satu pass"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    try:
+        contents = await file.read()
+
+        df = await run_service("export", load_upload, contents, file.filename)
+
+        original_rows = len(df)
+        result_df, report = await run_service(
+            "export",
+            PolarsDataProcessor.handle_outliers_multi,
+            df,
+            columns=columns,
+            method=method,
+            mode=mode,
+            threshold=threshold,
+        )
+
+        return {
+            "success": True,
+            "method": method,
+            "mode": mode,
+            "original_rows": original_rows,
+            "result_rows": len(result_df),
+            "removed_rows": original_rows - len(result_df),
+            "outliers": report,
+            "preview": result_df.head(10).to_dicts(),
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/parse-dates")
+async def parse_dates(
+    file: UploadFile = File(...),
+    columns: Optional[List[str]] = Query(
+        None, description="Kolom tanggal (kosong = deteksi otomatis kolom teks)"
+    ),
+    formats: Optional[List[str]] = Query(None, description="Format kandidat strptime"),
+    excel_serial: bool = Query(True, description="Konversi angka serial Excel"),
+    sample_size: int = Query(1000, description="Jumlah baris sampel deteksi format"),
+):
+    """Parsing tanggal multi-format dengan deteksi format dari sampel"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    try:
+        contents = await file.read()
+
+        df = await run_service("export", load_upload, contents, file.filename)
+
+        parsed_df, report = await run_service(
+            "export",
+            PolarsDataProcessor.parse_dates,
+            df,
+            columns=columns,
+            formats=formats,
+            sample_size=sample_size,
+            excel_serial=excel_serial,
+        )
+
+        return {
+            "success": True,
+            "total_rows": len(parsed_df),
+            "date_columns": report,
+            "preview": parsed_df.head(10).to_dicts(),
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -167,31 +395,57 @@ async def remove_duplicates(
     file: UploadFile = File(...),
     subset: Optional[str] = Query(None),
     keep: str = Query("first"),
+    mode: str = Query("exact", description="exact atau near (near-duplicate)"),
+    time_column: Optional[str] = Query(
+        None, description="Kolom waktu yang boleh berbeda (mode near)"
+    ),
+    tolerance_seconds: float = Query(60, description="Toleransi waktu (mode near)"),
 ):
-    """Menghapus data duplikat"""
+    """
+    Menghapus data duplikat
+    Mode near menormalisasi kolom kunci dan menggabungkan baris yang waktunya
+    berselisih dalam toleransi; keep juga menerima "most_complete"
+    """
     if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
         raise HTTPException(status_code=400, detail="Format file tidak didukung")
 
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
+        df = await run_service("export", load_upload, contents, file.filename)
 
         original_rows = len(df)
 
         subset_list = subset.split(",") if subset else None
 
-        cleaned_df = PolarsDataProcessor.remove_duplicates(
-            df, subset=subset_list, keep=keep
+        if mode == "near":
+            cleaned_df, clusters = await run_service(
+                "export",
+                PolarsDataProcessor.find_near_duplicates,
+                df,
+                subset=subset_list,
+                time_column=time_column,
+                tolerance_seconds=tolerance_seconds,
+                keep=keep,
+            )
+            return {
+                "success": True,
+                "mode": mode,
+                "original_rows": original_rows,
+                "cleaned_rows": len(cleaned_df),
+                "removed_duplicates": original_rows - len(cleaned_df),
+                "total_clusters": len(clusters),
+                "clusters": clusters.head(50).to_dicts(),
+            }
+        if mode != "exact":
+            raise HTTPException(status_code=400, detail="Mode harus exact atau near")
+
+        cleaned_df = await run_service(
+            "export",
+            PolarsDataProcessor.remove_duplicates,
+            df,
+            subset=subset_list,
+            keep=keep,
         )
 
         return {
@@ -200,6 +454,10 @@ async def remove_duplicates(
             "cleaned_rows": len(cleaned_df),
             "removed_duplicates": original_rows - len(cleaned_df),
         }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
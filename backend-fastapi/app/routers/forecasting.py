@@ -1,6 +1,12 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
+from sqlalchemy.orm import Session
 from typing import Optional, List
+from functools import partial
+from ..database import get_db
 from ..services.polars_service import PolarsDataProcessor
+from ..services.dataset_cache import load_upload
+from ..services.executor import run_local, run_methods_concurrently, run_service
+from ..services.series_cache import get_aggregated_series
 
 router = APIRouter()
 
@@ -12,6 +18,13 @@ async def forecast_exponential_smoothing(
     value_column: str = Query(..., description="Nama kolom nilai yang akan diprediksi"),
     periods: int = Query(7, description="Jumlah periode ke depan"),
     span: Optional[int] = Query(None, description="Span untuk EWMA"),
+    intervals: Optional[List[float]] = Query(
+        None, description="Level prediction interval, misal 0.8 dan 0.95"
+    ),
+    interval_method: str = Query(
+        "bootstrap", description="Metode interval: bootstrap atau analytic"
+    ),
+    n_paths: int = Query(1000, description="Jumlah simulation path bootstrap"),
 ):
     """Forecasting menggunakan Exponential Smoothing (EWMA)"""
     if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
@@ -20,23 +33,19 @@ async def forecast_exponential_smoothing(
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
-
-        result = PolarsDataProcessor.forecast_exponential_smoothing(
+        df = await run_service("forecast", load_upload, contents, file.filename)
+
+        result = await run_service(
+            "forecast",
+            PolarsDataProcessor.forecast_exponential_smoothing,
             df=df,
             date_column=date_column,
             value_column=value_column,
             periods=periods,
             span=span,
+            intervals=intervals,
+            interval_method=interval_method,
+            n_paths=n_paths,
         )
 
         return result
@@ -51,6 +60,13 @@ async def forecast_moving_average(
     value_column: str = Query(..., description="Nama kolom nilai yang akan diprediksi"),
     periods: int = Query(7, description="Jumlah periode ke depan"),
     window: int = Query(7, description="Ukuran window untuk moving average"),
+    intervals: Optional[List[float]] = Query(
+        None, description="Level prediction interval, misal 0.8 dan 0.95"
+    ),
+    interval_method: str = Query(
+        "bootstrap", description="Metode interval: bootstrap atau analytic"
+    ),
+    n_paths: int = Query(1000, description="Jumlah simulation path bootstrap"),
 ):
     """Forecasting menggunakan Moving Average"""
     if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
@@ -59,23 +75,19 @@ async def forecast_moving_average(
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
-
-        result = PolarsDataProcessor.forecast_moving_average(
+        df = await run_service("forecast", load_upload, contents, file.filename)
+
+        result = await run_service(
+            "forecast",
+            PolarsDataProcessor.forecast_moving_average,
             df=df,
             date_column=date_column,
             value_column=value_column,
             periods=periods,
             window=window,
+            intervals=intervals,
+            interval_method=interval_method,
+            n_paths=n_paths,
         )
 
         return result
@@ -89,6 +101,13 @@ async def forecast_linear_trend(
     date_column: str = Query(..., description="Nama kolom tanggal"),
     value_column: str = Query(..., description="Nama kolom nilai yang akan diprediksi"),
     periods: int = Query(7, description="Jumlah periode ke depan"),
+    intervals: Optional[List[float]] = Query(
+        None, description="Level prediction interval, misal 0.8 dan 0.95"
+    ),
+    interval_method: str = Query(
+        "bootstrap", description="Metode interval: bootstrap atau analytic"
+    ),
+    n_paths: int = Query(1000, description="Jumlah simulation path bootstrap"),
 ):
     """Forecasting menggunakan Linear Trend"""
     if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
@@ -97,22 +116,18 @@ async def forecast_linear_trend(
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
-
-        result = PolarsDataProcessor.forecast_linear_trend(
+        df = await run_service("forecast", load_upload, contents, file.filename)
+
+        result = await run_service(
+            "forecast",
+            PolarsDataProcessor.forecast_linear_trend,
             df=df,
             date_column=date_column,
             value_column=value_column,
             periods=periods,
+            intervals=intervals,
+            interval_method=interval_method,
+            n_paths=n_paths,
         )
 
         return result
@@ -126,6 +141,14 @@ async def forecast_all_methods(
     date_column: str = Query(..., description="Nama kolom tanggal"),
     value_column: str = Query(..., description="Nama kolom nilai yang akan diprediksi"),
     periods: int = Query(7, description="Jumlah periode ke depan"),
+    intervals: Optional[List[float]] = Query(
+        None, description="Level prediction interval, misal 0.8 dan 0.95"
+    ),
+    interval_method: str = Query(
+        "bootstrap", description="Metode interval: bootstrap atau analytic"
+    ),
+    n_paths: int = Query(1000, description="Jumlah simulation path bootstrap"),
+    timeout: Optional[float] = Query(None, description="Batas waktu per metode (detik)"),
 ):
     """Forecasting menggunakan semua metode"""
     if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
@@ -134,36 +157,250 @@ async def forecast_all_methods(
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
-
-        return {
-            "exponential_smoothing": PolarsDataProcessor.forecast_exponential_smoothing(
-                df=df,
-                date_column=date_column,
-                value_column=value_column,
-                periods=periods,
-            ),
-            "moving_average": PolarsDataProcessor.forecast_moving_average(
-                df=df,
-                date_column=date_column,
-                value_column=value_column,
-                periods=periods,
-            ),
-            "linear_trend": PolarsDataProcessor.forecast_linear_trend(
-                df=df,
-                date_column=date_column,
-                value_column=value_column,
-                periods=periods,
-            ),
-        }
+        df = await run_service("forecast", load_upload, contents, file.filename)
+
+        # Urutkan sekali, lalu dipakai bersama oleh semua metode
+        if date_column in df.columns and value_column in df.columns:
+            df = await run_service(
+                "forecast",
+                PolarsDataProcessor.prepare_time_series,
+                df,
+                date_column,
+                value_column,
+            )
+
+        common = dict(
+            df=df,
+            date_column=date_column,
+            value_column=value_column,
+            periods=periods,
+            intervals=intervals,
+            interval_method=interval_method,
+            n_paths=n_paths,
+            presorted=True,
+        )
+
+        return await run_methods_concurrently(
+            "forecast",
+            {
+                "exponential_smoothing": partial(
+                    PolarsDataProcessor.forecast_exponential_smoothing, **common
+                ),
+                "moving_average": partial(
+                    PolarsDataProcessor.forecast_moving_average, **common
+                ),
+                "linear_trend": partial(
+                    PolarsDataProcessor.forecast_linear_trend, **common
+                ),
+            },
+            timeout=timeout,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/backtest")
+async def forecast_backtest(
+    file: UploadFile = File(...),
+    date_column: str = Query(..., description="Nama kolom tanggal"),
+    value_column: str = Query(..., description="Nama kolom nilai yang akan diprediksi"),
+    horizon: int = Query(7, description="Jumlah periode ke depan per fold"),
+    n_folds: int = Query(5, description="Jumlah fold (titik origin)"),
+    step: int = Query(1, description="Jarak antar origin"),
+    methods: Optional[List[str]] = Query(None, description="Metode yang diuji"),
+    interval: Optional[str] = Query(
+        None, description="Interval resample, misal 1d, 1w, 1mo"
+    ),
+    max_workers: Optional[int] = Query(None, description="Jumlah proses paralel"),
+    intervals: Optional[List[float]] = Query(
+        None, description="Level prediction interval yang diuji coverage-nya"
+    ),
+):
+    """Backtesting rolling-origin dengan metrik MAE/MAPE/RMSE per metode dan horizon"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    try:
+        contents = await file.read()
+
+        df = await run_service("forecast", load_upload, contents, file.filename)
+
+        result = await run_service(
+            "forecast",
+            PolarsDataProcessor.backtest_forecasts,
+            df=df,
+            date_column=date_column,
+            value_column=value_column,
+            horizon=horizon,
+            n_folds=n_folds,
+            step=step,
+            methods=methods,
+            interval=interval,
+            max_workers=max_workers,
+            intervals=intervals,
+        )
+
+        return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# ==================== FORECAST FROM DATABASE ====================
+def _load_db_series(
+    db: Session, metric: str, interval: str, restaurant_id: Optional[str]
+):
+    try:
+        return get_aggregated_series(
+            db, metric=metric, interval=interval, restaurant_id=restaurant_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/db/exponential-smoothing")
+def forecast_db_exponential_smoothing(
+    metric: str = Query("orders", description="Metrik yang diprediksi"),
+    interval: str = Query("day", description="Time bucket: hour, day, week, month"),
+    restaurant_id: Optional[str] = Query(None, description="Filter restoran"),
+    periods: int = Query(7, description="Jumlah periode ke depan"),
+    span: Optional[int] = Query(None, description="Span untuk EWMA"),
+    intervals: Optional[List[float]] = Query(
+        None, description="Level prediction interval, misal 0.8 dan 0.95"
+    ),
+    interval_method: str = Query(
+        "bootstrap", description="Metode interval: bootstrap atau analytic"
+    ),
+    n_paths: int = Query(1000, description="Jumlah simulation path bootstrap"),
+    db: Session = Depends(get_db),
+):
+    """Forecasting EWMA langsung dari tabel DeliveryData"""
+    series, cached = _load_db_series(db, metric, interval, restaurant_id)
+
+    result = PolarsDataProcessor.forecast_exponential_smoothing(
+        df=series,
+        date_column="period",
+        value_column="value",
+        periods=periods,
+        span=span,
+        intervals=intervals,
+        interval_method=interval_method,
+        n_paths=n_paths,
+        presorted=True,
+    )
+
+    return {**result, "metric": metric, "interval": interval, "cached": cached}
+
+
+@router.get("/db/moving-average")
+def forecast_db_moving_average(
+    metric: str = Query("orders", description="Metrik yang diprediksi"),
+    interval: str = Query("day", description="Time bucket: hour, day, week, month"),
+    restaurant_id: Optional[str] = Query(None, description="Filter restoran"),
+    periods: int = Query(7, description="Jumlah periode ke depan"),
+    window: int = Query(7, description="Ukuran window untuk moving average"),
+    intervals: Optional[List[float]] = Query(
+        None, description="Level prediction interval, misal 0.8 dan 0.95"
+    ),
+    interval_method: str = Query(
+        "bootstrap", description="Metode interval: bootstrap atau analytic"
+    ),
+    n_paths: int = Query(1000, description="Jumlah simulation path bootstrap"),
+    db: Session = Depends(get_db),
+):
+    """Forecasting Moving Average langsung dari tabel DeliveryData"""
+    series, cached = _load_db_series(db, metric, interval, restaurant_id)
+
+    result = PolarsDataProcessor.forecast_moving_average(
+        df=series,
+        date_column="period",
+        value_column="value",
+        periods=periods,
+        window=window,
+        intervals=intervals,
+        interval_method=interval_method,
+        n_paths=n_paths,
+        presorted=True,
+    )
+
+    return {**result, "metric": metric, "interval": interval, "cached": cached}
+
+
+@router.get("/db/linear-trend")
+def forecast_db_linear_trend(
+    metric: str = Query("orders", description="Metrik yang diprediksi"),
+    interval: str = Query("day", description="Time bucket: hour, day, week, month"),
+    restaurant_id: Optional[str] = Query(None, description="Filter restoran"),
+    periods: int = Query(7, description="Jumlah periode ke depan"),
+    intervals: Optional[List[float]] = Query(
+        None, description="Level prediction interval, misal 0.8 dan 0.95"
+    ),
+    interval_method: str = Query(
+        "bootstrap", description="Metode interval: bootstrap atau analytic"
+    ),
+    n_paths: int = Query(1000, description="Jumlah simulation path bootstrap"),
+    db: Session = Depends(get_db),
+):
+    """Forecasting Linear Trend langsung dari tabel DeliveryData"""
+    series, cached = _load_db_series(db, metric, interval, restaurant_id)
+
+    result = PolarsDataProcessor.forecast_linear_trend(
+        df=series,
+        date_column="period",
+        value_column="value",
+        periods=periods,
+        intervals=intervals,
+        interval_method=interval_method,
+        n_paths=n_paths,
+        presorted=True,
+    )
+
+    return {**result, "metric": metric, "interval": interval, "cached": cached}
+
+
+@router.get("/db/all-methods")
+async def forecast_db_all_methods(
+    metric: str = Query("orders", description="Metrik yang diprediksi"),
+    interval: str = Query("day", description="Time bucket: hour, day, week, month"),
+    restaurant_id: Optional[str] = Query(None, description="Filter restoran"),
+    periods: int = Query(7, description="Jumlah periode ke depan"),
+    intervals: Optional[List[float]] = Query(
+        None, description="Level prediction interval, misal 0.8 dan 0.95"
+    ),
+    interval_method: str = Query(
+        "bootstrap", description="Metode interval: bootstrap atau analytic"
+    ),
+    n_paths: int = Query(1000, description="Jumlah simulation path bootstrap"),
+    timeout: Optional[float] = Query(None, description="Batas waktu per metode (detik)"),
+    db: Session = Depends(get_db),
+):
+    """Forecasting semua metode langsung dari tabel DeliveryData"""
+    series, cached = await run_local(
+        "forecast", _load_db_series, db, metric, interval, restaurant_id
+    )
+
+    common = dict(
+        df=series,
+        date_column="period",
+        value_column="value",
+        periods=periods,
+        intervals=intervals,
+        interval_method=interval_method,
+        n_paths=n_paths,
+        presorted=True,
+    )
+
+    results = await run_methods_concurrently(
+        "forecast",
+        {
+            "exponential_smoothing": partial(
+                PolarsDataProcessor.forecast_exponential_smoothing, **common
+            ),
+            "moving_average": partial(
+                PolarsDataProcessor.forecast_moving_average, **common
+            ),
+            "linear_trend": partial(PolarsDataProcessor.forecast_linear_trend, **common),
+        },
+        timeout=timeout,
+    )
+
+    return {**results, "metric": metric, "interval": interval, "cached": cached}
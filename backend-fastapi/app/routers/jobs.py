@@ -0,0 +1,113 @@
+import json
+from typing import Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import FileResponse
+
+from ..services.job_queue import (
+    JOB_HANDLERS,
+    JOB_STATUSES,
+    cancel_job,
+    get_job,
+    get_job_output_path,
+    get_job_result,
+    list_jobs,
+    submit_job,
+)
+
+router = APIRouter()
+
+
+@router.post("/")
+async def submit(
+    kind: str = Form(..., description=f"Jenis job: {', '.join(JOB_HANDLERS)}"),
+    params: str = Form("{}", description="Parameter job dalam format JSON"),
+    file: Optional[UploadFile] = File(None),
+):
+    """
+    Menjalankan proses berat (ingest, cleaning, profiling, forecasting,
+    backtest) di process pool job alih-alih di dalam request
+    """
+    try:
+        parsed = json.loads(params)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Params bukan JSON valid: {e}")
+    if not isinstance(parsed, dict):
+        raise HTTPException(status_code=400, detail="Params harus berupa object JSON")
+    if file is not None and not file.filename.endswith(
+        (".xlsx", ".xls", ".csv", ".parquet", ".json")
+    ):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    try:
+        contents = await file.read() if file is not None else None
+        return submit_job(
+            kind,
+            parsed,
+            contents=contents,
+            filename=file.filename if file is not None else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/")
+def list_all(
+    status: Optional[str] = Query(None, description=", ".join(JOB_STATUSES)),
+    kind: Optional[str] = Query(None, description="Jenis job"),
+    limit: int = Query(50, description="Jumlah job terbaru"),
+):
+    """Daftar job terbaru"""
+    return list_jobs(status=status, kind=kind, limit=limit)
+
+
+@router.get("/{job_id}")
+def status(job_id: str):
+    """Status dan progress job"""
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job tidak ditemukan")
+    return job
+
+
+@router.post("/{job_id}/cancel")
+def cancel(job_id: str):
+    """
+    Membatalkan job; job yang sedang berjalan berhenti pada laporan
+    progress berikutnya
+    """
+    job = cancel_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job tidak ditemukan")
+    return job
+
+
+@router.get("/{job_id}/result")
+def result(job_id: str):
+    """Hasil job yang sudah selesai"""
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job tidak ditemukan")
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=409, detail=f"Job belum selesai (status: {job['status']})"
+        )
+    data = get_job_result(job_id)
+    if data is None:
+        raise HTTPException(status_code=410, detail="Hasil job sudah kedaluwarsa")
+    return {"job": job, "result": data}
+
+
+@router.get("/{job_id}/file")
+def output_file(job_id: str):
+    """File output job (misal data hasil cleaning dalam Parquet)"""
+    path = get_job_output_path(job_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Job tidak memiliki file output")
+    return FileResponse(
+        path,
+        media_type="application/octet-stream",
+        filename=f"{job_id}.parquet",
+    )
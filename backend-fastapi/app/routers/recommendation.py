@@ -1,6 +1,28 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query
-from typing import Optional
-from ..services.polars_service import PolarsDataProcessor
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    UploadFile,
+    File,
+    HTTPException,
+    Query,
+)
+from sqlalchemy.orm import Session
+from typing import Optional, List
+from functools import partial
+from ..database import get_db
+from ..services.polars_service import HOUR_BANDS, PolarsDataProcessor
+from ..services.dataset_cache import load_upload
+from ..services.executor import run_methods_concurrently, run_service
+from ..services.recommendation_index import (
+    SEGMENT_ALL,
+    SEGMENT_COLUMNS,
+    get_recommendation_index,
+    index_is_stale,
+    rebuild_recommendation_index,
+    refresh_index_in_background,
+    refresh_recommendation_index,
+)
 
 router = APIRouter()
 
@@ -18,18 +40,13 @@ async def recommend_popular_items(
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
-
-        result = PolarsDataProcessor.recommend_popular_items(
+        df = await run_service(
+            "recommendation", load_upload, contents, file.filename
+        )
+
+        result = await run_service(
+            "recommendation",
+            PolarsDataProcessor.recommend_popular_items,
             df=df,
             item_column=item_column,
             n=n,
@@ -47,7 +64,9 @@ async def recommend_popular_items(
 @router.post("/by-category")
 async def recommend_by_category(
     file: UploadFile = File(...),
-    category_column: str = Query(..., description="Nama kolom kategori"),
+    category_column: List[str] = Query(
+        ..., description="Nama kolom kategori (boleh lebih dari satu)"
+    ),
     item_column: str = Query(..., description="Nama kolom item"),
     n: int = Query(5, description="Jumlah rekomendasi per kategori"),
 ):
@@ -58,18 +77,13 @@ async def recommend_by_category(
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
-
-        result = PolarsDataProcessor.recommend_by_category(
+        df = await run_service(
+            "recommendation", load_upload, contents, file.filename
+        )
+
+        result = await run_service(
+            "recommendation",
+            PolarsDataProcessor.recommend_by_category,
             df=df,
             category_column=category_column,
             item_column=item_column,
@@ -85,6 +99,52 @@ async def recommend_by_category(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/by-segment")
+async def recommend_by_segment(
+    file: UploadFile = File(...),
+    item_column: str = Query(..., description="Nama kolom item"),
+    segment_column: List[str] = Query(
+        [], description="Kolom segmen, misal location (boleh lebih dari satu)"
+    ),
+    hour_column: Optional[str] = Query(
+        None, description="Kolom jam (0-23) untuk segmen rentang jam"
+    ),
+    n: int = Query(5, description="Jumlah rekomendasi per segmen"),
+):
+    """Rekomendasi per segmen (misal lokasi x rentang jam)"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+    if not segment_column and not hour_column:
+        raise HTTPException(
+            status_code=400, detail="segment_column atau hour_column wajib diisi"
+        )
+
+    try:
+        contents = await file.read()
+
+        df = await run_service(
+            "recommendation", load_upload, contents, file.filename
+        )
+
+        result = await run_service(
+            "recommendation",
+            PolarsDataProcessor.recommend_by_segment,
+            df=df,
+            segment_columns=segment_column,
+            item_column=item_column,
+            n=n,
+            hour_column=hour_column,
+        )
+
+        return {
+            "success": True,
+            "recommendations": result,
+            "method": "By Segment",
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/frequently-bought-together")
 async def recommend_frequently_bought_together(
     file: UploadFile = File(...),
@@ -99,18 +159,13 @@ async def recommend_frequently_bought_together(
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
-
-        result = PolarsDataProcessor.recommend_frequently_bought_together(
+        df = await run_service(
+            "recommendation", load_upload, contents, file.filename
+        )
+
+        result = await run_service(
+            "recommendation",
+            PolarsDataProcessor.recommend_frequently_bought_together,
             df=df,
             order_id_column=order_id_column,
             item_column=item_column,
@@ -126,6 +181,96 @@ async def recommend_frequently_bought_together(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/association-rules")
+async def recommend_association_rules(
+    file: UploadFile = File(...),
+    order_id_column: str = Query(..., description="Nama kolom ID pesanan"),
+    item_column: str = Query(..., description="Nama kolom item"),
+    min_support: float = Query(0.01, description="Minimal support (0-1)"),
+    min_confidence: float = Query(0.5, description="Minimal confidence (0-1)"),
+    max_len: Optional[int] = Query(None, description="Ukuran itemset maksimal"),
+    n: int = Query(20, description="Jumlah rule"),
+    n_partitions: int = Query(1, description="Jumlah partisi paralel"),
+):
+    """Association rule mining (Apriori berbasis bitmap)"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    try:
+        contents = await file.read()
+
+        df = await run_service(
+            "recommendation", load_upload, contents, file.filename
+        )
+
+        result = await run_service(
+            "recommendation",
+            PolarsDataProcessor.recommend_association_rules,
+            df=df,
+            order_id_column=order_id_column,
+            item_column=item_column,
+            min_support=min_support,
+            min_confidence=min_confidence,
+            max_len=max_len,
+            n=n,
+            n_partitions=n_partitions,
+        )
+
+        return {
+            "success": True,
+            "recommendations": result,
+            "method": "Association Rules",
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/similar-items")
+async def recommend_similar_items(
+    file: UploadFile = File(...),
+    order_id_column: str = Query(
+        ..., description="Nama kolom ID pesanan (atau kolom lain, misal lokasi)"
+    ),
+    item_column: str = Query(..., description="Nama kolom item"),
+    metric: str = Query("cosine", description="cosine, jaccard, atau lift"),
+    item: Optional[str] = Query(None, description="Item acuan (kosong = semua item)"),
+    n: int = Query(5, description="Jumlah item serupa per item"),
+    min_co_occurrence: int = Query(1, description="Minimal jumlah order bersama"),
+):
+    """Rekomendasi item serupa berdasarkan similarity item-item"""
+    if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
+        raise HTTPException(status_code=400, detail="Format file tidak didukung")
+
+    try:
+        contents = await file.read()
+
+        df = await run_service(
+            "recommendation", load_upload, contents, file.filename
+        )
+
+        result = await run_service(
+            "recommendation",
+            PolarsDataProcessor.recommend_similar_items,
+            df=df,
+            order_id_column=order_id_column,
+            item_column=item_column,
+            metric=metric,
+            item=item,
+            n=n,
+            min_co_occurrence=min_co_occurrence,
+        )
+
+        return {
+            "success": True,
+            "recommendations": result,
+            "method": f"Similar Items ({metric})",
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/trending")
 async def recommend_trending_items(
     file: UploadFile = File(...),
@@ -133,6 +278,9 @@ async def recommend_trending_items(
     item_column: str = Query(..., description="Nama kolom item"),
     n: int = Query(10, description="Jumlah rekomendasi"),
     recent_periods: int = Query(7, description="Jumlah periode terakhir"),
+    half_life: Optional[float] = Query(
+        None, description="Half-life (periode) untuk skor trend time-decay"
+    ),
 ):
     """Rekomendasi item yang sedang tren (meningkat)"""
     if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
@@ -141,23 +289,19 @@ async def recommend_trending_items(
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
-
-        result = PolarsDataProcessor.recommend_trending_items(
+        df = await run_service(
+            "recommendation", load_upload, contents, file.filename
+        )
+
+        result = await run_service(
+            "recommendation",
+            PolarsDataProcessor.recommend_trending_items,
             df=df,
             date_column=date_column,
             item_column=item_column,
             n=n,
             recent_periods=recent_periods,
+            half_life=half_life,
         )
 
         return {
@@ -174,9 +318,12 @@ async def recommend_all_methods(
     file: UploadFile = File(...),
     order_id_column: Optional[str] = Query(None, description="Nama kolom ID pesanan"),
     item_column: str = Query(..., description="Nama kolom item"),
-    category_column: Optional[str] = Query(None, description="Nama kolom kategori"),
+    category_column: Optional[List[str]] = Query(
+        None, description="Nama kolom kategori (boleh lebih dari satu)"
+    ),
     date_column: Optional[str] = Query(None, description="Nama kolom tanggal"),
     n: int = Query(10, description="Jumlah rekomendasi"),
+    timeout: Optional[float] = Query(None, description="Batas waktu per metode (detik)"),
 ):
     """Rekomendasi menggunakan semua metode"""
     if not file.filename.endswith((".xlsx", ".xls", ".csv", ".parquet", ".json")):
@@ -185,48 +332,192 @@ async def recommend_all_methods(
     try:
         contents = await file.read()
 
-        if file.filename.endswith((".xlsx", ".xls")):
-            df = PolarsDataProcessor.read_excel_file(contents)
-        elif file.filename.endswith(".csv"):
-            df = PolarsDataProcessor.read_csv_file(contents)
-        elif file.filename.endswith(".parquet"):
-            df = PolarsDataProcessor.read_parquet_file(contents)
-        elif file.filename.endswith(".json"):
-            df = PolarsDataProcessor.read_json_file(contents)
-        else:
-            raise HTTPException(status_code=400, detail="Format tidak didukung")
+        df = await run_service(
+            "recommendation", load_upload, contents, file.filename
+        )
 
-        results = {}
+        # Input bersama: hasil parsing yang diproyeksikan sekali ke kolom yang
+        # dipakai. Grouping per order tidak di-precompute karena hanya
+        # frequently-bought-together yang memakainya (metode lain mengelompokkan
+        # per item/kategori/tanggal)
+        used_columns = [
+            col
+            for col in dict.fromkeys(
+                [item_column, *(category_column or []), order_id_column, date_column]
+            )
+            if col and col in df.columns
+        ]
+        df = df.select(used_columns)
+
+        tasks = {}
 
         # Popular Items
         if item_column:
-            results["popular_items"] = PolarsDataProcessor.recommend_popular_items(
-                df=df, item_column=item_column, n=n
+            tasks["popular_items"] = partial(
+                PolarsDataProcessor.recommend_popular_items,
+                df=df,
+                item_column=item_column,
+                n=n,
             )
 
         # By Category
         if category_column and item_column:
-            results["by_category"] = PolarsDataProcessor.recommend_by_category(
-                df=df, category_column=category_column, item_column=item_column, n=n
+            tasks["by_category"] = partial(
+                PolarsDataProcessor.recommend_by_category,
+                df=df,
+                category_column=category_column,
+                item_column=item_column,
+                n=n,
             )
 
         # Frequently Bought Together
         if order_id_column and item_column:
-            results["frequently_bought_together"] = (
-                PolarsDataProcessor.recommend_frequently_bought_together(
-                    df=df, order_id_column=order_id_column, item_column=item_column, n=n
-                )
+            tasks["frequently_bought_together"] = partial(
+                PolarsDataProcessor.recommend_frequently_bought_together,
+                df=df,
+                order_id_column=order_id_column,
+                item_column=item_column,
+                n=n,
             )
 
         # Trending
         if date_column and item_column:
-            results["trending"] = PolarsDataProcessor.recommend_trending_items(
-                df=df, date_column=date_column, item_column=item_column, n=n
+            tasks["trending"] = partial(
+                PolarsDataProcessor.recommend_trending_items,
+                df=df,
+                date_column=date_column,
+                item_column=item_column,
+                n=n,
             )
 
+        results = await run_methods_concurrently(
+            "recommendation", tasks, timeout=timeout
+        )
+
         return {
             "success": True,
             "recommendations": results,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# ==================== RECOMMENDATION INDEX ====================
+def _current_index(background_tasks: BackgroundTasks):
+    """Index aktif; refresh incremental dijadwalkan di background jika sudah lama"""
+    index = get_recommendation_index()
+    if index_is_stale(index):
+        background_tasks.add_task(refresh_index_in_background)
+    return index
+
+
+@router.post("/index/rebuild")
+def rebuild_index(db: Session = Depends(get_db)):
+    """Membangun ulang index rekomendasi dari seluruh DeliveryData"""
+    index = rebuild_recommendation_index(db)
+    return {"success": True, "status": index.status()}
+
+
+@router.post("/index/refresh")
+def refresh_index(db: Session = Depends(get_db)):
+    """Menambahkan order baru sejak refresh terakhir ke index"""
+    added = refresh_recommendation_index(db)
+    return {
+        "success": True,
+        "added_rows": added,
+        "status": get_recommendation_index().status(),
+    }
+
+
+@router.get("/index/status")
+async def get_index_status():
+    """Status index rekomendasi"""
+    return get_recommendation_index().status()
+
+
+@router.get("/index/popular")
+async def index_popular_items(
+    background_tasks: BackgroundTasks,
+    n: int = Query(10, description="Jumlah rekomendasi"),
+):
+    """Item paling populer dari index"""
+    index = _current_index(background_tasks)
+    return {"success": True, "recommendations": index.popular[:n]}
+
+
+@router.get("/index/bought-with")
+async def index_bought_with(
+    background_tasks: BackgroundTasks,
+    item: str = Query(..., description="Item acuan"),
+    n: int = Query(5, description="Jumlah rekomendasi"),
+):
+    """Item yang paling sering dibeli bersama item acuan"""
+    index = _current_index(background_tasks)
+    return {
+        "success": True,
+        "item": item,
+        "recommendations": index.bought_with.get(item, [])[:n],
+    }
+
+
+@router.get("/index/top")
+async def index_top_for_category(
+    background_tasks: BackgroundTasks,
+    category: str = Query(..., description="Nilai kategori, misal nama lokasi"),
+    category_column: str = Query("location", description="Kolom kategori"),
+    n: int = Query(5, description="Jumlah rekomendasi"),
+):
+    """Item teratas untuk satu kategori (misal lokasi tertentu)"""
+    index = _current_index(background_tasks)
+    return {
+        "success": True,
+        "category_column": category_column,
+        "category": category,
+        "recommendations": index.category_top.get((category_column, category), [])[
+            :n
+        ],
+    }
+
+
+@router.get("/index/segment")
+async def index_top_for_segment(
+    background_tasks: BackgroundTasks,
+    location: str = Query(SEGMENT_ALL, description="Lokasi (* = semua)"),
+    hour_band: str = Query(
+        SEGMENT_ALL, description="Rentang jam, misal lunch atau dinner (* = semua)"
+    ),
+    day_type: str = Query(SEGMENT_ALL, description="weekday, weekend, atau *"),
+    hour: Optional[int] = Query(
+        None, ge=0, le=23, description="Jam order; menggantikan hour_band"
+    ),
+    n: int = Query(5, description="Jumlah rekomendasi"),
+):
+    """Item teratas untuk satu segmen lokasi x rentang jam x jenis hari"""
+    if hour is not None:
+        hour_band = next(label for label, start in reversed(HOUR_BANDS) if hour >= start)
+
+    index = _current_index(background_tasks)
+    segment = {"location": location, "hour_band": hour_band, "day_type": day_type}
+    return {
+        "success": True,
+        "segment": segment,
+        "recommendations": index.segment_top.get(
+            tuple(segment[c] for c in SEGMENT_COLUMNS), []
+        )[:n],
+    }
+
+
+@router.get("/index/trending")
+async def index_trending_items(
+    background_tasks: BackgroundTasks,
+    n: int = Query(10, description="Jumlah rekomendasi"),
+    item: Optional[str] = Query(None, description="Skor trend untuk satu item"),
+):
+    """Item yang sedang tren dari index"""
+    index = _current_index(background_tasks)
+    if item is not None:
+        trend = index.trends.get(item)
+        if trend is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return {"success": True, "trend": trend}
+    return {"success": True, "recommendations": index.trending[:n]}
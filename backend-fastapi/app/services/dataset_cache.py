@@ -0,0 +1,287 @@
+import glob
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+import weakref
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+import polars as pl
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import DeliveryData
+from .metrics import timed
+from .polars_service import PolarsDataProcessor
+from .series_cache import delivery_fingerprint
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa lock antar proses, parsing bisa terulang
+    fcntl = None
+
+# Cache dataset bersama antar worker uvicorn: DataFrame hasil parsing ditulis
+# sekali sebagai file Arrow IPC (tanpa kompresi) lalu setiap proses memetakannya
+# dengan memory_map sehingga halaman memori dipakai bersama, bukan disalin per
+# worker. Dataset yang sedang dipakai ditandai file lease "<key>.<pid>.lease";
+# eviction melewati dataset dengan lease dari proses yang masih hidup.
+
+_SHM_DIR = "/dev/shm"
+
+_refs: Dict[str, int] = defaultdict(int)
+_refs_lock = threading.Lock()
+
+
+def _cache_root() -> str:
+    """
+    Direktori cache: settings.dataset_cache_dir, atau /dev/shm jika cukup
+    besar (container Docker default hanya 64MB), atau spill directory di
+    artifact_dir (file biasa yang di-mmap tetap berbagi page cache)
+    """
+    root = settings.dataset_cache_dir
+    if not root:
+        if (
+            os.path.isdir(_SHM_DIR)
+            and shutil.disk_usage(_SHM_DIR).total >= settings.dataset_cache_max_bytes
+        ):
+            root = os.path.join(_SHM_DIR, "pizza-datasets")
+        else:
+            root = os.path.join(settings.artifact_dir, "datasets")
+    os.makedirs(root, exist_ok=True)
+    return root
+
+
+def _data_path(root: str, key: str) -> str:
+    return os.path.join(root, f"{key}.arrow")
+
+
+def _lease_path(root: str, key: str, pid: int) -> str:
+    return os.path.join(root, f"{key}.{pid}.lease")
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != "posix":
+        # os.kill(pid, 0) di Windows menghentikan proses; anggap masih hidup
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _acquire(root: str, key: str) -> None:
+    with _refs_lock:
+        _refs[key] += 1
+        if _refs[key] == 1:
+            open(_lease_path(root, key, os.getpid()), "a").close()
+
+
+def _release(root: str, key: str) -> None:
+    with _refs_lock:
+        _refs[key] -= 1
+        if _refs[key] <= 0:
+            del _refs[key]
+            try:
+                os.remove(_lease_path(root, key, os.getpid()))
+            except OSError:
+                pass
+
+
+def _map(root: str, key: str) -> pl.DataFrame:
+    """Memetakan dataset (zero-copy) dan memegang lease selama frame hidup"""
+    path = _data_path(root, key)
+    # rechunk=False: rechunk akan menyalin buffer ke memori proses
+    df = pl.read_ipc(path, memory_map=True, rechunk=False)
+    _acquire(root, key)
+    weakref.finalize(df, _release, root, key)
+    try:
+        # mtime = waktu terakhir dipakai (dasar LRU eviction antar proses)
+        os.utime(path)
+    except OSError:
+        pass
+    return df
+
+
+def _write(root: str, key: str, df: pl.DataFrame) -> bool:
+    """Menulis dataset secara atomik; False jika ruang tidak cukup atau gagal"""
+    size = df.estimated_size()
+    if size > settings.dataset_cache_max_bytes:
+        return False
+    if shutil.disk_usage(root).free < size * 1.1:
+        evict_datasets(max_bytes=max(0, settings.dataset_cache_max_bytes - size))
+        if shutil.disk_usage(root).free < size * 1.1:
+            return False
+    tmp_path = os.path.join(root, f".{key}.{uuid.uuid4().hex}.tmp")
+    try:
+        df.rechunk().write_ipc(tmp_path, compression="uncompressed")
+        os.replace(tmp_path, _data_path(root, key))
+        return True
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def get_shared_frame(key: str, loader: Callable[[], pl.DataFrame]) -> pl.DataFrame:
+    """
+    Mengambil dataset dari cache bersama atau memuatnya sekali untuk semua worker
+    Args:
+        key: Key unik isi dataset (mis. hash file atau fingerprint tabel)
+        loader: Fungsi tanpa argumen yang mem-parsing/membaca dataset
+
+    Frame hasil cache di-memory-map dan read-only di level buffer; operasi
+    Polars tetap menghasilkan frame baru seperti biasa. Jika cache dimatikan
+    atau dataset tidak bisa ditulis (ruang habis, tipe tidak didukung IPC),
+    hasil loader dikembalikan langsung.
+    """
+    if not settings.dataset_cache_enabled:
+        return loader()
+
+    root = _cache_root()
+    if os.path.exists(_data_path(root, key)):
+        try:
+            return _map(root, key)
+        except OSError:
+            pass  # baru saja di-evict proses lain
+
+    lock_file = open(os.path.join(root, f"{key}.lock"), "a")
+    try:
+        if fcntl is not None:
+            # Satu worker mem-parsing, worker lain menunggu lalu memetakan hasilnya
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if os.path.exists(_data_path(root, key)):
+            return _map(root, key)
+        df = loader()
+        if not _write(root, key, df):
+            return df
+    finally:
+        lock_file.close()
+
+    # Dipetakan dulu (lease aktif) agar tidak ikut ter-evict
+    shared = _map(root, key)
+    evict_datasets()
+    return shared
+
+
+@timed("parse")
+def load_upload(contents: bytes, filename: str) -> pl.DataFrame:
+    """
+    Parsing file upload lewat cache bersama: file yang sama (misal dikirim ke
+    beberapa endpoint analisis oleh dashboard) cukup di-parsing sekali
+    """
+    extension = os.path.splitext(filename)[1].lower().lstrip(".")
+    key = f"upload-{hashlib.sha256(contents).hexdigest()[:32]}-{extension}"
+    return get_shared_frame(
+        key, lambda: PolarsDataProcessor.read_upload_file(contents, filename)
+    )
+
+
+def load_delivery_frame(db: Session, restaurant_id: Optional[str]) -> pl.DataFrame:
+    """
+    Seluruh kolom DeliveryData (opsional per restoran) lewat cache bersama,
+    dengan key dari fingerprint tabel sehingga data baru otomatis dimuat ulang
+    """
+    fingerprint = repr(delivery_fingerprint(db, restaurant_id)).encode()
+    key = "delivery-{}-{}".format(
+        hashlib.sha256((restaurant_id or "*").encode()).hexdigest()[:12],
+        hashlib.sha256(fingerprint).hexdigest()[:20],
+    )
+
+    def load() -> pl.DataFrame:
+        query = select(*DeliveryData.__table__.columns)
+        if restaurant_id:
+            query = query.where(DeliveryData.restaurantId == restaurant_id)
+        # Kolom baru (rowHash) bisa null di semua baris lama; infer dari
+        # seluruh baris agar tipe tidak salah tebak dari baris awal
+        return pl.read_database(query, connection=db, infer_schema_length=None)
+
+    return get_shared_frame(key, load)
+
+
+def _leases(root: str, key: str) -> List[int]:
+    """PID proses hidup yang memegang dataset; lease proses mati dibersihkan"""
+    pids = []
+    for path in glob.glob(os.path.join(glob.escape(root), f"{key}.*.lease")):
+        pid = int(path.rsplit(".", 2)[1])
+        if pid == os.getpid() or _pid_alive(pid):
+            pids.append(pid)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return pids
+
+
+def _entries(root: str) -> List[Dict[str, Any]]:
+    entries = []
+    for path in glob.glob(os.path.join(glob.escape(root), "*.arrow")):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        key = os.path.basename(path)[: -len(".arrow")]
+        entries.append(
+            {
+                "key": key,
+                "bytes": stat.st_size,
+                "last_used": stat.st_mtime,
+                "leases": _leases(root, key),
+            }
+        )
+    return sorted(entries, key=lambda e: e["last_used"])
+
+
+def evict_datasets(max_bytes: Optional[int] = None) -> int:
+    """
+    Menghapus dataset paling lama tidak dipakai sampai total ukuran <= max_bytes
+    Dataset yang masih di-lease proses lain dilewati: memorinya tidak akan
+    bebas selama masih di-mmap.
+    Returns:
+        Jumlah dataset yang dihapus
+    """
+    if max_bytes is None:
+        max_bytes = settings.dataset_cache_max_bytes
+    root = _cache_root()
+    entries = _entries(root)
+    total = sum(e["bytes"] for e in entries)
+    evicted = 0
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        if entry["leases"]:
+            continue
+        try:
+            os.remove(_data_path(root, entry["key"]))
+        except OSError:
+            continue  # Windows: file yang masih dipetakan tidak bisa dihapus
+        try:
+            os.remove(os.path.join(root, f"{entry['key']}.lock"))
+        except OSError:
+            pass
+        total -= entry["bytes"]
+        evicted += 1
+    return evicted
+
+
+def dataset_cache_stats() -> Dict[str, Any]:
+    """Ringkasan isi cache dataset bersama"""
+    root = _cache_root()
+    entries = _entries(root)
+    return {
+        "enabled": settings.dataset_cache_enabled,
+        "directory": root,
+        "datasets": len(entries),
+        "bytes": sum(e["bytes"] for e in entries),
+        "max_bytes": settings.dataset_cache_max_bytes,
+        "in_use": sum(1 for e in entries if e["leases"]),
+        "entries": entries,
+    }
@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import polars as pl
+
+from ..config import settings
+from .polars_service import PolarsDataProcessor
+
+# Fitur model (nama kolom tabel DeliveryData) dan target yang diprediksi
+FEATURE_COLUMNS = [
+    "distanceKm",
+    "trafficImpact",
+    "pizzaComplexity",
+    "toppingsCount",
+    "isPeakHour",
+    "isWeekend",
+]
+TARGET_COLUMN = "deliveryDuration"
+MODEL_NAME = "delivery_duration"
+
+# Cache model yang sudah dimuat dari disk: {version: DeliveryDurationModel}
+_model_cache: Dict[int, "DeliveryDurationModel"] = {}
+_model_lock = threading.Lock()
+
+
+def build_delivery_features(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Membangun matriks fitur secara vectorized dari data delivery
+    Args:
+        df: DataFrame dengan kolom DeliveryData (camelCase, header Excel, atau snake_case)
+    Kolom yang tidak tersedia diisi null dan diimputasi saat prediksi.
+    """
+    df = PolarsDataProcessor.normalize_delivery_columns(df)
+
+    base = [
+        (
+            pl.col(col).cast(pl.Float64, strict=False)
+            if col in df.columns
+            else pl.lit(None, dtype=pl.Float64)
+        ).alias(col)
+        for col in FEATURE_COLUMNS
+    ]
+    return df.lazy().select(base).with_columns(
+        (pl.col("distanceKm") * pl.col("trafficImpact")).alias("distanceTraffic")
+    ).collect()
+
+
+class DeliveryDurationModel:
+    """Model ridge regression untuk memprediksi durasi delivery (menit)"""
+
+    def __init__(
+        self,
+        feature_names: List[str],
+        coefficients: List[float],
+        intercept: float,
+        means: List[float],
+        stds: List[float],
+        alpha: float,
+        version: int = 0,
+        metrics: Optional[Dict[str, Any]] = None,
+        trained_at: Optional[str] = None,
+        n_samples: int = 0,
+    ):
+        self.feature_names = feature_names
+        self.coefficients = np.asarray(coefficients, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.means = np.asarray(means, dtype=np.float64)
+        self.stds = np.asarray(stds, dtype=np.float64)
+        self.alpha = alpha
+        self.version = version
+        self.metrics = metrics or {}
+        self.trained_at = trained_at
+        self.n_samples = n_samples
+
+    @classmethod
+    def fit(
+        cls, df: pl.DataFrame, alpha: float = 1.0, test_fraction: float = 0.2
+    ) -> "DeliveryDurationModel":
+        """
+        Melatih model ridge dengan solusi closed-form NumPy
+        Args:
+            df: DataFrame data delivery yang memiliki kolom target deliveryDuration
+            alpha: Kekuatan regularisasi L2
+            test_fraction: Porsi data untuk evaluasi holdout
+        """
+        df = PolarsDataProcessor.normalize_delivery_columns(df)
+        if TARGET_COLUMN not in df.columns:
+            raise ValueError(f"Kolom target {TARGET_COLUMN} tidak ditemukan")
+
+        features = build_delivery_features(df).with_columns(
+            df[TARGET_COLUMN].cast(pl.Float64, strict=False).alias(TARGET_COLUMN)
+        )
+        features = features.filter(pl.col(TARGET_COLUMN) > 0).drop_nulls()
+        if len(features) < 10:
+            raise ValueError("Data training tidak cukup (minimal 10 baris valid)")
+
+        feature_names = [c for c in features.columns if c != TARGET_COLUMN]
+        X = features.select(feature_names).to_numpy()
+        y = features[TARGET_COLUMN].to_numpy()
+
+        # Split holdout deterministik: setiap baris ke-k masuk test set
+        test_mask = np.zeros(len(y), dtype=bool)
+        if 0 < test_fraction < 1:
+            test_mask[:: max(2, round(1 / test_fraction))] = True
+
+        model = cls._solve(X[~test_mask], y[~test_mask], feature_names, alpha)
+        metrics = {"train": model._score(X[~test_mask], y[~test_mask])}
+        if test_mask.any():
+            metrics["test"] = model._score(X[test_mask], y[test_mask])
+
+        # Model final dilatih ulang pada seluruh data
+        final = cls._solve(X, y, feature_names, alpha)
+        final.metrics = metrics
+        final.n_samples = len(y)
+        return final
+
+    @classmethod
+    def _solve(
+        cls, X: np.ndarray, y: np.ndarray, feature_names: List[str], alpha: float
+    ) -> "DeliveryDurationModel":
+        means = X.mean(axis=0)
+        stds = X.std(axis=0)
+        stds[stds == 0] = 1.0
+        Z = (X - means) / stds
+        y_mean = y.mean()
+
+        gram = Z.T @ Z + alpha * np.eye(Z.shape[1])
+        coefficients = np.linalg.solve(gram, Z.T @ (y - y_mean))
+
+        return cls(
+            feature_names=feature_names,
+            coefficients=coefficients.tolist(),
+            intercept=y_mean,
+            means=means.tolist(),
+            stds=stds.tolist(),
+            alpha=alpha,
+        )
+
+    def _score(self, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+        error = self._predict_matrix(X) - y
+        ss_tot = ((y - y.mean()) ** 2).sum()
+        return {
+            "mae": float(np.abs(error).mean()),
+            "rmse": float(np.sqrt((error**2).mean())),
+            "r2": float(1 - (error**2).sum() / ss_tot) if ss_tot else 0.0,
+            "n": int(len(y)),
+        }
+
+    def _predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        # Nilai kosong diimputasi dengan rata-rata training (z-score = 0)
+        Z = np.nan_to_num((X - self.means) / self.stds, nan=0.0)
+        return np.maximum(Z @ self.coefficients + self.intercept, 0.0)
+
+    def predict(self, df: pl.DataFrame) -> np.ndarray:
+        """Memprediksi durasi delivery (menit) untuk setiap baris df"""
+        features = build_delivery_features(df).select(self.feature_names)
+        X = features.to_numpy().astype(np.float64)
+        return self._predict_matrix(X)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": MODEL_NAME,
+            "version": self.version,
+            "trained_at": self.trained_at,
+            "n_samples": self.n_samples,
+            "alpha": self.alpha,
+            "feature_names": self.feature_names,
+            "coefficients": self.coefficients.tolist(),
+            "intercept": self.intercept,
+            "means": self.means.tolist(),
+            "stds": self.stds.tolist(),
+            "metrics": self.metrics,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DeliveryDurationModel":
+        return cls(
+            feature_names=data["feature_names"],
+            coefficients=data["coefficients"],
+            intercept=data["intercept"],
+            means=data["means"],
+            stds=data["stds"],
+            alpha=data["alpha"],
+            version=data["version"],
+            metrics=data.get("metrics"),
+            trained_at=data.get("trained_at"),
+            n_samples=data.get("n_samples", 0),
+        )
+
+
+def _model_path(version: int) -> str:
+    return os.path.join(settings.artifact_dir, f"{MODEL_NAME}_v{version}.json")
+
+
+def list_model_versions() -> List[int]:
+    """Daftar versi model yang tersimpan di disk (urut naik)"""
+    if not os.path.isdir(settings.artifact_dir):
+        return []
+    prefix = f"{MODEL_NAME}_v"
+    versions = []
+    for name in os.listdir(settings.artifact_dir):
+        if name.startswith(prefix) and name.endswith(".json"):
+            try:
+                versions.append(int(name[len(prefix) : -len(".json")]))
+            except ValueError:
+                continue
+    return sorted(versions)
+
+
+def save_model(model: DeliveryDurationModel) -> DeliveryDurationModel:
+    """Menyimpan model sebagai artifact baru dengan nomor versi berikutnya"""
+    with _model_lock:
+        os.makedirs(settings.artifact_dir, exist_ok=True)
+        versions = list_model_versions()
+        model.version = (versions[-1] if versions else 0) + 1
+        model.trained_at = datetime.utcnow().isoformat()
+
+        path = _model_path(model.version)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(model.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+        _model_cache[model.version] = model
+    return model
+
+
+def load_model(version: Optional[int] = None) -> Optional[DeliveryDurationModel]:
+    """Memuat model dari cache atau disk (None = versi terbaru)"""
+    if version is None:
+        versions = list_model_versions()
+        if not versions:
+            return None
+        version = versions[-1]
+
+    with _model_lock:
+        if version not in _model_cache:
+            path = _model_path(version)
+            if not os.path.exists(path):
+                return None
+            with open(path) as f:
+                _model_cache[version] = DeliveryDurationModel.from_dict(json.load(f))
+        return _model_cache[version]
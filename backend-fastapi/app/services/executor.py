@@ -0,0 +1,213 @@
+import asyncio
+import contextvars
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from ..config import settings
+from .metrics import record_stage, stage
+
+# Kelas endpoint; masing-masing dibatasi oleh settings.<kelas>_concurrency
+ENDPOINT_CLASSES = ("analytics", "export", "forecast", "recommendation", "ingest")
+
+# Thread pool bersama untuk service CPU-bound dari route async.
+# Polars melepas GIL saat komputasi, sehingga thread cukup untuk paralelisme;
+# ukurannya = total batas semua kelas agar satu kelas tidak menghabiskan
+# thread kelas lain (batas sebenarnya dipegang semaphore per kelas).
+_method_pool = ThreadPoolExecutor(
+    max_workers=sum(
+        getattr(settings, f"{name}_concurrency") for name in ENDPOINT_CLASSES
+    ),
+    thread_name_prefix="polars-method",
+)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+_active: Dict[str, int] = {name: 0 for name in ENDPOINT_CLASSES}
+_waiting: Dict[str, int] = {name: 0 for name in ENDPOINT_CLASSES}
+_is_process_worker = False
+
+
+def _init_process_worker(polars_threads: int) -> None:
+    # Dijalankan sebelum Polars di-import di proses worker
+    global _is_process_worker
+    _is_process_worker = True
+    os.environ.setdefault("POLARS_MAX_THREADS", str(polars_threads))
+
+
+def in_process_worker() -> bool:
+    """True jika kode berjalan di dalam worker process pool bersama"""
+    return _is_process_worker
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Process pool bersama (settings.method_pool_workers proses spawn), dibuat
+    sekali per proses server; dipakai executor_backend="process" dan service
+    yang membagi pekerjaannya sendiri ke beberapa proses (misal backtesting)
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            workers = settings.method_pool_workers
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker,
+                initargs=(max(1, (os.cpu_count() or 1) // workers),),
+            )
+        return _process_pool
+
+
+def _get_semaphore(endpoint_class: str) -> asyncio.Semaphore:
+    global _semaphore_loop
+    if endpoint_class not in ENDPOINT_CLASSES:
+        raise ValueError(f"Kelas endpoint tidak dikenal: {endpoint_class}")
+    # Semaphore terikat ke event loop; buat ulang jika loop berganti
+    loop = asyncio.get_running_loop()
+    if loop is not _semaphore_loop:
+        _semaphores.clear()
+        _semaphore_loop = loop
+    if endpoint_class not in _semaphores:
+        _semaphores[endpoint_class] = asyncio.Semaphore(
+            getattr(settings, f"{endpoint_class}_concurrency")
+        )
+    return _semaphores[endpoint_class]
+
+
+async def _run_limited(
+    endpoint_class: str,
+    pool: Executor,
+    fn: Callable[[], Any],
+    timeout: Optional[float] = None,
+):
+    """
+    Menjalankan fn di pool setelah mendapat slot kelas endpoint
+    Slot dilepas saat komputasi di pool benar-benar selesai (bukan saat
+    pemanggil berhenti menunggu), sehingga timeout atau request yang dibatalkan
+    tidak membuat komputasi yang masih berjalan melewati batas kelasnya.
+    Args:
+        timeout: Batas waktu dalam detik, dihitung sejak slot didapat
+    """
+    semaphore = _get_semaphore(endpoint_class)
+    _waiting[endpoint_class] += 1
+    queued = time.perf_counter()
+    try:
+        await semaphore.acquire()
+    finally:
+        _waiting[endpoint_class] -= 1
+    record_stage("queue", time.perf_counter() - queued)
+    _active[endpoint_class] += 1
+    loop = asyncio.get_running_loop()
+
+    def _release() -> None:
+        _active[endpoint_class] -= 1
+        semaphore.release()
+
+    try:
+        if pool is _method_pool:
+            # Executor tidak membawa contextvars; tanpa ini stage di dalam
+            # service tidak tercatat ke request
+            future = pool.submit(contextvars.copy_context().run, fn)
+        else:
+            future = pool.submit(fn)
+    except BaseException:
+        _release()
+        raise
+
+    def _done(_) -> None:
+        try:
+            loop.call_soon_threadsafe(_release)
+        except RuntimeError:
+            _release()  # event loop sudah ditutup, tidak ada yang menunggu slot
+
+    future.add_done_callback(_done)
+
+    result = asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    if pool is _method_pool:
+        return await result
+    # Proses worker tidak berbagi contextvars: ukur dari sisi pemanggil
+    target = getattr(fn, "func", fn)
+    with stage(getattr(target, "_metrics_stage", "compute")):
+        return await result
+
+
+def _service_pool() -> Executor:
+    if settings.executor_backend == "process":
+        return get_process_pool()
+    return _method_pool
+
+
+async def run_service(endpoint_class: str, fn: Callable[..., Any], *args, **kwargs):
+    """
+    Menjalankan service CPU-bound dari route async tanpa memblokir event loop
+    Args:
+        endpoint_class: Kelas endpoint (analytics, export, forecast,
+                        recommendation, ingest) yang menentukan batas konkurensi
+        fn: Fungsi level modul (mis. method PolarsDataProcessor); dengan
+            executor_backend="process" fungsi dan argumen harus bisa di-pickle
+
+    Request yang melebihi batas kelasnya menunggu giliran di event loop
+    """
+    return await _run_limited(
+        endpoint_class, _service_pool(), partial(fn, *args, **kwargs)
+    )
+
+
+async def run_local(endpoint_class: str, fn: Callable[..., Any], *args, **kwargs):
+    """
+    Seperti run_service, tetapi selalu di thread pool proses ini; untuk fungsi
+    yang memakai sesi database, cache in-memory, atau closure
+    """
+    return await _run_limited(
+        endpoint_class, _method_pool, partial(fn, *args, **kwargs)
+    )
+
+
+async def run_methods_concurrently(
+    endpoint_class: str,
+    tasks: Dict[str, Callable[[], Any]],
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Menjalankan beberapa method secara bersamaan lewat run_service
+    Args:
+        endpoint_class: Kelas endpoint untuk batas konkurensi
+        tasks: Dict {"nama_method": callable tanpa argumen}
+        timeout: Batas waktu per method dalam detik (None = dari settings)
+
+    Method yang gagal atau melewati timeout menghasilkan {"error": ...} tanpa
+    membatalkan method lain. Timeout dihitung sejak slot kelas didapat (waktu
+    antre tidak ikut); method yang timeout tetap selesai di background dan
+    memegang slotnya sampai selesai.
+    """
+    timeout = timeout or settings.method_timeout_seconds
+    pool = _service_pool()
+
+    async def _run(fn: Callable[[], Any]) -> Any:
+        try:
+            return await _run_limited(endpoint_class, pool, fn, timeout)
+        except asyncio.TimeoutError:
+            return {"error": f"Timeout setelah {timeout} detik"}
+        except Exception as e:
+            return {"error": str(e)}
+
+    results = await asyncio.gather(*(_run(fn) for fn in tasks.values()))
+    return dict(zip(tasks.keys(), results))
+
+
+def executor_stats() -> Dict[str, Dict[str, int]]:
+    """Jumlah service yang berjalan dan menunggu per kelas endpoint"""
+    return {
+        name: {
+            "limit": getattr(settings, f"{name}_concurrency"),
+            "active": _active[name],
+            "waiting": _waiting[name],
+        }
+        for name in ENDPOINT_CLASSES
+    }
@@ -0,0 +1,467 @@
+import os
+from datetime import datetime, timedelta
+from hashlib import blake2b
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import polars as pl
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    Integer,
+    bindparam,
+    func,
+    insert,
+    literal_column,
+    null,
+    select,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import DeliveryData
+from .polars_service import PolarsDataProcessor
+from .series_cache import invalidate_series_cache
+from .upload_validation import cleanse_delivery_upload, validate_headers
+
+# Jumlah baris reject yang disertakan di laporan
+INGEST_REJECT_PREVIEW = 100
+
+# Tipe Polars untuk kolom DeliveryData berdasarkan tipe SQLAlchemy
+_COLUMN_DTYPES = {
+    Integer: pl.Int64,
+    Float: pl.Float64,
+    Boolean: pl.Boolean,
+    DateTime: pl.Datetime("us"),
+}
+
+# Cache halaman SQLite (KB) selama ingest
+SQLITE_INGEST_CACHE_KB = 131_072
+
+# Mode ingest: "insert" menolak Order ID yang sudah ada, "upsert" memperbarui
+# baris yang isinya berubah (version dinaikkan)
+INGEST_MODES = ("insert", "upsert")
+
+# Biaya relatif lookup index per Order ID dibanding membaca satu baris saat
+# scan; di atas rasio ini Order ID yang sudah ada dicari dengan scan tabel
+EXISTING_LOOKUP_COST = 5
+
+# Kolom metadata yang tidak ikut dalam hash isi baris
+_HASH_EXCLUDED_COLUMNS = {
+    "id",
+    "uploadedBy",
+    "uploadedAt",
+    "updatedAt",
+    "validatedAt",
+    "validatedBy",
+    "qualityScore",
+    "version",
+    "rowHash",
+}
+
+# Potongan heksadesimal UUID (offset, panjang)
+_UUID_PARTS = [(0, 8), (8, 4), (12, 4), (16, 4), (20, 12)]
+
+
+def _existing_hashes(db: Session, order_ids: pl.Series) -> pl.DataFrame:
+    """
+    Order ID yang sudah ada di DeliveryData beserta rowHash tersimpan
+    File kecil dicek per chunk parameter lewat index orderId; file yang besar
+    relatif terhadap tabel memakai satu scan (orderId, rowHash) karena lookup
+    index acak per Order ID jauh lebih mahal daripada membaca baris berurutan.
+    """
+    schema = {"orderId": pl.Utf8, "rowHash": pl.Utf8}
+    values = order_ids.unique()
+    statement = select(DeliveryData.orderId, DeliveryData.rowHash)
+    conn = db.connection()
+    table_rows = conn.execute(select(func.count()).select_from(DeliveryData)).scalar()
+    if len(values) * EXISTING_LOOKUP_COST >= table_rows:
+        # Cursor DBAPI langsung: tanpa objek Row SQLAlchemy per baris
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(str(statement.compile(dialect=conn.dialect)))
+            stored = pl.DataFrame(cursor.fetchall(), schema=schema, orient="row")
+        finally:
+            cursor.close()
+        return stored.filter(pl.col("orderId").is_in(values))
+
+    found: List[tuple] = []
+    values = values.to_list()
+    for start in range(0, len(values), 900):
+        chunk = values[start : start + 900]
+        found.extend(
+            tuple(row)
+            for row in conn.execute(
+                statement.where(DeliveryData.orderId.in_(chunk))
+            )
+        )
+    return pl.DataFrame(found, schema=schema, orient="row")
+
+
+def _row_hashes(data: pl.DataFrame) -> pl.Series:
+    """
+    Hash isi baris (blake2b 64-bit, hex) atas kolom non-metadata
+    Nilai diserialisasi lewat Polars lalu di-hash dengan hashlib agar stabil
+    antar proses dan versi Polars (hash bawaan Polars tidak dijamin stabil).
+    """
+    expressions = [
+        (
+            pl.col(column.name) if column.name in data.columns else pl.lit(None)
+        )
+        .cast(pl.Utf8)
+        .fill_null("\x00")
+        for column in DeliveryData.__table__.columns
+        if column.name not in _HASH_EXCLUDED_COLUMNS
+    ]
+    canonical = data.select(pl.concat_str(expressions, separator="\x1f")).to_series()
+    return pl.Series(
+        "rowHash",
+        [blake2b(value.encode(), digest_size=8).hexdigest() for value in canonical],
+        dtype=pl.Utf8,
+    )
+
+
+def _backfill_row_hashes(db: Session, order_ids: List[str]) -> pl.DataFrame:
+    """
+    Menghitung dan menyimpan rowHash untuk baris lama yang belum punya hash
+    (dibuat sebelum upsert tersedia), tanpa menaikkan version
+    """
+    table = DeliveryData.__table__
+    frames = []
+    for start in range(0, len(order_ids), 900):
+        chunk = order_ids[start : start + 900]
+        frames.append(
+            pl.read_database(
+                select(*table.columns).where(table.c.orderId.in_(chunk)),
+                connection=db,
+            )
+        )
+    stored = _to_table_rows(pl.concat(frames, how="vertical_relaxed"))
+    hashes = stored.select("orderId", _row_hashes(stored))
+    db.execute(
+        update(table)
+        .where(table.c.orderId == bindparam("b_orderId"))
+        .values(rowHash=bindparam("b_rowHash")),
+        hashes.rename({"orderId": "b_orderId", "rowHash": "b_rowHash"}).to_dicts(),
+    )
+    return hashes
+
+
+def _to_table_rows(data: pl.DataFrame) -> pl.DataFrame:
+    """Menyamakan kolom dan tipe data dengan tabel DeliveryData"""
+    columns = []
+    for column in DeliveryData.__table__.columns:
+        if column.name not in data.columns:
+            continue
+        dtype = next(
+            (
+                pl_type
+                for sa_type, pl_type in _COLUMN_DTYPES.items()
+                if isinstance(column.type, sa_type)
+            ),
+            pl.Utf8,
+        )
+        expr = pl.col(column.name)
+        if dtype == pl.Int64:
+            expr = expr.round()
+        columns.append(expr.cast(dtype, strict=False))
+    return data.select(columns)
+
+
+def _uuid4_series(n: int) -> pl.Series:
+    """UUID4 (string) untuk n baris, dibentuk vektor dari byte acak"""
+    raw = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    # dtype S16 membuang byte nol di akhir; dipulihkan lewat padding "0"
+    hexed = pl.Series(raw.view("S16").ravel()).bin.encode("hex").str.pad_end(32, "0")
+    return (
+        hexed.to_frame("hex")
+        .select(
+            pl.concat_str(
+                [
+                    pl.col("hex").str.slice(start, length)
+                    for start, length in _UUID_PARTS
+                ],
+                separator="-",
+            )
+        )
+        .to_series()
+        .alias("id")
+    )
+
+
+def _upsert_statement(db: Session, columns: List[str]):
+    """
+    INSERT ... ON CONFLICT (orderId) DO UPDATE yang hanya menyentuh baris
+    dengan rowHash berbeda; version dinaikkan dan validasi di-reset
+    uploadedAt tidak diubah (watermark baris baru untuk index rekomendasi);
+    updatedAt diisi uploadedAt baris yang masuk, yaitu timestamp Python yang
+    sama dengan jalur insert (bukan CURRENT_TIMESTAMP database yang UTC).
+    Args:
+        db: Session database (SQLite atau PostgreSQL)
+        columns: Kolom yang di-insert (kolom lain tidak ditimpa saat update)
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        raise ValueError(f"Mode upsert tidak didukung untuk database {dialect}")
+
+    table = DeliveryData.__table__
+    statement = dialect_insert(table)
+    changes = {
+        column: statement.excluded[column]
+        for column in columns
+        if column not in ("id", "orderId", "version", "uploadedAt")
+    }
+    # Literal SQL (bukan bind parameter) agar urutan parameter executemany tetap
+    changes["version"] = func.coalesce(
+        table.c.version, literal_column("1")
+    ) + literal_column("1")
+    changes["updatedAt"] = statement.excluded.uploadedAt
+    changes["validatedAt"] = null()
+    changes["validatedBy"] = null()
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.orderId],
+        set_=changes,
+        where=table.c.rowHash.is_distinct_from(statement.excluded.rowHash),
+    )
+
+
+def _insert_batch(db: Session, batch: pl.DataFrame, statement=None) -> None:
+    """
+    Insert satu batch ke DeliveryData
+    SQLite: nilai diformat di Polars (format DateTime SQLAlchemy) lalu
+    executemany langsung ke driver, melewati konversi per nilai SQLAlchemy.
+    Args:
+        db: Session database
+        batch: Baris dengan kolom sesuai tabel DeliveryData
+        statement: Statement insert (default INSERT biasa, atau upsert)
+    """
+    table = DeliveryData.__table__
+    if statement is None:
+        statement = insert(table)
+    if db.get_bind().dialect.name != "sqlite":
+        db.execute(statement, batch.to_dicts())
+        return
+    compiled = statement.compile(
+        dialect=db.get_bind().dialect, column_keys=batch.columns
+    )
+    rows = batch.with_columns(
+        pl.col(pl.Datetime).dt.strftime("%Y-%m-%d %H:%M:%S.%6f"),
+        pl.col(pl.Boolean).cast(pl.Int8),
+    ).rows()
+    db.connection().exec_driver_sql(str(compiled), rows)
+
+
+def _insert_new_rows(db: Session, batch: pl.DataFrame) -> pl.Series:
+    """
+    Insert satu batch mode insert dalam satu transaksi. Order ID yang
+    di-insert writer lain setelah pengecekan awal (IntegrityError) dikeluarkan
+    dari batch, lalu sisa batch di-insert ulang
+    Args:
+        db: Session database
+        batch: Baris dengan kolom sesuai tabel DeliveryData
+    Returns:
+        Mask baris batch yang ditolak karena Order ID sudah ada
+    """
+    clashing = pl.Series("orderId", [], dtype=pl.Utf8)
+    while True:
+        remaining = batch.filter(~pl.col("orderId").is_in(clashing))
+        try:
+            if len(remaining):
+                _insert_batch(db, remaining)
+            db.commit()
+            return batch["orderId"].is_in(clashing)
+        except IntegrityError:
+            db.rollback()
+            found = _existing_hashes(db, remaining["orderId"])["orderId"]
+            if found.is_empty():
+                raise
+            clashing = pl.concat([clashing, found])
+
+
+def ingest_delivery_upload(
+    contents: bytes,
+    filename: str,
+    restaurant_id: str,
+    uploaded_by: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[float, Optional[str]], None]] = None,
+    mode: str = "insert",
+) -> Dict[str, Any]:
+    """
+    Pipeline ingest file delivery ke DeliveryData: baca dengan Polars,
+    validasi + cleansing vektor, turunkan orderMonth/orderHour/deliveryDuration,
+    lalu bulk insert/upsert per batch (satu transaksi per batch). Di mode
+    insert, Order ID yang di-insert writer lain selama ingest ditolak per
+    baris sehingga laporan tetap sesuai dengan baris yang tersimpan
+    Args:
+        contents: Isi file (xlsx/xls/csv/parquet/json)
+        filename: Nama file (menentukan format)
+        restaurant_id: ID restoran untuk semua baris
+        uploaded_by: ID/email pengunggah
+        batch_size: Baris per batch insert (default dari settings)
+        progress: Callback progress (fraksi 0-1, tahap), misal dari job queue
+        mode: "insert" (tolak Order ID yang sudah ada) atau "upsert" (perbarui
+              baris yang isinya berubah dan naikkan version; baris identik
+              dilewati sehingga re-import hanya menulis baris yang berubah)
+    Returns:
+        Laporan {total_rows, inserted, updated, unchanged, rejected, rejects,
+        warnings, quality_score}
+        Baris ditolak jika melanggar aturan severity "error", Order ID duplikat
+        dalam file, atau (mode insert) Order ID sudah ada di database.
+    """
+    if mode not in INGEST_MODES:
+        raise ValueError(
+            f"Mode ingest harus salah satu dari: {', '.join(INGEST_MODES)}"
+        )
+    batch_size = batch_size or settings.ingest_batch_size
+    progress = progress or (lambda fraction, message=None: None)
+
+    progress(0.0, "reading")
+    df = PolarsDataProcessor.read_upload_file(contents, filename)
+    header_errors = [
+        e for e in validate_headers(df.columns) if e["severity"] == "error"
+    ]
+    if header_errors:
+        raise ValueError(header_errors[0]["message"])
+
+    progress(0.1, "validating")
+    data, errors, quality_score = cleanse_delivery_upload(
+        df,
+        restaurant_id=restaurant_id,
+        uploaded_by=uploaded_by,
+        unique_order_ids=False,
+        now=datetime.now(),
+        derive_fields=True,
+    )
+
+    # Alasan reject per baris (nomor baris Excel = index + 2)
+    row_numbers = pl.int_range(pl.len(), dtype=pl.Int64) + 2
+    rejects = [
+        errors.filter(pl.col("severity") == "error").select(
+            "row", pl.col("message").alias("reason")
+        )
+    ]
+    data = data.with_columns(row_numbers.alias("_row"))
+    rejects.append(
+        data.filter(~pl.col("orderId").is_first_distinct())
+        .select("_row", pl.lit("Order ID duplikat dalam file").alias("reason"))
+        .rename({"_row": "row"})
+    )
+
+    db = SessionLocal()
+    try:
+        existing = _existing_hashes(db, data["orderId"])
+        if mode == "insert":
+            rejects.append(
+                data.filter(pl.col("orderId").is_in(existing["orderId"]))
+                .select(
+                    "_row", pl.lit("Order ID sudah ada di database").alias("reason")
+                )
+                .rename({"_row": "row"})
+            )
+        rejects_df = (
+            pl.concat(rejects)
+            .group_by("row", maintain_order=True)
+            .agg(pl.col("reason"))
+            .sort("row")
+        )
+        accepted = data.filter(~pl.col("_row").is_in(rejects_df["row"]))
+        accepted_rows = accepted["_row"]
+        accepted = _to_table_rows(
+            accepted.with_columns(_uuid4_series(len(accepted)), version=pl.lit(1))
+        )
+        accepted = accepted.with_columns(_row_hashes(accepted))
+
+        statement = None
+        unchanged = 0
+        if mode == "upsert":
+            legacy = existing.filter(pl.col("rowHash").is_null())["orderId"]
+            if len(legacy):
+                backfilled = _backfill_row_hashes(db, legacy.to_list())
+                db.commit()
+                existing = pl.concat(
+                    [existing.filter(pl.col("rowHash").is_not_null()), backfilled]
+                )
+            accepted = accepted.join(
+                existing.rename({"rowHash": "_storedHash"}), on="orderId", how="left"
+            )
+            is_unchanged = pl.col("rowHash") == pl.col("_storedHash")
+            unchanged = accepted.select(is_unchanged.sum()).item()
+            accepted = accepted.filter(~is_unchanged.fill_null(False))
+            is_new = accepted["_storedHash"].is_null()
+            accepted = accepted.drop("_storedHash")
+            statement = _upsert_statement(db, accepted.columns)
+
+        progress(0.2, "inserting")
+        if db.get_bind().dialect.name == "sqlite":
+            # Cache halaman lebih besar untuk update index DeliveryData
+            db.connection().exec_driver_sql(
+                f"PRAGMA cache_size = -{SQLITE_INGEST_CACHE_KB}"
+            )
+        written = 0
+        processed = 0
+        late_rejects = []
+        uploaded_at = datetime.min
+        for batch in accepted.iter_slices(batch_size):
+            # uploadedAt unik per batch (satu transaksi) dan naik terus, agar
+            # keyset (uploadedAt, id) index rekomendasi tidak melewatkan baris
+            # dari batch yang belum di-commit saat refresh berjalan di tengah
+            # ingest (resolusi jam bisa kasar, misalnya ~15 ms di Windows)
+            uploaded_at = max(datetime.now(), uploaded_at + timedelta(microseconds=1))
+            batch = batch.with_columns(
+                pl.lit(uploaded_at, dtype=pl.Datetime("us")).alias("uploadedAt")
+            )
+            if mode == "insert":
+                clashed = _insert_new_rows(db, batch)
+                late_rejects.append(
+                    accepted_rows.slice(processed, len(batch)).filter(clashed)
+                )
+                written += len(batch) - int(clashed.sum())
+            else:
+                _insert_batch(db, batch, statement)
+                db.commit()
+                written += len(batch)
+            processed += len(batch)
+            progress(
+                0.2 + 0.8 * processed / len(accepted),
+                f"inserting {processed}/{len(accepted)}",
+            )
+    finally:
+        db.close()
+    if late_rejects:
+        rejects_df = pl.concat(
+            [
+                rejects_df,
+                pl.concat(late_rejects)
+                .to_frame("row")
+                .with_columns(
+                    pl.concat_list(pl.lit("Order ID sudah ada di database")).alias(
+                        "reason"
+                    )
+                ),
+            ]
+        ).sort("row")
+    inserted = int(is_new.sum()) if mode == "upsert" else written
+    if written:
+        invalidate_series_cache()
+
+    return {
+        "total_rows": len(df),
+        "inserted": inserted,
+        "updated": written - inserted,
+        "unchanged": unchanged,
+        "rejected": len(rejects_df),
+        "rejects": rejects_df.head(INGEST_REJECT_PREVIEW).to_dicts(),
+        "warnings": len(errors.filter(pl.col("severity") == "warning")),
+        "quality_score": round(quality_score, 2),
+    }
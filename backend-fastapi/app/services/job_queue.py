@@ -0,0 +1,489 @@
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import polars as pl
+
+from ..config import settings
+from .polars_service import FORECAST_METHODS, PolarsDataProcessor
+
+try:
+    import fcntl
+except ImportError:  # Windows: lock byte file lewat msvcrt
+    fcntl = None
+    import msvcrt
+
+# Status job; "queued"/"running" masih aktif
+JOB_STATUSES = ("queued", "running", "completed", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    params TEXT,
+    filename TEXT,
+    error TEXT,
+    owner TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    has_output INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    expires_at TEXT
+)
+"""
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_store_ready = False
+_futures: Dict[str, Future] = {}
+
+# Proses server pemilik job yang disubmit dari proses ini. Selama proses hidup,
+# file owners/<owner>.lock dikunci eksklusif; OS melepas lock saat proses mati
+# sehingga proses lain bisa tahu job mana yang tidak akan pernah selesai.
+_owner = uuid.uuid4().hex
+_owner_file = None
+
+
+class JobCancelled(Exception):
+    """Dilempar dari callback progress saat job diminta dibatalkan"""
+
+
+def _jobs_root() -> str:
+    return os.path.join(settings.artifact_dir, "jobs")
+
+
+def _connect(root: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(os.path.join(root, "jobs.db"), timeout=30)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _update(root: str, job_id: str, **fields) -> None:
+    assignments = ", ".join(f"{key} = ?" for key in fields)
+    with _connect(root) as conn:
+        conn.execute(
+            f"UPDATE jobs SET {assignments} WHERE id = ?", [*fields.values(), job_id]
+        )
+
+
+def _try_lock(f) -> bool:
+    """Lock eksklusif non-blocking pada file yang terbuka"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _owner_path(root: str, owner: str) -> str:
+    return os.path.join(root, "owners", f"{owner}.lock")
+
+
+def _owner_alive(root: str, owner: Optional[str]) -> bool:
+    """Proses pemilik masih hidup jika lock file owner-nya masih dipegang"""
+    if owner == _owner:
+        return True
+    if owner is None:
+        return False
+    try:
+        f = open(_owner_path(root, owner), "r+")
+    except FileNotFoundError:
+        return False
+    with f:
+        return not _try_lock(f)
+
+
+def recover_orphaned_jobs(root: Optional[str] = None) -> int:
+    """
+    Menandai gagal job aktif yang proses pemiliknya sudah berhenti (server
+    restart/crash); job milik worker server lain yang masih hidup tidak disentuh
+    Returns:
+        Jumlah job yang ditandai gagal
+    """
+    root = root or _jobs_root()
+    with _connect(root) as conn:
+        owners = {
+            row["owner"]
+            for row in conn.execute(
+                "SELECT DISTINCT owner FROM jobs WHERE status IN ('queued', 'running')"
+            )
+        }
+    owners.update(
+        name[: -len(".lock")] for name in os.listdir(os.path.join(root, "owners"))
+    )
+    recovered = 0
+    for owner in owners:
+        if _owner_alive(root, owner):
+            continue
+        with _connect(root) as conn:
+            recovered += conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+                "WHERE status IN ('queued', 'running') AND owner IS ?",
+                ("Server berhenti sebelum job selesai", _now(), owner),
+            ).rowcount
+        if owner is not None:
+            try:
+                os.remove(_owner_path(root, owner))
+            except FileNotFoundError:
+                pass  # sudah dibersihkan proses lain
+    return recovered
+
+
+def _ensure_store() -> str:
+    """
+    Menyiapkan folder dan tabel job serta lock owner proses ini (sekali per
+    proses server), lalu memulihkan job dari proses server yang sudah berhenti
+    """
+    global _store_ready, _owner_file
+    root = _jobs_root()
+    with _pool_lock:
+        if not _store_ready:
+            os.makedirs(os.path.join(root, "owners"), exist_ok=True)
+            with _connect(root) as conn:
+                conn.execute(_SCHEMA)
+                columns = {
+                    row["name"] for row in conn.execute("PRAGMA table_info(jobs)")
+                }
+                if "owner" not in columns:
+                    conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            _owner_file = open(_owner_path(root, _owner), "a")
+            _try_lock(_owner_file)
+            recover_orphaned_jobs(root)
+            _store_ready = True
+    return root
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Process pool job dengan jumlah worker terbatas (dibuat saat job pertama)"""
+    global _pool
+    _ensure_store()
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.job_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+# ==================== JOB HANDLERS ====================
+# Dijalankan di proses worker: (params, input_path, output_dir, progress) -> hasil
+def _read_input(input_path: Optional[str]) -> pl.DataFrame:
+    if input_path is None:
+        raise ValueError("Job ini memerlukan file")
+    with open(input_path, "rb") as f:
+        return PolarsDataProcessor.read_upload_file(f.read(), input_path)
+
+
+def _ingest_job(params, input_path, output_dir, progress) -> Dict[str, Any]:
+    from .ingestion import ingest_delivery_upload
+
+    if input_path is None:
+        raise ValueError("Job ini memerlukan file")
+    with open(input_path, "rb") as f:
+        contents = f.read()
+    return ingest_delivery_upload(
+        contents,
+        input_path,
+        restaurant_id=params["restaurant_id"],
+        uploaded_by=params.get("uploaded_by"),
+        batch_size=params.get("batch_size"),
+        progress=progress,
+        mode=params.get("mode", "insert"),
+    )
+
+
+def _validate_ingest_params(params: Dict[str, Any], has_file: bool) -> None:
+    from .ingestion import INGEST_MODES
+
+    if not has_file:
+        raise ValueError("Job ini memerlukan file")
+    restaurant_id = params.get("restaurant_id")
+    if not isinstance(restaurant_id, str) or not restaurant_id.strip():
+        raise ValueError("Parameter restaurant_id diperlukan untuk job ingest")
+    if params.get("mode", "insert") not in INGEST_MODES:
+        raise ValueError(
+            f"Mode ingest harus salah satu dari: {', '.join(INGEST_MODES)}"
+        )
+    batch_size = params.get("batch_size")
+    if batch_size is not None and (
+        not isinstance(batch_size, int)
+        or isinstance(batch_size, bool)
+        or batch_size < 1
+    ):
+        raise ValueError("batch_size harus bilangan bulat positif")
+
+
+def _clean_job(params, input_path, output_dir, progress) -> Dict[str, Any]:
+    df = _read_input(input_path)
+    progress(0.3, "cleaning")
+    cleaned = PolarsDataProcessor.clean_data(df, **params)
+    progress(0.8, "menyimpan hasil")
+    cleaned.write_parquet(os.path.join(output_dir, "output.parquet"))
+    return {
+        "original_rows": len(df),
+        "cleaned_rows": len(cleaned),
+        "removed_rows": len(df) - len(cleaned),
+        "columns": cleaned.columns,
+        "preview": cleaned.head(10).to_dicts(),
+    }
+
+
+def _profile_job(params, input_path, output_dir, progress) -> Dict[str, Any]:
+    df = _read_input(input_path)
+    progress(0.3, "profiling")
+    return PolarsDataProcessor.profile_dataframe(df, **params)
+
+
+def _forecast_job(params, input_path, output_dir, progress) -> Dict[str, Any]:
+    df = _read_input(input_path)
+    params = dict(params)
+    methods = params.pop("methods", None) or list(FORECAST_METHODS)
+    date_column, value_column = params["date_column"], params["value_column"]
+    df = PolarsDataProcessor.prepare_time_series(df, date_column, value_column)
+    results = {}
+    for i, method in enumerate(methods):
+        progress(0.1 + 0.9 * i / len(methods), method)
+        if method not in FORECAST_METHODS:
+            results[method] = {"error": f"Metode tidak dikenal: {method}"}
+            continue
+        results[method] = FORECAST_METHODS[method](df, presorted=True, **params)
+    return results
+
+
+def _backtest_job(params, input_path, output_dir, progress) -> Dict[str, Any]:
+    df = _read_input(input_path)
+    progress(0.1, "backtesting")
+    return PolarsDataProcessor.backtest_forecasts(df, **{"max_workers": 1, **params})
+
+
+# Validasi parameter sebelum job didaftarkan: (params, ada file) -> None,
+# ValueError jika tidak valid
+JOB_VALIDATORS: Dict[str, Callable[[Dict[str, Any], bool], None]] = {
+    "ingest": _validate_ingest_params,
+}
+
+JOB_HANDLERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "ingest": _ingest_job,
+    "clean": _clean_job,
+    "profile": _profile_job,
+    "forecast": _forecast_job,
+    "backtest": _backtest_job,
+}
+
+
+def _execute_job(root: str, job_id: str, kind: str, params: Dict[str, Any]) -> None:
+    """Entry point proses worker: menjalankan handler dan menyimpan hasil ke disk"""
+    job_dir = os.path.join(root, job_id)
+    with _connect(root) as conn:
+        row = conn.execute(
+            "SELECT status, cancel_requested, filename FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+    if row is None or row["status"] != "queued":
+        return
+    if row["cancel_requested"]:
+        _update(root, job_id, status="cancelled", finished_at=_now())
+        return
+    _update(root, job_id, status="running", started_at=_now())
+
+    def progress(fraction: float, message: Optional[str] = None) -> None:
+        with _connect(root) as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, message = ? WHERE id = ?",
+                (round(min(max(fraction, 0.0), 1.0), 4), message, job_id),
+            )
+            cancelled = conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()[0]
+        if cancelled:
+            raise JobCancelled()
+
+    input_path = (
+        os.path.join(job_dir, f"input_{row['filename']}") if row["filename"] else None
+    )
+    expires_at = (
+        datetime.utcnow() + timedelta(seconds=settings.job_result_ttl_seconds)
+    ).isoformat()
+    try:
+        result = JOB_HANDLERS[kind](params, input_path, job_dir, progress)
+        with open(os.path.join(job_dir, "result.json"), "w") as f:
+            json.dump(result, f, default=str)
+        _update(
+            root,
+            job_id,
+            status="completed",
+            progress=1.0,
+            message=None,
+            has_output=int(os.path.exists(os.path.join(job_dir, "output.parquet"))),
+            finished_at=_now(),
+            expires_at=expires_at,
+        )
+    except JobCancelled:
+        _update(
+            root, job_id, status="cancelled", finished_at=_now(), expires_at=expires_at
+        )
+    except Exception as e:
+        _update(
+            root,
+            job_id,
+            status="failed",
+            error=str(e),
+            finished_at=_now(),
+            expires_at=expires_at,
+        )
+    finally:
+        if input_path and os.path.exists(input_path):
+            os.remove(input_path)
+
+
+# ==================== API ====================
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    job["params"] = json.loads(job["params"]) if job["params"] else {}
+    job["cancel_requested"] = bool(job["cancel_requested"])
+    job["has_output"] = bool(job["has_output"])
+    return job
+
+
+def submit_job(
+    kind: str,
+    params: Optional[Dict[str, Any]] = None,
+    contents: Optional[bytes] = None,
+    filename: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Mendaftarkan job dan menjalankannya di process pool
+    Args:
+        kind: Jenis job (lihat JOB_HANDLERS)
+        params: Parameter handler (harus JSON-serializable)
+        contents: Isi file input (opsional)
+        filename: Nama file input (menentukan format)
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Jenis job harus salah satu dari: {', '.join(JOB_HANDLERS)}")
+    params = params or {}
+    if kind in JOB_VALIDATORS:
+        JOB_VALIDATORS[kind](params, contents is not None)
+    pool = _get_pool()
+    purge_expired_jobs()
+
+    root = _jobs_root()
+    job_id = uuid.uuid4().hex
+    job_dir = os.path.join(root, job_id)
+    os.makedirs(job_dir)
+    stored_name = os.path.basename(filename) if contents is not None else None
+    if stored_name:
+        with open(os.path.join(job_dir, f"input_{stored_name}"), "wb") as f:
+            f.write(contents)
+    with _connect(root) as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, status, params, filename, owner, created_at) "
+            "VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(params), stored_name, _owner, _now()),
+        )
+
+    future = pool.submit(_execute_job, root, job_id, kind, params)
+    _futures[job_id] = future
+
+    def _done(f: Future) -> None:
+        _futures.pop(job_id, None)
+        if not f.cancelled() and f.exception() is not None:
+            _update(
+                root,
+                job_id,
+                status="failed",
+                error=str(f.exception()),
+                finished_at=_now(),
+            )
+
+    future.add_done_callback(_done)
+    return get_job(job_id)
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    with _connect(_ensure_store()) as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _row_to_job(row) if row else None
+
+
+def list_jobs(
+    status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50
+) -> List[Dict[str, Any]]:
+    root = _ensure_store()
+    query, args = "SELECT * FROM jobs WHERE 1 = 1", []
+    if status:
+        query, args = query + " AND status = ?", args + [status]
+    if kind:
+        query, args = query + " AND kind = ?", args + [kind]
+    with _connect(root) as conn:
+        rows = conn.execute(
+            query + " ORDER BY created_at DESC LIMIT ?", args + [limit]
+        ).fetchall()
+    return [_row_to_job(row) for row in rows]
+
+
+def cancel_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Membatalkan job: job antre langsung dibatalkan, job berjalan berhenti
+    pada laporan progress berikutnya
+    """
+    job = get_job(job_id)
+    if job is None or job["status"] not in ("queued", "running"):
+        return job
+    root = _jobs_root()
+    _update(root, job_id, cancel_requested=1)
+    future = _futures.get(job_id)
+    if job["status"] == "queued" and future is not None and future.cancel():
+        _update(root, job_id, status="cancelled", finished_at=_now())
+    return get_job(job_id)
+
+
+def get_job_result(job_id: str) -> Optional[Dict[str, Any]]:
+    """Hasil job yang selesai (None jika belum ada / sudah kedaluwarsa)"""
+    path = os.path.join(_jobs_root(), job_id, "result.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def get_job_output_path(job_id: str) -> Optional[str]:
+    """File output job (misal hasil cleaning dalam Parquet)"""
+    path = os.path.join(_jobs_root(), job_id, "output.parquet")
+    return path if os.path.exists(path) else None
+
+
+def purge_expired_jobs() -> int:
+    """Menghapus job selesai yang melewati TTL beserta file hasilnya"""
+    root = _ensure_store()
+    with _connect(root) as conn:
+        expired = [
+            row["id"]
+            for row in conn.execute(
+                "SELECT id FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (_now(),),
+            )
+        ]
+        conn.executemany("DELETE FROM jobs WHERE id = ?", [(i,) for i in expired])
+    for job_id in expired:
+        shutil.rmtree(os.path.join(root, job_id), ignore_errors=True)
+    return len(expired)
@@ -0,0 +1,409 @@
+import contextvars
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import polars as pl
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..config import settings
+
+# Instrumentasi per request: durasi, jumlah baris, ukuran data, dan kenaikan
+# memori per stage (upload, parse, transform, compute, export, db, serialize,
+# queue). Hasilnya dikirim sebagai header Server-Timing dan diakumulasi ke
+# histogram Prometheus (endpoint x stage) yang dibaca lewat /metrics.
+# Request yang tidak disampling tidak punya RequestTimings; semua hook
+# langsung memanggil fungsi aslinya.
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+ROWS_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10)
+
+_request: contextvars.ContextVar[Optional["RequestTimings"]] = contextvars.ContextVar(
+    "metrics_request", default=None
+)
+# Stage bersarang (mis. read_upload_file -> read_csv_file) tidak dihitung ulang
+_in_stage: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "metrics_in_stage", default=False
+)
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = None
+
+
+def _rss_bytes() -> Optional[int]:
+    """RSS proses saat ini (Linux); None jika tidak tersedia"""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class RequestTimings:
+    """Akumulasi stage satu request; dipakai bersama oleh thread executor"""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        stage: str,
+        seconds: float,
+        rows: Optional[int] = None,
+        nbytes: Optional[int] = None,
+        memory: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(
+                stage,
+                {
+                    "seconds": 0.0,
+                    "count": 0,
+                    "rows": None,
+                    "bytes": None,
+                    "memory": None,
+                },
+            )
+            entry["seconds"] += seconds
+            entry["count"] += 1
+            if rows is not None:
+                entry["rows"] = (entry["rows"] or 0) + rows
+            if nbytes is not None:
+                entry["bytes"] = (entry["bytes"] or 0) + nbytes
+            if memory is not None:
+                entry["memory"] = max(entry["memory"] or 0, memory)
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Nilai header Server-Timing (durasi dalam milidetik)"""
+        with self._lock:
+            parts = [
+                f'{name};dur={entry["seconds"] * 1000:.1f};desc="{entry["count"]}x"'
+                for name, entry in self.stages.items()
+            ]
+        parts.append(f"total;dur={total_seconds * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def record_stage(
+    name: str,
+    seconds: float,
+    rows: Optional[int] = None,
+    nbytes: Optional[int] = None,
+) -> None:
+    """Mencatat stage yang durasinya sudah diukur sendiri (no-op tanpa sampling)"""
+    timings = _request.get()
+    if timings is not None:
+        timings.add(name, seconds, rows, nbytes)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[Dict[str, Any]]:
+    """
+    Mengukur satu stage request
+    Args:
+        name: Nama stage (parse, transform, compute, export, db, ...)
+
+    Yield dict yang boleh diisi "rows"/"bytes" sebelum blok selesai.
+    No-op jika request tidak disampling atau sudah di dalam stage lain.
+    """
+    timings = _request.get()
+    if timings is None or _in_stage.get():
+        yield {}
+        return
+
+    token = _in_stage.set(True)
+    info: Dict[str, Any] = {}
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        elapsed = time.perf_counter() - start
+        _in_stage.reset(token)
+        rss_after = _rss_bytes()
+        memory = None
+        if rss_before is not None and rss_after is not None:
+            memory = max(0, rss_after - rss_before)
+        timings.add(name, elapsed, info.get("rows"), info.get("bytes"), memory)
+
+
+def _result_size(result: Any) -> Tuple[Optional[int], Optional[int]]:
+    """(rows, bytes) dari hasil method: DataFrame, bytes/str, atau list"""
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if isinstance(result, pl.DataFrame):
+        return result.height, result.estimated_size()
+    if isinstance(result, (bytes, str)):
+        return None, len(result)
+    if isinstance(result, list):
+        return len(result), None
+    return None, None
+
+
+def timed(stage_name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator: fungsi dicatat sebagai stage_name pada request yang disampling"""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _request.get() is None or _in_stage.get():
+                return fn(*args, **kwargs)
+            with stage(stage_name) as info:
+                result = fn(*args, **kwargs)
+                info["rows"], info["bytes"] = _result_size(result)
+            return result
+
+        wrapper._metrics_stage = stage_name
+        return wrapper
+
+    return decorator
+
+
+def instrument_methods(cls: type, **stages: Iterable[str]) -> None:
+    """
+    Membungkus static method sebuah class dengan timed()
+    Args:
+        cls: Class service (mis. PolarsDataProcessor)
+        stages: {nama_stage: [nama method, ...]}
+
+    Wrapper memakai qualname yang sama, sehingga method tetap bisa di-pickle
+    untuk executor_backend="process".
+    """
+    for stage_name, names in stages.items():
+        for name in names:
+            method = cls.__dict__[name]
+            if not isinstance(method, staticmethod):
+                raise TypeError(f"{cls.__name__}.{name} bukan staticmethod")
+            setattr(cls, name, staticmethod(timed(stage_name)(method.__func__)))
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Mencatat setiap query SQLAlchemy sebagai stage "db" """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _request.get() is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is not None:
+            rows = cursor.rowcount
+            record_stage(
+                "db", time.perf_counter() - start, rows=rows if rows >= 0 else None
+            )
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse yang mencatat encoding body sebagai stage "serialize" """
+
+    def render(self, content: Any) -> bytes:
+        with stage("serialize") as info:
+            body = super().render(content)
+            info["bytes"] = len(body)
+        return body
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    return ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+
+
+class _Histogram:
+    """Histogram Prometheus sederhana (thread-safe, per proses)"""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = ("endpoint", "stage")
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values: Tuple[str, ...], value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # [count per bucket..., count +Inf, sum]
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for label_values, series in sorted(items):
+            labels = _format_labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{labels},le="{bound:g}"}} {cumulative}'
+                )
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+STAGE_SECONDS = _Histogram(
+    "pizza_stage_duration_seconds",
+    "Durasi per stage request (stage=total untuk seluruh request)",
+    SECONDS_BUCKETS,
+)
+STAGE_ROWS = _Histogram(
+    "pizza_stage_rows", "Jumlah baris yang diproses per stage", ROWS_BUCKETS
+)
+STAGE_BYTES = _Histogram(
+    "pizza_stage_bytes",
+    "Ukuran data (upload, DataFrame, export, body) per stage",
+    BYTES_BUCKETS,
+)
+STAGE_MEMORY = _Histogram(
+    "pizza_stage_memory_bytes",
+    "Kenaikan RSS proses selama stage (perkiraan peak; allocator jarang mengembalikan memori)",
+    BYTES_BUCKETS,
+)
+
+_requests_total: Dict[Tuple[str, str, str], int] = {}
+_requests_lock = threading.Lock()
+
+
+def observe_request(
+    endpoint: str, method: str, status: int, seconds: float, timings: RequestTimings
+) -> None:
+    """Memasukkan semua stage satu request ke histogram"""
+    with _requests_lock:
+        key = (endpoint, method, str(status))
+        _requests_total[key] = _requests_total.get(key, 0) + 1
+    STAGE_SECONDS.observe((endpoint, "total"), seconds)
+    for name, entry in list(timings.stages.items()):
+        labels = (endpoint, name)
+        STAGE_SECONDS.observe(labels, entry["seconds"])
+        if entry["rows"] is not None:
+            STAGE_ROWS.observe(labels, entry["rows"])
+        if entry["bytes"] is not None:
+            STAGE_BYTES.observe(labels, entry["bytes"])
+        if entry["memory"] is not None:
+            STAGE_MEMORY.observe(labels, entry["memory"])
+
+
+def render_metrics() -> str:
+    """Semua metric dalam format teks Prometheus (metric proses ini saja)"""
+    # Import lokal: executor dan dataset_cache memakai modul ini
+    from .dataset_cache import dataset_cache_stats
+    from .executor import executor_stats
+
+    lines = [
+        "# HELP pizza_requests_total Jumlah request yang disampling",
+        "# TYPE pizza_requests_total counter",
+    ]
+    with _requests_lock:
+        requests = sorted(_requests_total.items())
+    for label_values, count in requests:
+        labels = _format_labels(("endpoint", "method", "status"), label_values)
+        lines.append(f"pizza_requests_total{{{labels}}} {count}")
+
+    for histogram in (STAGE_SECONDS, STAGE_ROWS, STAGE_BYTES, STAGE_MEMORY):
+        lines.extend(histogram.render())
+
+    stats = executor_stats()
+    for field in ("limit", "active", "waiting"):
+        name = f"pizza_executor_{field}"
+        lines.append(f"# HELP {name} Service executor per kelas endpoint ({field})")
+        lines.append(f"# TYPE {name} gauge")
+        for endpoint_class, values in stats.items():
+            lines.append(f'{name}{{endpoint_class="{endpoint_class}"}} {values[field]}')
+
+    cache = dataset_cache_stats()
+    for field in ("datasets", "bytes", "in_use"):
+        name = f"pizza_dataset_cache_{field}"
+        lines.append(f"# HELP {name} Cache dataset bersama ({field})")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {cache[field]}")
+
+    rss = _rss_bytes()
+    if rss is not None:
+        lines.append("# HELP pizza_process_resident_memory_bytes RSS proses ini")
+        lines.append("# TYPE pizza_process_resident_memory_bytes gauge")
+        lines.append(f"pizza_process_resident_memory_bytes {rss}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI: sampling request, stage "upload" (waktu sampai body
+    diterima penuh), header Server-Timing, dan histogram per endpoint
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= settings.metrics_sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request.set(timings)
+        start = time.perf_counter()
+        received = 0
+        status = 500
+
+        async def timed_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received and not message.get("more_body", False):
+                    timings.add("upload", time.perf_counter() - start, nbytes=received)
+            return message
+
+        async def timed_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.server_timing_enabled:
+                    value = timings.server_timing(time.perf_counter() - start)
+                    message = {
+                        **message,
+                        "headers": [
+                            *message.get("headers", []),
+                            (b"server-timing", value.encode("latin-1")),
+                        ],
+                    }
+            await send(message)
+
+        try:
+            await self.app(scope, timed_receive, timed_send)
+        finally:
+            _request.reset(token)
+            # Template path (bukan path mentah) agar label tidak meledak
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            observe_request(
+                endpoint, scope["method"], status, time.perf_counter() - start, timings
+            )
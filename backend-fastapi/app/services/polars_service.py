@@ -1,8 +1,46 @@
 import polars as pl
-from typing import Dict, Any, List, Optional
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from statistics import NormalDist
 import io
 import json
+import re
+from ..config import settings
+from .executor import get_process_pool, in_process_worker
+from .metrics import instrument_methods
+
+
+# Header Excel upload -> nama kolom tabel DeliveryData
+EXCEL_DELIVERY_COLUMNS = {
+    "Order ID": "orderId",
+    "Restaurant Name": "restaurantName",
+    "Location": "location",
+    "Order Time": "orderTime",
+    "Delivery Time": "deliveryTime",
+    "Delivery Duration (min)": "deliveryDuration",
+    "Order Month": "orderMonth",
+    "Order Hour": "orderHour",
+    "Pizza Size": "pizzaSize",
+    "Pizza Type": "pizzaType",
+    "Toppings Count": "toppingsCount",
+    "Pizza Complexity": "pizzaComplexity",
+    "Topping Density": "toppingDensity",
+    "Distance (km)": "distanceKm",
+    "Traffic Level": "trafficLevel",
+    "Traffic Impact": "trafficImpact",
+    "Is Peak Hour": "isPeakHour",
+    "Is Weekend": "isWeekend",
+    "Payment Method": "paymentMethod",
+    "Payment Category": "paymentCategory",
+    "Estimated Duration (min)": "estimatedDuration",
+    "Delivery Efficiency (min/km)": "deliveryEfficiency",
+    "Delay (min)": "delayMin",
+    "Is Delayed": "isDelayed",
+    "Restaurant Avg Time": "restaurantAvgTime",
+}
 
 
 class PolarsDataProcessor:
@@ -36,6 +74,19 @@ class PolarsDataProcessor:
         df = pl.read_json(io.BytesIO(file_content))
         return df
 
+    @staticmethod
+    def read_upload_file(file_content: bytes, filename: str) -> pl.DataFrame:
+        """Membaca file upload (Excel/CSV/Parquet/JSON) sesuai ekstensinya"""
+        if filename.endswith((".xlsx", ".xls")):
+            return PolarsDataProcessor.read_excel_file(file_content)
+        elif filename.endswith(".csv"):
+            return PolarsDataProcessor.read_csv_file(file_content)
+        elif filename.endswith(".parquet"):
+            return PolarsDataProcessor.read_parquet_file(file_content)
+        elif filename.endswith(".json"):
+            return PolarsDataProcessor.read_json_file(file_content)
+        raise ValueError("Format file tidak didukung")
+
     # ==================== EXPORT TO ALL FORMATS ====================
     @staticmethod
     def export_to_csv(df: pl.DataFrame) -> str:
@@ -93,20 +144,39 @@ class PolarsDataProcessor:
         df.write_ipc(buffer)
         return buffer.getvalue()
 
+    # ==================== DELIVERY COLUMNS ====================
+    @staticmethod
+    def normalize_delivery_columns(df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Menyamakan nama kolom delivery ke format tabel DeliveryData (camelCase)
+        Menerima header Excel ("Distance (km)") maupun snake_case ("distance_km")
+        """
+        camel_names = set(EXCEL_DELIVERY_COLUMNS.values()) | {"restaurantId"}
+        rename = {}
+        for col in df.columns:
+            if col in EXCEL_DELIVERY_COLUMNS:
+                target = EXCEL_DELIVERY_COLUMNS[col]
+            else:
+                target = re.sub(r"_([a-z])", lambda m: m.group(1).upper(), col)
+            if (
+                target != col
+                and target in camel_names
+                and target not in df.columns
+                and target not in rename.values()
+            ):
+                rename[col] = target
+        return df.rename(rename) if rename else df
+
     # ==================== DATA CLEANSING ====================
     @staticmethod
     def clean_delivery_data(df: pl.DataFrame) -> pl.DataFrame:
         """Membersihkan data delivery"""
         cleaned = df.drop_nulls()
-        columns = cleaned.columns
-        if "order_time" in columns:
-            cleaned = cleaned.with_columns(
-                [pl.col("order_time").str.to_datetime("%Y-%m-%d %H:%M:%S")]
-            )
-        if "delivery_time" in cleaned.columns:
-            cleaned = cleaned.with_columns(
-                [pl.col("delivery_time").str.to_datetime("%Y-%m-%d %H:%M:%S")]
-            )
+        date_columns = [
+            col for col in ("order_time", "delivery_time") if col in cleaned.columns
+        ]
+        if date_columns:
+            cleaned, _ = PolarsDataProcessor.parse_dates(cleaned, columns=date_columns)
         return cleaned
 
     @staticmethod
@@ -114,7 +184,7 @@ class PolarsDataProcessor:
         df: pl.DataFrame,
         drop_nulls: bool = True,
         drop_duplicates: bool = True,
-        fill_null策略: Optional[Dict[str, str]] = None,
+        fill_null_strategy: Optional[Dict[str, str]] = None,
         trim_strings: bool = True,
         convert_dates: bool = True,
         date_columns: Optional[List[str]] = None,
@@ -131,65 +201,422 @@ class PolarsDataProcessor:
             convert_dates: Apakah mengkonversi kolom tanggal
             date_columns: List nama kolom yang akan dikonversi ke tanggal
         """
-        result = df.clone()
+        plan = PolarsDataProcessor.build_cleaning_plan(
+            drop_nulls=drop_nulls,
+            drop_duplicates=drop_duplicates,
+            fill_null_strategy=fill_null_strategy,
+            trim_strings=trim_strings,
+            convert_dates=convert_dates,
+            date_columns=date_columns,
+        )
+        return PolarsDataProcessor.apply_cleaning_plan(df, plan)
 
+    @staticmethod
+    def build_cleaning_plan(
+        drop_nulls: bool = True,
+        drop_duplicates: bool = True,
+        fill_null_strategy: Optional[Dict[str, str]] = None,
+        trim_strings: bool = True,
+        convert_dates: bool = True,
+        date_columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Menyusun cleaning plan dari parameter clean_data"""
+        plan = []
         if drop_nulls:
-            result = result.drop_nulls()
-
+            plan.append({"op": "drop_nulls"})
         if drop_duplicates:
-            result = result.unique()
-
+            plan.append({"op": "drop_duplicates"})
         if trim_strings:
-            string_cols = [
-                col for col in result.columns if result[col].dtype == pl.Utf8
-            ]
-            for col in string_cols:
-                result = result.with_columns(pl.col(col).str.strip())
-
-        if fill_null_strategy:
-            for col, strategy in fill_null_strategy.items():
-                if col in result.columns:
-                    if strategy == "forward":
-                        result = result.with_columns(
-                            pl.col(col).fill_null(strategy="forward")
-                        )
-                    elif strategy == "backward":
-                        result = result.with_columns(
-                            pl.col(col).fill_null(strategy="backward")
-                        )
-                    elif strategy == "mean":
-                        result = result.with_columns(
-                            pl.col(col).fill_null(pl.col(col).mean())
-                        )
-                    elif strategy == "median":
-                        result = result.with_columns(
-                            pl.col(col).fill_null(pl.col(col).median())
-                        )
-                    elif strategy == "min":
-                        result = result.with_columns(
-                            pl.col(col).fill_null(pl.col(col).min())
-                        )
-                    elif strategy == "max":
-                        result = result.with_columns(
-                            pl.col(col).fill_null(pl.col(col).max())
-                        )
-                    elif strategy == "zero":
-                        result = result.with_columns(pl.col(col).fill_null(0))
-
+            plan.append({"op": "trim_strings"})
+        for col, strategy in (fill_null_strategy or {}).items():
+            plan.append({"op": "fill_null", "columns": [col], "strategy": strategy})
         if convert_dates and date_columns:
-            for col in date_columns:
-                if col in result.columns:
-                    try:
-                        result = result.with_columns(
-                            pl.col(col).str.to_datetime("%Y-%m-%d %H:%M:%S")
+            plan.append({"op": "convert_dates", "columns": date_columns})
+        return plan
+
+    @staticmethod
+    def compile_cleaning_plan(
+        lf: pl.LazyFrame, plan: List[Dict[str, Any]]
+    ) -> Tuple[pl.LazyFrame, List[Dict[str, Any]]]:
+        """
+        Mengompilasi cleaning plan menjadi satu lazy query
+        Operasi kolom yang berurutan digabung menjadi satu with_columns (ekspresi
+        per kolom disusun bertingkat); operasi baris memisahkan stage.
+        Args:
+            lf: LazyFrame sumber
+            plan: List operasi, misal
+                {"op": "trim_strings", "columns": [...]} (default semua kolom string)
+                {"op": "fill_null", "columns": [...], "strategy": "mean", "value": ...}
+                {"op": "convert_dates", "columns": [...], "formats": [...]}
+                {"op": "cast", "columns": [...], "dtype": "Float64"}
+                {"op": "drop_nulls", "subset": [...]}
+                {"op": "drop_duplicates", "subset": [...], "keep": "first"}
+        Returns:
+            (LazyFrame hasil, daftar stage untuk explain)
+        """
+        schema = dict(lf.collect_schema())
+        stages: List[Dict[str, Any]] = []
+        pending: Dict[str, pl.Expr] = {}
+        pending_steps: List[Dict[str, Any]] = []
+
+        def flush() -> None:
+            nonlocal lf
+            if pending:
+                lf = lf.with_columns(expr.alias(col) for col, expr in pending.items())
+                stages.append(
+                    {
+                        "stage": "with_columns",
+                        "columns": list(pending),
+                        "steps": list(pending_steps),
+                    }
+                )
+                pending.clear()
+                pending_steps.clear()
+
+        for step in plan:
+            op = step.get("op")
+            requested = step.get("columns")
+            if requested is None and step.get("column"):
+                requested = [step["column"]]
+
+            if op == "trim_strings":
+                columns = [
+                    col
+                    for col in (requested or list(schema))
+                    if schema.get(col) == pl.Utf8
+                ]
+                transform = lambda e: e.str.strip_chars()
+            elif op == "fill_null":
+                strategy = step.get("strategy")
+                if strategy == "custom":
+                    value = step.get("value")
+                    transform = lambda e, value=value: e.fill_null(value)
+                elif strategy in FILL_NULL_STRATEGIES:
+                    transform = FILL_NULL_STRATEGIES[strategy]
+                else:
+                    raise ValueError(f"Strategi fill_null tidak dikenal: {strategy}")
+                columns = [col for col in requested or [] if col in schema]
+            elif op == "convert_dates":
+                formats = step.get("formats") or DEFAULT_DATE_FORMATS
+                excel_serial = step.get("excel_serial", True)
+                columns = [
+                    col
+                    for col in requested or []
+                    if schema.get(col) == pl.Utf8
+                    or (excel_serial and col in schema and schema[col].is_numeric())
+                ]
+                # Format pertama yang cocok dipakai; gagal semua = null
+                transform = lambda e, formats=formats, excel_serial=excel_serial: (
+                    PolarsDataProcessor.date_parse_expr(e, formats, excel_serial)
+                )
+                for col in columns:
+                    schema[col] = pl.Datetime("us")
+            elif op == "cast":
+                dtype = getattr(pl, str(step.get("dtype")), None)
+                if not isinstance(dtype, (pl.DataType, type)):
+                    raise ValueError(f"Tipe data tidak dikenal: {step.get('dtype')}")
+                columns = [col for col in requested or [] if col in schema]
+                transform = lambda e, dtype=dtype: e.cast(dtype, strict=False)
+                for col in columns:
+                    schema[col] = dtype
+            elif op in ("drop_nulls", "drop_duplicates"):
+                flush()
+                subset = step.get("subset")
+                subset = [col for col in subset if col in schema] if subset else None
+                if op == "drop_nulls":
+                    lf = lf.drop_nulls(subset)
+                else:
+                    lf = lf.unique(
+                        subset, keep=step.get("keep", "first"), maintain_order=True
+                    )
+                stages.append({"stage": op, "subset": subset})
+                continue
+            else:
+                raise ValueError(f"Operasi cleaning tidak dikenal: {op}")
+
+            for col in columns:
+                pending[col] = transform(pending.get(col, pl.col(col)))
+            pending_steps.append(
+                {**{k: v for k, v in step.items() if k != "column"}, "columns": columns}
+            )
+
+        flush()
+        return lf, stages
+
+    @staticmethod
+    def resolve_date_formats(
+        df: pl.DataFrame, plan: List[Dict[str, Any]], sample_size: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Melengkapi operasi convert_dates tanpa "formats" dengan format hasil
+        deteksi dari sampel kolom (urut dari yang paling sering cocok) agar
+        plan tidak mencoba semua format kandidat pada setiap baris
+        """
+        resolved = []
+        for step in plan:
+            if step.get("op") == "convert_dates" and not step.get("formats"):
+                detected: Dict[str, int] = {}
+                for col in step.get("columns") or []:
+                    if col in df.columns and df.schema[col] == pl.Utf8:
+                        hits = PolarsDataProcessor.detect_date_formats(
+                            df[col], sample_size=sample_size
                         )
-                    except:
-                        try:
-                            result = result.with_columns(pl.col(col).str.to_date())
-                        except:
-                            pass
+                        for fmt, count in hits.items():
+                            detected[fmt] = detected.get(fmt, 0) + count
+                detected.pop(EXCEL_SERIAL_LABEL, None)
+                if detected:
+                    step = {
+                        **step,
+                        "formats": sorted(detected, key=detected.get, reverse=True),
+                    }
+            resolved.append(step)
+        return resolved
 
-        return result
+    @staticmethod
+    def apply_cleaning_plan(
+        df: pl.DataFrame, plan: List[Dict[str, Any]]
+    ) -> pl.DataFrame:
+        """Menjalankan cleaning plan (satu scan data)"""
+        plan = PolarsDataProcessor.resolve_date_formats(df, plan)
+        lf, _ = PolarsDataProcessor.compile_cleaning_plan(df.lazy(), plan)
+        return lf.collect()
+
+    @staticmethod
+    def explain_cleaning_plan(
+        df: pl.DataFrame, plan: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Dry-run cleaning plan: stage, query plan teroptimasi, dan dampaknya
+        tanpa mengembalikan data hasil cleaning
+        """
+        plan = PolarsDataProcessor.resolve_date_formats(df, plan)
+        lf, stages = PolarsDataProcessor.compile_cleaning_plan(df.lazy(), plan)
+        rows_alias = "__rows__"
+        after = lf.select(pl.all().null_count(), pl.len().alias(rows_alias)).collect()
+
+        return {
+            "stages": stages,
+            "optimized_plan": lf.explain(),
+            "original_rows": len(df),
+            "cleaned_rows": after[rows_alias].item(),
+            "null_counts_before": df.null_count().row(0, named=True),
+            "null_counts_after": after.drop(rows_alias).row(0, named=True),
+            "schema_after": {
+                col: str(dtype) for col, dtype in lf.collect_schema().items()
+            },
+        }
+
+    # ==================== DATE PARSING ====================
+    @staticmethod
+    def date_parse_expr(
+        expr: pl.Expr,
+        formats: Optional[List[str]] = None,
+        excel_serial: bool = True,
+        numeric: bool = False,
+    ) -> pl.Expr:
+        """
+        Ekspresi parsing tanggal multi-format: satu coalesce dari
+        strptime(strict=False) per format, lalu serial Excel
+        Args:
+            expr: Ekspresi kolom (teks, atau angka jika numeric=True)
+            formats: Format kandidat berurutan (default DEFAULT_DATE_FORMATS)
+            excel_serial: Apakah angka serial Excel ikut dikonversi
+            numeric: Kolom bertipe numerik (hanya serial Excel)
+        """
+        parsers = PolarsDataProcessor._date_parsers(
+            expr, formats or DEFAULT_DATE_FORMATS, excel_serial, numeric
+        )
+        return pl.coalesce(list(parsers.values()))
+
+    @staticmethod
+    def _date_parsers(
+        expr: pl.Expr, formats: List[str], excel_serial: bool, numeric: bool
+    ) -> Dict[str, pl.Expr]:
+        """Parser per format (label -> ekspresi Datetime) sesuai urutan coalesce"""
+        parsers: Dict[str, pl.Expr] = {}
+        if not numeric:
+            text = expr.cast(pl.Utf8).str.strip_chars()
+            for fmt in formats:
+                parsers[fmt] = text.str.to_datetime(fmt, strict=False, time_unit="us")
+            serial = text.cast(pl.Float64, strict=False)
+        else:
+            serial = expr.cast(pl.Float64)
+        if excel_serial:
+            low, high = EXCEL_SERIAL_RANGE
+            parsers[EXCEL_SERIAL_LABEL] = (
+                pl.when(serial.is_between(low, high))
+                .then(
+                    pl.lit(EXCEL_EPOCH)
+                    + pl.duration(milliseconds=(serial * 86_400_000).round())
+                )
+                .cast(pl.Datetime("us"))
+            )
+        return parsers
+
+    @staticmethod
+    def detect_date_formats(
+        series: pl.Series,
+        formats: Optional[List[str]] = None,
+        sample_size: int = 1000,
+        excel_serial: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Mendeteksi format tanggal dari sampel kolom (tersebar merata, bukan
+        hanya baris awal)
+        Args:
+            series: Kolom teks
+            formats: Format kandidat (default DEFAULT_DATE_FORMATS)
+            sample_size: Jumlah baris non-null yang diuji
+            excel_serial: Apakah serial Excel ikut dideteksi
+        Returns:
+            {format: jumlah cocok di sampel}, hanya format yang cocok,
+            urut dari yang paling sering
+        """
+        sample = series.drop_nulls()
+        if len(sample) > sample_size:
+            sample = sample.gather_every(len(sample) // sample_size)[:sample_size]
+        parsers = PolarsDataProcessor._date_parsers(
+            pl.col(series.name),
+            formats or DEFAULT_DATE_FORMATS,
+            excel_serial,
+            sample.dtype.is_numeric(),
+        )
+        if not parsers:
+            return {}
+        hits = (
+            sample.to_frame()
+            .select(
+                parser.is_not_null().sum().alias(label)
+                for label, parser in parsers.items()
+            )
+            .row(0, named=True)
+        )
+        return dict(
+            sorted(
+                ((label, count) for label, count in hits.items() if count),
+                key=lambda item: -item[1],
+            )
+        )
+
+    @staticmethod
+    def parse_dates(
+        df: pl.DataFrame,
+        columns: Optional[List[str]] = None,
+        formats: Optional[List[str]] = None,
+        sample_size: int = 1000,
+        excel_serial: bool = True,
+        min_hit_rate: float = 0.8,
+    ) -> Tuple[pl.DataFrame, Dict[str, Dict[str, Any]]]:
+        """
+        Parsing tanggal multi-format tanpa try/except berulang: format dideteksi
+        dari sampel, lalu setiap kolom diparsing sekali dengan satu coalesce
+        Args:
+            df: DataFrame Polars
+            columns: Kolom tanggal (None = kolom teks yang sampelnya terbaca
+                sebagai tanggal minimal min_hit_rate)
+            formats: Format kandidat (default DEFAULT_DATE_FORMATS)
+            sample_size: Jumlah baris sampel untuk deteksi format
+            excel_serial: Apakah angka serial Excel ikut dikonversi
+            min_hit_rate: Ambang deteksi otomatis kolom tanggal
+        Returns:
+            (DataFrame hasil, {kolom: {formats, hits, unparsed}}) dengan hits
+            jumlah baris per format yang dipakai
+        """
+        if columns is None:
+            candidates = [col for col, dtype in df.schema.items() if dtype == pl.Utf8]
+        else:
+            candidates = [
+                col
+                for col in columns
+                if col in df.columns
+                and (df.schema[col] == pl.Utf8 or df.schema[col].is_numeric())
+            ]
+
+        candidate_formats = formats or DEFAULT_DATE_FORMATS
+        parsed_columns = []
+        report = {}
+        for col in candidates:
+            series = df[col]
+            numeric = series.dtype.is_numeric()
+            detected = PolarsDataProcessor.detect_date_formats(
+                series, candidate_formats, sample_size, excel_serial
+            )
+            sampled = min(sample_size, len(series) - series.null_count())
+            if columns is None and (
+                not sampled or sum(detected.values()) < min_hit_rate * sampled
+            ):
+                continue
+
+            # Tahap 1: satu coalesce dari format yang terdeteksi di sampel
+            primary = PolarsDataProcessor._date_parsers(
+                pl.col(col),
+                [fmt for fmt in detected if fmt != EXCEL_SERIAL_LABEL],
+                EXCEL_SERIAL_LABEL in detected,
+                numeric,
+            )
+            values, winner = PolarsDataProcessor._coalesce_parsers(series, primary)
+            labels = list(primary)
+
+            # Tahap 2: format lain hanya untuk baris yang belum terbaca
+            fallback = PolarsDataProcessor._date_parsers(
+                pl.col(col),
+                [fmt for fmt in candidate_formats if fmt not in detected],
+                excel_serial and EXCEL_SERIAL_LABEL not in detected,
+                numeric,
+            )
+            leftover = (values.is_null() & series.is_not_null()).arg_true()
+            if fallback and len(leftover):
+                extra_values, extra_winner = PolarsDataProcessor._coalesce_parsers(
+                    series.gather(leftover), fallback
+                )
+                values = values.scatter(leftover, extra_values)
+                winner = winner.scatter(leftover, extra_winner + len(labels))
+                labels += list(fallback)
+
+            hits = {
+                labels[index]: count
+                for index, count in winner.drop_nulls().value_counts(sort=True).rows()
+            }
+            report[col] = {
+                "formats": list(hits),
+                "hits": hits,
+                "unparsed": values.null_count() - series.null_count(),
+            }
+            parsed_columns.append(values)
+
+        if not parsed_columns:
+            return df, {}
+        return df.with_columns(parsed_columns), report
+
+    @staticmethod
+    def _coalesce_parsers(
+        series: pl.Series, parsers: Dict[str, pl.Expr]
+    ) -> Tuple[pl.Series, pl.Series]:
+        """Hasil coalesce parser dan indeks parser yang dipakai per baris"""
+        if not parsers:
+            return (
+                pl.Series(series.name, [None] * len(series), pl.Datetime("us")),
+                pl.Series("format", [None] * len(series), pl.Int16),
+            )
+        # Setiap format diparsing sekali; coalesce dan penanda format memakai
+        # kolom sementara yang sama
+        temp = [f"__format_{i}" for i in range(len(parsers))]
+        result = (
+            series.to_frame()
+            .lazy()
+            .with_columns(
+                parser.alias(name) for name, parser in zip(temp, parsers.values())
+            )
+            .select(
+                pl.coalesce(temp).alias(series.name),
+                pl.coalesce(
+                    pl.when(pl.col(name).is_not_null()).then(pl.lit(i, pl.Int16))
+                    for i, name in enumerate(temp)
+                ).alias("format"),
+            )
+            .collect()
+        )
+        return result[series.name], result["format"]
 
     @staticmethod
     def remove_duplicates(
@@ -206,6 +633,122 @@ class PolarsDataProcessor:
             return df.unique(subset=subset, keep=keep, maintain_order=True)
         return df.unique(keep=keep, maintain_order=True)
 
+    @staticmethod
+    def find_near_duplicates(
+        df: pl.DataFrame,
+        subset: Optional[List[str]] = None,
+        time_column: Optional[str] = None,
+        tolerance_seconds: float = 60,
+        keep: str = "first",
+        float_precision: int = 2,
+    ) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        """
+        Mendeteksi duplikat mendekati (near-duplicate): kolom kunci dinormalisasi
+        lalu di-hash menjadi signature; baris bersignature sama yang waktunya
+        berselisih <= toleransi digabung menjadi satu cluster (berbasis sort,
+        tanpa perbandingan berpasangan)
+        Args:
+            df: DataFrame Polars
+            subset: Kolom kunci (None = semua kolom selain time_column)
+            time_column: Kolom waktu yang boleh berbeda dalam toleransi
+            tolerance_seconds: Selisih waktu maksimum antar baris berurutan
+            keep: Baris yang dipertahankan per cluster: "first", "last",
+                "most_complete" (null paling sedikit), atau "none"
+            float_precision: Pembulatan kolom float sebelum di-hash
+        Returns:
+            (DataFrame tanpa near-duplicate, cluster {cluster_id, size, rows,
+            survivor}) dengan rows berupa indeks baris asli
+        """
+        if keep not in ("first", "last", "most_complete", "none"):
+            raise ValueError(
+                "keep harus salah satu dari: first, last, most_complete, none"
+            )
+        if time_column is not None and time_column not in df.columns:
+            raise ValueError(f"Kolom waktu tidak ditemukan: {time_column}")
+
+        keys = [
+            col
+            for col in (subset or df.columns)
+            if col in df.columns and col != time_column
+        ]
+        normalized = []
+        for col in keys:
+            expr = pl.col(col)
+            dtype = df.schema[col]
+            if dtype == pl.Utf8:
+                expr = (
+                    expr.str.strip_chars()
+                    .str.replace_all(r"\s+", " ")
+                    .str.to_lowercase()
+                )
+            elif dtype.is_float():
+                expr = expr.round(float_precision)
+            normalized.append(expr)
+
+        lf = df.lazy().with_row_index("__row")
+        signature = pl.struct(normalized).hash() if normalized else pl.lit(0, pl.UInt64)
+        lf = lf.with_columns(signature.alias("__signature"))
+
+        new_cluster = pl.col("__signature") != pl.col("__signature").shift()
+        if time_column is not None:
+            times = df[time_column]
+            if times.dtype == pl.Utf8:
+                times = PolarsDataProcessor.parse_dates(
+                    times.to_frame(), columns=[time_column]
+                )[0][time_column]
+            lf = lf.with_columns(times.cast(pl.Datetime("us")).alias("__time"))
+            lf = lf.sort(["__signature", "__time"])
+            # Selisih dengan baris sebelumnya > toleransi = cluster baru;
+            # waktu null tidak digabung dengan baris lain
+            gap = pl.col("__time") - pl.col("__time").shift()
+            new_cluster = new_cluster | (
+                gap > pl.duration(microseconds=int(tolerance_seconds * 1_000_000))
+            ).fill_null(True)
+        else:
+            lf = lf.sort(["__signature", "__row"])
+
+        if keep == "most_complete":
+            order = [pl.sum_horizontal(pl.col(df.columns).is_null()), pl.col("__row")]
+        elif keep == "last":
+            order = [-pl.col("__row").cast(pl.Int64)]
+        else:
+            order = [pl.col("__row")]
+
+        clustered = (
+            lf.with_columns(
+                new_cluster.fill_null(True).cum_sum().cast(pl.UInt32).alias("__cluster")
+            )
+            .with_columns(
+                pl.len().over("__cluster").alias("__size"),
+                pl.col("__row")
+                .sort_by(order)
+                .first()
+                .over("__cluster")
+                .alias("__survivor"),
+            )
+            .collect()
+        )
+
+        clusters = (
+            clustered.filter(pl.col("__size") > 1)
+            .group_by("__cluster")
+            .agg(
+                pl.len().alias("size"),
+                pl.col("__row").sort().alias("rows"),
+                pl.col("__survivor").first().alias("survivor"),
+            )
+            .sort(pl.col("rows").list.first())
+            .with_row_index("cluster_id")
+            .drop("__cluster")
+        )
+
+        if keep == "none":
+            survivors = pl.col("__size") == 1
+        else:
+            survivors = pl.col("__row") == pl.col("__survivor")
+        deduped = clustered.filter(survivors).sort("__row").select(df.columns)
+        return deduped, clusters
+
     @staticmethod
     def fill_missing_values(
         df: pl.DataFrame, column: str, strategy: str, value: Any = None
@@ -250,21 +793,237 @@ class PolarsDataProcessor:
             column: Nama kolom numerik
             method: "iqr" (Interquartile Range) atau "zscore"
         """
-        if column not in df.columns:
+        if column not in df.columns or method not in ("iqr", "zscore"):
             return df
+        result, _ = PolarsDataProcessor.handle_outliers_multi(
+            df, columns=[column], method=method, mode="drop"
+        )
+        # Seperti sebelumnya, baris dengan nilai null di kolom ini ikut dibuang
+        return result.filter(pl.col(column).is_not_null())
 
-        if method == "iqr":
-            q1 = df[column].quantile(0.25)
-            q3 = df[column].quantile(0.75)
-            iqr = q3 - q1
-            lower = q1 - 1.5 * iqr
-            upper = q3 + 1.5 * iqr
-            return df.filter((pl.col(column) >= lower) & (pl.col(column) <= upper))
-        elif method == "zscore":
-            mean = df[column].mean()
-            std = df[column].std()
-            return df.filter((pl.col(column) - mean).abs() <= 3 * std)
-        return df
+    @staticmethod
+    def handle_outliers_multi(
+        df: pl.DataFrame,
+        columns: Optional[List[str]] = None,
+        method: str = "iqr",
+        mode: str = "flag",
+        threshold: Optional[float] = None,
+    ) -> Tuple[pl.DataFrame, Dict[str, Dict[str, Any]]]:
+        """
+        Menangani outlier beberapa kolom sekaligus; statistik semua kolom dihitung
+        dalam satu agregasi dari data asli
+        Args:
+            df: DataFrame Polars
+            columns: Kolom numerik (None = semua kolom numerik)
+            method: "iqr", "zscore", atau "mad" (median absolute deviation)
+            mode: "flag" (kolom <kolom>_outlier + is_outlier), "clip" (winsorize
+                ke batas), atau "drop" (hapus baris yang outlier di kolom mana pun)
+                Nilai null tidak dianggap outlier: tidak di-flag, tidak diubah,
+                dan barisnya tidak dibuang (berbeda dari handle_outliers)
+            threshold: Pengali batas (default: iqr 1.5, zscore 3, mad 3.5)
+        Returns:
+            (DataFrame hasil, {kolom: {lower, upper, outliers}})
+        """
+        if method not in OUTLIER_THRESHOLDS:
+            raise ValueError(
+                f"Method harus salah satu dari: {', '.join(OUTLIER_THRESHOLDS)}"
+            )
+        if mode not in ("flag", "clip", "drop"):
+            raise ValueError("Mode harus salah satu dari: flag, clip, drop")
+        k = OUTLIER_THRESHOLDS[method] if threshold is None else threshold
+
+        if columns is None:
+            columns = [col for col, dtype in df.schema.items() if dtype.is_numeric()]
+        else:
+            columns = [col for col in columns if col in df.columns]
+        if not columns:
+            return df, {}
+
+        # Satu agregasi untuk semua kolom: quantile, moment, atau median + MAD
+        aggregations = []
+        for i, col in enumerate(columns):
+            c = pl.col(col).cast(pl.Float64)
+            if method == "iqr":
+                aggregations += [
+                    c.quantile(0.25).alias(f"{i}|center"),
+                    c.quantile(0.75).alias(f"{i}|spread"),
+                ]
+            elif method == "zscore":
+                aggregations += [
+                    c.mean().alias(f"{i}|center"),
+                    c.std().alias(f"{i}|spread"),
+                ]
+            else:
+                aggregations += [
+                    c.median().alias(f"{i}|center"),
+                    ((c - c.median()).abs().median() * 1.4826).alias(f"{i}|spread"),
+                ]
+        stats = df.lazy().select(aggregations).collect().row(0)
+
+        bounds = {}
+        for i, col in enumerate(columns):
+            first, second = stats[2 * i], stats[2 * i + 1]
+            if first is None or second is None:
+                continue
+            if method == "iqr":
+                iqr = second - first
+                bounds[col] = (first - k * iqr, second + k * iqr)
+            else:
+                bounds[col] = (first - k * second, first + k * second)
+
+        outside = {
+            col: (~pl.col(col).is_between(lower, upper)).fill_null(False)
+            for col, (lower, upper) in bounds.items()
+        }
+        counts = (
+            df.lazy()
+            .select(flag.sum().alias(col) for col, flag in outside.items())
+            .collect()
+            .row(0, named=True)
+            if outside
+            else {}
+        )
+        report = {
+            col: {"lower": lower, "upper": upper, "outliers": counts[col]}
+            for col, (lower, upper) in bounds.items()
+        }
+
+        if not outside:
+            result = df
+        elif mode == "flag":
+            result = df.with_columns(
+                *[flag.alias(f"{col}_outlier") for col, flag in outside.items()],
+                pl.any_horizontal(list(outside.values())).alias("is_outlier"),
+            )
+        elif mode == "clip":
+            result = df.with_columns(
+                pl.col(col).clip(lower, upper) for col, (lower, upper) in bounds.items()
+            )
+        else:
+            result = df.filter(~pl.any_horizontal(list(outside.values())))
+
+        return result, report
+
+    # ==================== DATA PROFILING ====================
+    @staticmethod
+    def profile_dataframe(
+        df: pl.DataFrame,
+        top_k: int = 5,
+        bins: int = 10,
+        quantiles: Tuple[float, ...] = (0.05, 0.25, 0.5, 0.75, 0.95),
+        approximate: Optional[bool] = None,
+        valid_values: Optional[Dict[str, List[Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Profil kualitas data semua kolom dalam satu lazy query
+        Args:
+            df: DataFrame Polars
+            top_k: Jumlah nilai teratas per kolom non-numerik
+            bins: Jumlah bin histogram kolom numerik
+            quantiles: Quantile kolom numerik
+            approximate: n_unique HyperLogLog dan quantile dari sampel
+                (None = otomatis jika baris > PROFILE_EXACT_ROWS)
+            valid_values: {kolom: nilai yang valid} untuk menghitung nilai invalid
+        Returns:
+            {rows, approximate, quality_score, columns: {kolom: profil}}
+        """
+        n_rows = len(df)
+        if approximate is None:
+            approximate = n_rows > PROFILE_EXACT_ROWS
+        valid_values = {
+            col: values for col, values in (valid_values or {}).items() if col in df
+        }
+        step = max(1, n_rows // PROFILE_EXACT_ROWS) if approximate else 1
+
+        # Alias "<posisi kolom>|<statistik>" agar tidak bentrok dengan nama kolom
+        exprs = []
+        for i, (col, dtype) in enumerate(df.schema.items()):
+            c = pl.col(col)
+            exprs.append(c.null_count().alias(f"{i}|nulls"))
+            exprs.append(
+                (c.approx_n_unique() if approximate else c.n_unique()).alias(
+                    f"{i}|n_unique"
+                )
+            )
+            if dtype.is_numeric():
+                sample = c.gather_every(step) if step > 1 else c
+                exprs += [
+                    c.min().alias(f"{i}|min"),
+                    c.max().alias(f"{i}|max"),
+                    c.mean().alias(f"{i}|mean"),
+                    c.std().alias(f"{i}|std"),
+                    pl.concat_list(
+                        [sample.quantile(q).cast(pl.Float64) for q in quantiles]
+                    ).alias(f"{i}|quantiles"),
+                    c.hist(bin_count=bins, include_breakpoint=True)
+                    .implode()
+                    .alias(f"{i}|histogram"),
+                ]
+            elif dtype.is_temporal():
+                exprs += [c.min().alias(f"{i}|min"), c.max().alias(f"{i}|max")]
+            else:
+                if dtype == pl.Boolean:
+                    exprs.append(c.mean().alias(f"{i}|true_rate"))
+                exprs.append(
+                    c.drop_nulls()
+                    .cast(pl.Utf8)
+                    .value_counts(sort=True, name="count")
+                    .head(top_k)
+                    .implode()
+                    .alias(f"{i}|top_values")
+                )
+            if col in valid_values:
+                exprs.append(
+                    (c.is_not_null() & ~c.cast(pl.Utf8).is_in(valid_values[col]))
+                    .sum()
+                    .alias(f"{i}|invalid")
+                )
+
+        stats = df.lazy().select(exprs).collect().row(0, named=True) if exprs else {}
+
+        columns = {}
+        for i, (col, dtype) in enumerate(df.schema.items()):
+            profile = {"dtype": str(dtype)}
+            for key, value in stats.items():
+                position, _, stat = key.partition("|")
+                if int(position) == i:
+                    profile[stat] = _finite_or_none(value)
+            profile["null_rate"] = profile["nulls"] / n_rows if n_rows else 0.0
+            if "quantiles" in profile:
+                profile["quantiles"] = {
+                    str(q): _finite_or_none(v)
+                    for q, v in zip(quantiles, profile["quantiles"])
+                }
+            if "histogram" in profile:
+                # Kolom tanpa nilai menghasilkan breakpoint inf: tidak ditampilkan
+                profile["histogram"] = [
+                    {"upper": b["breakpoint"], "count": b["count"]}
+                    for b in profile["histogram"]
+                    if np.isfinite(b["breakpoint"])
+                ]
+            if "top_values" in profile:
+                profile["top_values"] = [
+                    {"value": v[col], "count": v["count"]} for v in profile["top_values"]
+                ]
+            non_null = n_rows - profile["nulls"]
+            invalid_rate = profile.get("invalid", 0) / non_null if non_null else 0.0
+            profile["invalid_rate"] = invalid_rate
+            profile["quality"] = round(
+                (1 - profile["null_rate"]) * (1 - invalid_rate) * 100, 2
+            )
+            columns[col] = profile
+
+        quality_score = (
+            round(sum(p["quality"] for p in columns.values()) / len(columns), 2)
+            if columns
+            else 0.0
+        )
+        return {
+            "rows": n_rows,
+            "approximate": approximate,
+            "quality_score": quality_score,
+            "columns": columns,
+        }
 
     # ==================== ANALYTICS EXISTING ====================
     @staticmethod
@@ -329,7 +1088,7 @@ class PolarsDataProcessor:
 
         return [
             {"hour": row["order_hour"], "count": row["order_count"]}
-            for row in result.iter_rows()
+            for row in result.iter_rows(named=True)
         ]
 
     @staticmethod
@@ -346,7 +1105,7 @@ class PolarsDataProcessor:
 
         return [
             {"month": row["order_month"], "count": row["order_count"]}
-            for row in result.iter_rows()
+            for row in result.iter_rows(named=True)
         ]
 
     @staticmethod
@@ -368,7 +1127,7 @@ class PolarsDataProcessor:
                 "order_count": row["order_count"],
                 "delay_rate": round(row["delay_rate"] * 100, 2),
             }
-            for row in result.iter_rows()
+            for row in result.iter_rows(named=True)
         ]
 
     @staticmethod
@@ -387,7 +1146,7 @@ class PolarsDataProcessor:
                 "pizza_type": row["pizza_type"],
                 "order_count": row["order_count"],
             }
-            for row in result.iter_rows()
+            for row in result.iter_rows(named=True)
         ]
 
     @staticmethod
@@ -400,7 +1159,7 @@ class PolarsDataProcessor:
 
         return [
             {"payment_method": row["payment_method"], "order_count": row["order_count"]}
-            for row in result.iter_rows()
+            for row in result.iter_rows(named=True)
         ]
 
     @staticmethod
@@ -416,6 +1175,10 @@ class PolarsDataProcessor:
         value_column: str,
         periods: int = 7,
         span: Optional[int] = None,
+        intervals: Optional[List[float]] = None,
+        interval_method: str = "bootstrap",
+        n_paths: int = 1000,
+        presorted: bool = False,
     ) -> Dict[str, Any]:
         """
         Forecasting menggunakan Exponentially Weighted Moving Average
@@ -425,13 +1188,16 @@ class PolarsDataProcessor:
             value_column: Nama kolom nilai yang akan diprediksi
             periods: Jumlah periode ke depan yang akan diprediksi
             span: Span untuk EWMA (jika None, menggunakan periods)
+            intervals: Level prediction interval, misal [0.8, 0.95] (None = tanpa interval)
+            interval_method: "bootstrap" (residual bootstrap) atau "analytic"
+            n_paths: Jumlah simulation path untuk bootstrap
+            presorted: True jika df sudah diurutkan berdasarkan date_column
         """
         if date_column not in df.columns or value_column not in df.columns:
             return {"error": "Column not found"}
 
         try:
-            temp_df = df.clone()
-            temp_df = temp_df.sort(date_column)
+            temp_df = df if presorted else df.sort(date_column)
 
             if span is None:
                 span = min(periods * 2, len(temp_df))
@@ -467,7 +1233,7 @@ class PolarsDataProcessor:
                 for d, v, f in zip(dates[-span:], values[-span:], ewm_values[-span:])
             ]
 
-            return {
+            result = {
                 "success": True,
                 "historical": historical,
                 "forecast": forecast_values,
@@ -475,6 +1241,20 @@ class PolarsDataProcessor:
                 "span": span,
                 "periods": periods,
             }
+
+            if intervals:
+                residuals = [v - f for v, f in zip(values[1:], ewm_values[:-1])]
+                result["intervals"] = PolarsDataProcessor.compute_prediction_intervals(
+                    forecast=forecast_values,
+                    residuals=residuals,
+                    levels=intervals,
+                    model="level",
+                    smoothing=alpha,
+                    method=interval_method,
+                    n_paths=n_paths,
+                )
+
+            return result
         except Exception as e:
             return {"error": str(e)}
 
@@ -485,6 +1265,10 @@ class PolarsDataProcessor:
         value_column: str,
         periods: int = 7,
         window: int = 7,
+        intervals: Optional[List[float]] = None,
+        interval_method: str = "bootstrap",
+        n_paths: int = 1000,
+        presorted: bool = False,
     ) -> Dict[str, Any]:
         """
         Forecasting menggunakan Moving Average
@@ -494,13 +1278,16 @@ class PolarsDataProcessor:
             value_column: Nama kolom nilai yang akan diprediksi
             periods: Jumlah periode ke depan yang akan diprediksi
             window: Ukuran window untuk moving average
+            intervals: Level prediction interval, misal [0.8, 0.95] (None = tanpa interval)
+            interval_method: "bootstrap" (residual bootstrap) atau "analytic"
+            n_paths: Jumlah simulation path untuk bootstrap
+            presorted: True jika df sudah diurutkan berdasarkan date_column
         """
         if date_column not in df.columns or value_column not in df.columns:
             return {"error": "Column not found"}
 
         try:
-            temp_df = df.clone()
-            temp_df = temp_df.sort(date_column)
+            temp_df = df if presorted else df.sort(date_column)
 
             values = temp_df[value_column].to_list()
             dates = temp_df[date_column].to_list()
@@ -524,7 +1311,7 @@ class PolarsDataProcessor:
                 )
             ]
 
-            return {
+            result = {
                 "success": True,
                 "historical": historical,
                 "forecast": forecast_values,
@@ -532,6 +1319,20 @@ class PolarsDataProcessor:
                 "window": window,
                 "periods": periods,
             }
+
+            if intervals:
+                residuals = [v - f for v, f in zip(values[1:], ma_values[:-1])]
+                result["intervals"] = PolarsDataProcessor.compute_prediction_intervals(
+                    forecast=forecast_values,
+                    residuals=residuals,
+                    levels=intervals,
+                    model="level",
+                    smoothing=2 / (window + 1),
+                    method=interval_method,
+                    n_paths=n_paths,
+                )
+
+            return result
         except Exception as e:
             return {"error": str(e)}
 
@@ -541,6 +1342,10 @@ class PolarsDataProcessor:
         date_column: str,
         value_column: str,
         periods: int = 7,
+        intervals: Optional[List[float]] = None,
+        interval_method: str = "bootstrap",
+        n_paths: int = 1000,
+        presorted: bool = False,
     ) -> Dict[str, Any]:
         """
         Forecasting menggunakan Linear Trend
@@ -549,13 +1354,16 @@ class PolarsDataProcessor:
             date_column: Nama kolom tanggal
             value_column: Nama kolom nilai yang akan diprediksi
             periods: Jumlah periode ke depan yang akan diprediksi
+            intervals: Level prediction interval, misal [0.8, 0.95] (None = tanpa interval)
+            interval_method: "bootstrap" (residual bootstrap) atau "analytic"
+            n_paths: Jumlah simulation path untuk bootstrap
+            presorted: True jika df sudah diurutkan berdasarkan date_column
         """
         if date_column not in df.columns or value_column not in df.columns:
             return {"error": "Column not found"}
 
         try:
-            temp_df = df.clone()
-            temp_df = temp_df.sort(date_column)
+            temp_df = df if presorted else df.sort(date_column)
 
             values = temp_df[value_column].to_list()
             dates = temp_df[date_column].to_list()
@@ -590,7 +1398,7 @@ class PolarsDataProcessor:
                 for d, v, f in zip(dates, values, fitted_values)
             ]
 
-            return {
+            result = {
                 "success": True,
                 "historical": historical,
                 "forecast": forecast_values,
@@ -599,6 +1407,312 @@ class PolarsDataProcessor:
                 "intercept": intercept,
                 "periods": periods,
             }
+
+            if intervals:
+                residuals = [v - f for v, f in zip(values, fitted_values)]
+                result["intervals"] = PolarsDataProcessor.compute_prediction_intervals(
+                    forecast=forecast_values,
+                    residuals=residuals,
+                    levels=intervals,
+                    model="trend",
+                    n_obs=n,
+                    method=interval_method,
+                    n_paths=n_paths,
+                    lower_bound=0.0,
+                )
+
+            return result
+        except Exception as e:
+            return {"error": str(e)}
+
+    # ==================== PREDICTION INTERVALS ====================
+    @staticmethod
+    def compute_prediction_intervals(
+        forecast: List[float],
+        residuals: List[float],
+        levels: List[float],
+        model: str = "level",
+        smoothing: float = 1.0,
+        n_obs: Optional[int] = None,
+        method: str = "bootstrap",
+        n_paths: int = 1000,
+        lower_bound: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Menghitung prediction interval untuk point forecast
+        Args:
+            forecast: Point forecast per periode
+            residuals: Residual one-step-ahead in-sample
+            levels: Level interval, misal [0.8, 0.95] (masing-masing 0 < level < 1)
+            model: "level" (EWMA / moving average) atau "trend" (linear trend)
+            smoothing: Alpha untuk model "level"; error menumpuk sebesar alpha per periode
+            n_obs: Jumlah observasi training untuk model "trend"
+            method: "bootstrap" (residual bootstrap) atau "analytic" (varians normal)
+            n_paths: Jumlah simulation path untuk bootstrap
+            lower_bound: Batas bawah interval (misal 0 untuk nilai non-negatif)
+            seed: Seed random generator
+        """
+        levels_error = _interval_levels_error(levels)
+        if levels_error:
+            return {"error": levels_error}
+
+        point = np.asarray(forecast, dtype=np.float64)
+        resid = np.asarray(residuals, dtype=np.float64)
+        resid = resid[np.isfinite(resid)]
+        periods = len(point)
+        horizon = np.arange(1, periods + 1)
+
+        if len(resid) < 2 or periods == 0:
+            return {"error": "Residual tidak cukup untuk menghitung interval"}
+
+        resid = resid - resid.mean()
+
+        if method == "analytic":
+            sigma = resid.std(ddof=1)
+            if model == "trend":
+                n = n_obs or len(resid)
+                x = n - 1 + horizon
+                x_mean = (n - 1) / 2
+                sxx = n * (n**2 - 1) / 12
+                factor = 1 + 1 / n + (x - x_mean) ** 2 / sxx if sxx else 1 + 1 / n
+            else:
+                factor = 1 + (horizon - 1) * smoothing**2
+            scale = sigma * np.sqrt(factor)
+
+            bounds = {}
+            for level in levels:
+                z = NormalDist().inv_cdf(0.5 + level / 2)
+                bounds[level] = (point - z * scale, point + z * scale)
+        else:
+            rng = np.random.default_rng(seed)
+            # Matriks error (n_paths x periods) diambil dari residual
+            errors = rng.choice(resid, size=(n_paths, periods), replace=True)
+            if model == "level":
+                # Level ikut bergeser alpha * error di setiap periode sebelumnya
+                carried = np.cumsum(errors, axis=1)[:, :-1]
+                errors[:, 1:] += smoothing * carried
+            paths = point + errors
+
+            quantiles = sorted(
+                {q for level in levels for q in (0.5 - level / 2, 0.5 + level / 2)}
+            )
+            values = np.quantile(paths, quantiles, axis=0)
+            by_quantile = dict(zip(quantiles, values))
+            bounds = {
+                level: (
+                    by_quantile[0.5 - level / 2],
+                    by_quantile[0.5 + level / 2],
+                )
+                for level in levels
+            }
+
+        result = {}
+        for level, (lower, upper) in bounds.items():
+            if lower_bound is not None:
+                lower = np.maximum(lower, lower_bound)
+                upper = np.maximum(upper, lower_bound)
+            result[str(level)] = {
+                "lower": lower.tolist(),
+                "upper": upper.tolist(),
+            }
+
+        return {
+            "method": method,
+            "levels": levels,
+            "bounds": result,
+        }
+
+    # ==================== BACKTESTING ====================
+    @staticmethod
+    def prepare_time_series(
+        df: pl.DataFrame,
+        date_column: str,
+        value_column: str,
+        interval: Optional[str] = None,
+        agg: str = "sum",
+    ) -> pl.DataFrame:
+        """
+        Menyiapkan deret waktu yang sudah diurutkan (dan opsional di-resample)
+        Args:
+            df: DataFrame Polars
+            date_column: Nama kolom tanggal
+            value_column: Nama kolom nilai
+            interval: Interval resample Polars, misal "1d", "1w", "1mo" (None = tanpa resample)
+            agg: Agregasi saat resample: "sum", "mean", atau "count"
+        """
+        series = df.select([date_column, value_column])
+
+        if interval is None:
+            return series.sort(date_column)
+
+        if series[date_column].dtype == pl.Utf8:
+            series = series.with_columns(
+                pl.col(date_column).str.to_datetime(strict=False)
+            )
+
+        if agg == "mean":
+            agg_expr = pl.col(value_column).mean()
+        elif agg == "count":
+            agg_expr = pl.col(value_column).count()
+        else:
+            agg_expr = pl.col(value_column).sum()
+
+        return (
+            series.drop_nulls(date_column)
+            .sort(date_column)
+            .group_by_dynamic(date_column, every=interval)
+            .agg(agg_expr.cast(pl.Float64).alias(value_column))
+        )
+
+    @staticmethod
+    def backtest_forecasts(
+        df: pl.DataFrame,
+        date_column: str,
+        value_column: str,
+        horizon: int = 7,
+        n_folds: int = 5,
+        step: int = 1,
+        methods: Optional[List[str]] = None,
+        interval: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        intervals: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Rolling-origin cross-validation untuk semua metode forecasting
+        Args:
+            df: DataFrame Polars
+            date_column: Nama kolom tanggal
+            value_column: Nama kolom nilai yang akan diprediksi
+            horizon: Jumlah periode ke depan yang diuji pada setiap fold
+            n_folds: Jumlah titik origin (fold)
+            step: Jarak antar origin (dalam periode)
+            methods: Daftar metode (None = semua metode)
+            interval: Interval resample deret waktu (None = tanpa resample)
+            max_workers: Jumlah bagian fold yang dijalankan paralel di process
+                pool bersama services/executor.py (None = ukuran pool;
+                1 = dijalankan di proses ini)
+            intervals: Level prediction interval yang diuji coverage-nya
+        """
+        if date_column not in df.columns or value_column not in df.columns:
+            return {"error": "Column not found"}
+
+        methods = methods or list(FORECAST_METHODS)
+        unknown = [m for m in methods if m not in FORECAST_METHODS]
+        if unknown:
+            return {"error": f"Unknown methods: {', '.join(unknown)}"}
+        levels_error = _interval_levels_error(intervals)
+        if levels_error:
+            return {"error": levels_error}
+
+        try:
+            series = PolarsDataProcessor.prepare_time_series(
+                df, date_column, value_column, interval=interval
+            )
+            n = len(series)
+            first_origin = n - horizon - (n_folds - 1) * step
+            if horizon < 1 or n_folds < 1 or step < 1 or first_origin < 2:
+                return {
+                    "error": "Data tidak cukup untuk backtesting dengan horizon/fold ini"
+                }
+
+            origins = [first_origin + i * step for i in range(n_folds)]
+            tasks = [(method, origin) for method in methods for origin in origins]
+            levels = intervals or []
+
+            if max_workers == 1 or in_process_worker() or len(tasks) == 1:
+                # Di dalam worker pool (executor_backend="process") fold
+                # dijalankan berurutan: pool tidak dibuat bertingkat
+                fold_results = _run_backtest_chunk(
+                    series, date_column, value_column, tasks, horizon, levels
+                )
+            else:
+                # Pool bersama yang sudah hangat, bukan pool spawn baru per
+                # request; deret waktu dikirim sekali per bagian fold
+                n_chunks = min(len(tasks), max_workers or settings.method_pool_workers)
+                size = -(-len(tasks) // n_chunks)
+                pool = get_process_pool()
+                futures = [
+                    pool.submit(
+                        _run_backtest_chunk,
+                        series,
+                        date_column,
+                        value_column,
+                        tasks[start : start + size],
+                        horizon,
+                        levels,
+                    )
+                    for start in range(0, len(tasks), size)
+                ]
+                fold_results = [r for future in futures for r in future.result()]
+
+            errors = [r for r in fold_results if "error" in r]
+            rows = [row for r in fold_results if "rows" in r for row in r["rows"]]
+            if not rows:
+                return {"error": errors[0]["error"] if errors else "No folds evaluated"}
+
+            scored = pl.DataFrame(
+                rows,
+                schema={
+                    "method": pl.Utf8,
+                    "origin": pl.Int64,
+                    "horizon": pl.Int64,
+                    "actual": pl.Float64,
+                    "forecast": pl.Float64,
+                    **{f"covered_{level}": pl.Boolean for level in levels},
+                },
+                orient="row",
+            ).with_columns(
+                (pl.col("forecast") - pl.col("actual")).alias("error"),
+            )
+
+            metric_exprs = [
+                pl.col("error").abs().mean().alias("mae"),
+                (
+                    (pl.col("error").abs() / pl.col("actual").abs())
+                    .filter(pl.col("actual") != 0)
+                    .mean()
+                    * 100
+                ).alias("mape"),
+                (pl.col("error") ** 2).mean().sqrt().alias("rmse"),
+                *[
+                    pl.col(f"covered_{level}").mean().alias(f"coverage_{level}")
+                    for level in levels
+                ],
+                pl.len().alias("n_forecasts"),
+            ]
+
+            per_horizon = (
+                scored.group_by(["method", "horizon"])
+                .agg(metric_exprs)
+                .sort(["method", "horizon"])
+            )
+            overall = scored.group_by("method").agg(metric_exprs).sort("mae")
+
+            metrics = {}
+            for row in overall.iter_rows(named=True):
+                method = row.pop("method")
+                metrics[method] = {
+                    "overall": row,
+                    "by_horizon": per_horizon.filter(pl.col("method") == method)
+                    .drop("method")
+                    .to_dicts(),
+                }
+
+            return {
+                "success": True,
+                "metrics": metrics,
+                "best_method": overall["method"][0],
+                "horizon": horizon,
+                "n_folds": n_folds,
+                "step": step,
+                "origins": [str(series[date_column][o - 1]) for o in origins],
+                "series_length": n,
+                "failed_folds": [
+                    {"method": r["method"], "origin": r["origin"], "error": r["error"]}
+                    for r in errors
+                ],
+            }
         except Exception as e:
             return {"error": str(e)}
 
@@ -631,13 +1745,13 @@ class PolarsDataProcessor:
                 "order_count": row["order_count"],
                 "percentage": round(row["order_count"] / total_orders * 100, 2),
             }
-            for row in result.iter_rows()
+            for row in result.iter_rows(named=True)
         ]
 
     @staticmethod
     def recommend_by_category(
         df: pl.DataFrame,
-        category_column: str,
+        category_column: Union[str, List[str]],
         item_column: str,
         n: int = 5,
     ) -> List[Dict[str, Any]]:
@@ -645,35 +1759,189 @@ class PolarsDataProcessor:
         Rekomendasi berdasarkan kategori
         Args:
             df: DataFrame Polars
-            category_column: Nama kolom kategori
+            category_column: Nama kolom kategori, atau list kolom (misal
+                ["pizza_size", "traffic_level"]) yang dihitung dalam satu pass
             item_column: Nama kolom item
             n: Jumlah rekomendasi per kategori
         """
-        if df.is_empty():
+        category_columns = (
+            [category_column] if isinstance(category_column, str) else category_column
+        )
+        if (
+            df.is_empty()
+            or item_column not in df.columns
+            or any(col not in df.columns for col in category_columns)
+        ):
             return []
 
-        result = []
-        categories = df[category_column].unique().to_list()
+        if len(category_columns) == 1:
+            long = df.lazy().select(
+                pl.lit(category_columns[0]).alias("category_column"),
+                pl.col(category_columns[0]).alias("category"),
+                pl.col(item_column).alias("item"),
+            )
+        else:
+            # Semua kolom kategori dijadikan format panjang agar cukup satu group_by
+            long = (
+                df.lazy()
+                .select(
+                    pl.col(item_column).alias("item"),
+                    *[pl.col(col).cast(pl.Utf8) for col in category_columns],
+                )
+                .unpivot(
+                    index="item",
+                    on=category_columns,
+                    variable_name="category_column",
+                    value_name="category",
+                )
+            )
 
-        for cat in categories:
-            cat_df = df.filter(pl.col(category_column) == cat)
-            top_items = (
-                cat_df.group_by(item_column)
-                .agg([pl.len().alias("order_count")])
-                .sort("order_count", descending=True)
-                .head(n)
+        top_items = (
+            long.group_by(["category_column", "category", "item"])
+            .agg(pl.len().alias("order_count"))
+            .sort(
+                ["category_column", "category", "order_count", "item"],
+                descending=[False, False, True, False],
+                nulls_last=True,
             )
+            .group_by(["category_column", "category"], maintain_order=True)
+            .head(n)
+            .collect()
+        )
 
-            for row in top_items.iter_rows():
-                result.append(
-                    {
-                        "category": cat,
-                        "item": row[0],
-                        "order_count": row[1],
-                    }
-                )
+        return top_items.to_dicts()
+
+    @staticmethod
+    def hour_band(hour: pl.Expr) -> pl.Expr:
+        """Label rentang jam (HOUR_BANDS) dari ekspresi jam 0-23"""
+        return hour.cut(
+            [start for _, start in HOUR_BANDS[1:]],
+            labels=[label for label, _ in HOUR_BANDS],
+            left_closed=True,
+        ).cast(pl.Utf8)
+
+    @staticmethod
+    def recommend_by_segment(
+        df: pl.DataFrame,
+        segment_columns: List[str],
+        item_column: str,
+        n: int = 5,
+        hour_column: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rekomendasi per segmen (misal lokasi x rentang jam) dalam satu group_by
+        Args:
+            df: DataFrame Polars
+            segment_columns: Kolom pembentuk segmen (misal ["location"])
+            item_column: Nama kolom item
+            n: Jumlah rekomendasi per segmen
+            hour_column: Jika diisi, kolom jam (0-23) ini ditambahkan sebagai
+                segmen "hour_band" (lihat HOUR_BANDS)
+        Returns:
+            List {segment: {kolom: nilai}, recommendations: [{item, order_count}]}
+        """
+        columns = [*segment_columns, item_column] + ([hour_column] if hour_column else [])
+        if df.is_empty() or any(col not in df.columns for col in columns):
+            return []
+
+        segments = list(segment_columns)
+        lazy = df.lazy()
+        if hour_column:
+            lazy = lazy.with_columns(
+                PolarsDataProcessor.hour_band(pl.col(hour_column)).alias("hour_band")
+            )
+            segments.append("hour_band")
+
+        top_items = (
+            lazy.group_by([*segments, item_column])
+            .agg(pl.len().alias("order_count"))
+            .sort(
+                [*segments, "order_count", item_column],
+                descending=[False] * len(segments) + [True, False],
+                nulls_last=True,
+            )
+            .group_by(segments, maintain_order=True)
+            .agg(pl.col(item_column).head(n), pl.col("order_count").head(n))
+            .collect()
+        )
+
+        return [
+            {
+                "segment": {col: row[col] for col in segments},
+                "recommendations": [
+                    {"item": item, "order_count": count}
+                    for item, count in zip(row[item_column], row["order_count"])
+                ],
+            }
+            for row in top_items.iter_rows(named=True)
+        ]
 
-        return result
+    @staticmethod
+    def encode_items(
+        df: pl.DataFrame, item_column: str
+    ) -> Tuple[pl.Series, pl.Expr]:
+        """
+        Encode item ke kode integer 0..K-1 yang urutannya sama dengan urutan item
+        Returns:
+            (katalog item terurut, ekspresi kode UInt32 untuk item_column)
+        """
+        catalog = df[item_column].drop_nulls().unique().sort()
+        if catalog.dtype == pl.Utf8:
+            codes = pl.col(item_column).cast(pl.Enum(catalog.to_list())).to_physical()
+        else:
+            codes = pl.col(item_column).replace_strict(
+                catalog, pl.int_range(len(catalog), eager=True)
+            )
+        return catalog, codes.cast(pl.UInt32)
+
+    @staticmethod
+    def item_cooccurrence_matrix(
+        df: pl.DataFrame,
+        order_id_column: str,
+        item_column: str,
+        block_bytes: int = 64 << 20,
+    ) -> Tuple[pl.Series, np.ndarray]:
+        """
+        Matriks co-occurrence item x item dari perkalian matriks order x item
+        Args:
+            df: DataFrame Polars
+            order_id_column: Nama kolom ID pesanan
+            item_column: Nama kolom item
+            block_bytes: Batas memori matriks order x item per blok
+        Returns:
+            (katalog item, matriks K x K; diagonal = jumlah order yang memuat item)
+        """
+        lines = df.select([order_id_column, item_column]).drop_nulls()
+        catalog, codes = PolarsDataProcessor.encode_items(lines, item_column)
+        n_items = len(catalog)
+
+        # Group per order lalu explode: baris satu order jadi berurutan, kode 0..N-1
+        baskets = (
+            lines.lazy()
+            .select(pl.col(order_id_column).alias("_order"), codes.alias("_item"))
+            .group_by("_order")
+            .agg("_item")
+            .with_row_index("_code")
+            .select("_code", "_item")
+            .explode("_item")
+            .collect()
+        )
+        order_codes = baskets["_code"].to_numpy()
+        item_codes = baskets["_item"].to_numpy()
+        n_orders = int(order_codes[-1]) + 1 if len(order_codes) else 0
+
+        matrix = np.zeros((n_items, n_items), dtype=np.float64)
+        block = max(1, block_bytes // (4 * max(n_items, 1)))
+        starts = np.arange(0, n_orders + block, block)
+        bounds = np.searchsorted(order_codes, starts)
+        for lo, begin, stop in zip(starts[:-1], bounds[:-1], bounds[1:]):
+            if begin == stop:
+                continue
+            incidence = np.zeros((min(block, n_orders - lo), n_items), dtype=np.float32)
+            incidence[order_codes[begin:stop] - lo, item_codes[begin:stop]] = 1.0
+            matrix += incidence.T @ incidence
+
+        return catalog, matrix.astype(np.int64)
 
     @staticmethod
     def recommend_frequently_bought_together(
@@ -681,6 +1949,7 @@ class PolarsDataProcessor:
         order_id_column: str,
         item_column: str,
         n: int = 5,
+        max_dense_items: int = 2048,
     ) -> List[Dict[str, Any]]:
         """
         Rekomendasi item yang sering dibeli bersamaan
@@ -689,6 +1958,8 @@ class PolarsDataProcessor:
             order_id_column: Nama kolom ID pesanan
             item_column: Nama kolom item
             n: Jumlah pasangan rekomendasi
+            max_dense_items: Batas jumlah item untuk engine matriks; di atasnya
+                dipakai self-join Polars per order
         """
         if (
             df.is_empty()
@@ -697,24 +1968,516 @@ class PolarsDataProcessor:
         ):
             return []
 
-        from collections import defaultdict
-        from itertools import combinations
+        if df[item_column].n_unique() > max_dense_items:
+            return PolarsDataProcessor._pair_counts_self_join(
+                df, order_id_column, item_column, n
+            )
+
+        catalog, matrix = PolarsDataProcessor.item_cooccurrence_matrix(
+            df, order_id_column, item_column
+        )
+        rows, cols = np.triu_indices(len(catalog), k=1)
+        counts = matrix[rows, cols]
+
+        # Top-k tanpa sort penuh; seri pada batas diambil urut (item1, item2)
+        candidates = np.flatnonzero(counts)
+        if len(candidates) > n:
+            kth = np.partition(counts[candidates], len(candidates) - n)[
+                len(candidates) - n
+            ]
+            above = candidates[counts[candidates] > kth]
+            ties = candidates[counts[candidates] == kth][: n - len(above)]
+            candidates = np.concatenate([above, ties])
+        candidates = candidates[np.lexsort((candidates, -counts[candidates]))]
 
-        orders = df.group_by(order_id_column).agg(pl.col(item_column).alias("items"))
+        return [
+            {
+                "item1": catalog[int(rows[i])],
+                "item2": catalog[int(cols[i])],
+                "count": int(counts[i]),
+            }
+            for i in candidates
+        ]
 
-        pair_counts = defaultdict(int)
-        for order in orders.iter_rows():
-            items = sorted(set(order[1]))
-            for pair in combinations(items, 2):
-                pair_counts[pair] += 1
+    @staticmethod
+    def _pair_counts_self_join(
+        df: pl.DataFrame, order_id_column: str, item_column: str, n: int
+    ) -> List[Dict[str, Any]]:
+        """Hitung pasangan item dengan self-join per order (katalog besar)"""
+        lines = df.select([order_id_column, item_column]).drop_nulls()
+        catalog, codes = PolarsDataProcessor.encode_items(lines, item_column)
+        baskets = (
+            lines.lazy()
+            .select(pl.col(order_id_column).alias("_order"), codes.alias("a"))
+            .unique()
+        )
 
-        sorted_pairs = sorted(pair_counts.items(), key=lambda x: x[1], reverse=True)
+        # a < b menghasilkan setiap pasangan tepat sekali
+        top_pairs = (
+            baskets.join(baskets.rename({"a": "b"}), on="_order")
+            .filter(pl.col("a") < pl.col("b"))
+            .group_by(["a", "b"])
+            .agg(pl.len().alias("count"))
+            .top_k(n, by=["count", "a", "b"], reverse=[False, True, True])
+            .sort(["count", "a", "b"], descending=[True, False, False])
+            .collect()
+        )
 
         return [
-            {"item1": pair[0], "item2": pair[1], "count": count}
-            for pair, count in sorted_pairs[:n]
+            {"item1": catalog[a], "item2": catalog[b], "count": count}
+            for a, b, count in top_pairs.iter_rows()
         ]
 
+    @staticmethod
+    def recommend_similar_items(
+        df: pl.DataFrame,
+        order_id_column: str,
+        item_column: str,
+        metric: str = "cosine",
+        item: Optional[Any] = None,
+        n: int = 5,
+        min_co_occurrence: int = 1,
+        max_dense_items: int = 2048,
+        block_items: int = 256,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rekomendasi item serupa (item-item similarity) dari matriks order x item
+        Args:
+            df: DataFrame Polars
+            order_id_column: Nama kolom keranjang; bisa ID pesanan atau kolom lain
+                seperti lokasi untuk similarity location x item
+            item_column: Nama kolom item
+            metric: "cosine", "jaccard", atau "lift"
+            item: Jika diisi, hanya item serupa untuk item ini
+            n: Jumlah item serupa per item
+            min_co_occurrence: Minimal jumlah keranjang bersama agar pasangan dihitung
+            max_dense_items: Batas jumlah item untuk engine matriks dense; di atasnya
+                dipakai edge list sparse yang diproses per blok item
+            block_items: Jumlah item acuan per blok pada engine sparse
+        Returns:
+            List {item, similar_item, score, co_occurrence} urut per item lalu skor
+        """
+        if metric not in SIMILARITY_METRICS:
+            raise ValueError(
+                f"Metric tidak dikenal: {metric}. Pilihan: {', '.join(SIMILARITY_METRICS)}"
+            )
+        if (
+            df.is_empty()
+            or order_id_column not in df.columns
+            or item_column not in df.columns
+        ):
+            return []
+
+        lines = df.select([order_id_column, item_column]).drop_nulls()
+        if lines[item_column].n_unique() > max_dense_items:
+            return PolarsDataProcessor._similar_items_sparse(
+                lines, order_id_column, item_column, metric, item, n,
+                min_co_occurrence, block_items,
+            )
+
+        catalog, matrix = PolarsDataProcessor.item_cooccurrence_matrix(
+            lines, order_id_column, item_column
+        )
+        targets = np.arange(len(catalog))
+        if item is not None:
+            # Item dari query string dibandingkan sebagai teks
+            targets = np.flatnonzero((catalog.cast(pl.Utf8) == str(item)).to_numpy())
+        if not len(targets):
+            return []
+
+        support = np.diag(matrix).astype(np.float64)
+        n_orders = lines[order_id_column].n_unique()
+        results = []
+        for lo in range(0, len(targets), block_items):
+            rows = targets[lo : lo + block_items]
+            counts = matrix[rows]
+            scores = SIMILARITY_METRICS[metric](
+                counts.astype(np.float64), support[rows, None], support[None, :], n_orders
+            )
+            scores[counts < max(min_co_occurrence, 1)] = -np.inf
+            scores[np.arange(len(rows)), rows] = -np.inf
+
+            # Sort stabil: skor sama diurutkan menurut urutan katalog
+            top = np.argsort(-scores, axis=1, kind="stable")[:, :n]
+            for i, row in enumerate(rows):
+                for col in top[i]:
+                    score = scores[i, col]
+                    if not np.isfinite(score):
+                        break
+                    results.append(
+                        {
+                            "item": catalog[int(row)],
+                            "similar_item": catalog[int(col)],
+                            "score": round(float(score), 4),
+                            "co_occurrence": int(matrix[row, col]),
+                        }
+                    )
+        return results
+
+    @staticmethod
+    def _similar_items_sparse(
+        lines: pl.DataFrame,
+        order_id_column: str,
+        item_column: str,
+        metric: str,
+        item: Optional[Any],
+        n: int,
+        min_co_occurrence: int,
+        block_items: int,
+    ) -> List[Dict[str, Any]]:
+        """Item serupa dari edge list (order, item) per blok item (katalog besar)"""
+        catalog, codes = PolarsDataProcessor.encode_items(lines, item_column)
+        edges = (
+            lines.lazy()
+            .select(pl.col(order_id_column).alias("_order"), codes.alias("a"))
+            .unique()
+            .collect()
+        )
+        n_orders = edges["_order"].n_unique()
+        support = edges.group_by("a").agg(pl.len().cast(pl.Float64).alias("support_a"))
+
+        targets = np.arange(len(catalog))
+        if item is not None:
+            # Item dari query string dibandingkan sebagai teks
+            targets = np.flatnonzero((catalog.cast(pl.Utf8) == str(item)).to_numpy())
+        if not len(targets):
+            return []
+
+        score = SIMILARITY_METRICS[metric](
+            pl.col("co_occurrence"), pl.col("support_a"), pl.col("support_b"), n_orders
+        )
+        others = edges.lazy().rename({"a": "b"})
+        blocks = []
+        for lo in range(0, len(targets), block_items):
+            # Hanya pasangan dengan item acuan di blok ini yang di-join
+            block = pl.Series(targets[lo : lo + block_items], dtype=pl.UInt32)
+            blocks.append(
+                edges.lazy()
+                .filter(pl.col("a").is_in(block))
+                .join(others, on="_order")
+                .filter(pl.col("a") != pl.col("b"))
+                .group_by(["a", "b"])
+                .agg(pl.len().alias("co_occurrence"))
+                .filter(pl.col("co_occurrence") >= min_co_occurrence)
+                .join(support.lazy(), on="a")
+                .join(support.lazy().rename({"a": "b", "support_a": "support_b"}), on="b")
+                .with_columns(score.alias("score"))
+                .sort(["a", "score", "b"], descending=[False, True, False])
+                .group_by("a", maintain_order=True)
+                .head(n)
+                .collect()
+            )
+
+        return [
+            {
+                "item": catalog[a],
+                "similar_item": catalog[b],
+                "score": round(score, 4),
+                "co_occurrence": co_occurrence,
+            }
+            for a, b, co_occurrence, score in pl.concat(blocks)
+            .select("a", "b", "co_occurrence", "score")
+            .iter_rows()
+        ]
+
+    @staticmethod
+    def transaction_bitmaps(
+        df: pl.DataFrame,
+        order_id_column: str,
+        item_column: str,
+        min_count: int = 1,
+    ) -> Tuple[pl.Series, np.ndarray, np.ndarray, int]:
+        """
+        Encode transaksi menjadi bitmap per item (bit ke-t = order ke-t memuat item)
+        Args:
+            df: DataFrame Polars
+            order_id_column: Nama kolom ID pesanan
+            item_column: Nama kolom item
+            min_count: Item dengan jumlah order di bawah ini tidak di-encode
+        Returns:
+            (katalog item frequent, bitmap uint64 K x W, jumlah order per item,
+            jumlah transaksi)
+        """
+        lines = df.select([order_id_column, item_column]).drop_nulls()
+        n_transactions = lines[order_id_column].n_unique()
+        frequent = (
+            lines.group_by(item_column)
+            .agg(pl.col(order_id_column).n_unique().alias("count"))
+            .filter(pl.col("count") >= min_count)
+        )
+        lines = lines.filter(pl.col(item_column).is_in(frequent[item_column]))
+        catalog, codes = PolarsDataProcessor.encode_items(lines, item_column)
+
+        pairs = (
+            lines.select(
+                pl.col(order_id_column).rank("dense").cast(pl.UInt64).alias("_order") - 1,
+                codes.cast(pl.UInt64).alias("_item"),
+            )
+            .sort(["_item", "_order"])
+        )
+        order_codes = pairs["_order"].to_numpy()
+        item_codes = pairs["_item"].to_numpy()
+        n_words = (n_transactions + 63) // 64
+
+        # Bit tiap (item, order) di-OR per word dengan reduceat (duplikat aman)
+        bitmaps = np.zeros((len(catalog), n_words), dtype=np.uint64)
+        if len(order_codes):
+            keys = item_codes * n_words + order_codes // 64
+            bits = np.left_shift(np.uint64(1), order_codes % 64)
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            bitmaps.reshape(-1)[keys[starts]] = np.bitwise_or.reduceat(bits, starts)
+
+        counts = np.bitwise_count(bitmaps).sum(axis=1, dtype=np.int64)
+        return catalog, bitmaps, counts, n_transactions
+
+    @staticmethod
+    def _apriori_candidates(level: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Kandidat Apriori berikutnya: gabungan pasangan itemset dengan prefix sama
+        yang semua subset-nya frequent
+        Args:
+            level: Itemset frequent berukuran sama (n x k, urut leksikografis)
+        Returns:
+            (indeks itemset parent di level, kode item tambahan) per kandidat,
+            urut leksikografis
+        """
+        n, size = level.shape
+        prefixes = level[:, :-1]
+        new_group = np.r_[True, (prefixes[1:] != prefixes[:-1]).any(axis=1)]
+        group_stops = np.r_[np.flatnonzero(new_group)[1:], n]
+        # Setiap itemset dipasangkan dengan itemset setelahnya di grup yang sama
+        partners = group_stops[np.cumsum(new_group) - 1] - np.arange(n) - 1
+        parents = np.repeat(np.arange(n), partners)
+        offsets = np.arange(len(parents)) - np.repeat(
+            np.cumsum(partners) - partners, partners
+        )
+        items = level[parents + offsets + 1, -1]
+        if size < 2 or not len(parents):
+            return parents, items
+
+        # Subset tanpa item ke-i (i < k - 1) harus frequent; dua subset sisanya
+        # adalah kedua itemset yang digabung
+        columns = [f"item_{j}" for j in range(size)]
+        frequent = pl.DataFrame(level, schema=columns, orient="row")
+        candidates = pl.DataFrame(
+            np.column_stack([level[parents], items]),
+            schema=[f"candidate_{j}" for j in range(size + 1)],
+            orient="row",
+        ).with_row_index()
+        for i in range(size - 1):
+            candidates = candidates.join(
+                frequent,
+                left_on=[f"candidate_{j}" for j in range(size + 1) if j != i],
+                right_on=columns,
+                how="semi",
+            )
+        index = candidates["index"].sort().to_numpy()
+        return parents[index], items[index]
+
+    @staticmethod
+    def mine_frequent_itemsets(
+        df: pl.DataFrame,
+        order_id_column: str,
+        item_column: str,
+        min_support: float = 0.01,
+        max_len: Optional[int] = None,
+        n_partitions: int = 1,
+        block_bytes: int = 64 << 20,
+    ) -> Tuple[pl.Series, Dict[Tuple[int, ...], int], int]:
+        """
+        Itemset frequent (semua ukuran) dengan Apriori tervektorisasi di atas bitmap
+        Args:
+            df: DataFrame Polars
+            order_id_column: Nama kolom ID pesanan
+            item_column: Nama kolom item
+            min_support: Minimal support (proporsi transaksi, 0-1)
+            max_len: Ukuran itemset maksimal (None = tanpa batas)
+            n_partitions: Jumlah partisi transaksi yang dihitung paralel (thread)
+            block_bytes: Batas memori bitmap kandidat per blok
+        Returns:
+            (katalog item, {tuple kode item: jumlah transaksi}, jumlah transaksi)
+        """
+        lines = df.select([order_id_column, item_column]).drop_nulls()
+        min_count = max(1, int(np.ceil(min_support * lines[order_id_column].n_unique())))
+        catalog, bitmaps, counts, n_transactions = (
+            PolarsDataProcessor.transaction_bitmaps(
+                lines, order_id_column, item_column, min_count
+            )
+        )
+
+        itemsets = {(int(i),): int(c) for i, c in enumerate(counts)}
+        level = np.arange(len(catalog)).reshape(-1, 1)
+        n_words = bitmaps.shape[1]
+        bounds = np.linspace(0, n_words, max(1, n_partitions) + 1).astype(int)
+        block = max(1, block_bytes // (8 * max(n_words, 1)))
+
+        def count_support(parents: np.ndarray, items: np.ndarray, lo: int, hi: int):
+            # Support kandidat = popcount(AND bitmap semua item kandidat) di word
+            # lo..hi; bitmap itemset tidak disimpan per level agar memori tetap
+            # dibatasi ukuran blok
+            shared = bitmaps[items, lo:hi]
+            for column in level[parents].T:
+                shared &= bitmaps[column, lo:hi]
+            return np.bitwise_count(shared).sum(axis=1, dtype=np.int64)
+
+        size = 1
+        with ThreadPoolExecutor(max_workers=max(1, n_partitions)) as pool:
+            while len(level) > 1 and (max_len is None or size < max_len):
+                parents, items = PolarsDataProcessor._apriori_candidates(level)
+                if not len(parents):
+                    break
+
+                support = np.zeros(len(parents), dtype=np.int64)
+                for lo in range(0, len(parents), block):
+                    chunk = slice(lo, lo + block)
+                    partial_counts = pool.map(
+                        lambda bound: count_support(
+                            parents[chunk], items[chunk], bound[0], bound[1]
+                        ),
+                        zip(bounds[:-1], bounds[1:]),
+                    )
+                    support[chunk] = np.sum(list(partial_counts), axis=0)
+
+                keep = support >= min_count
+                level = np.column_stack([level[parents[keep]], items[keep]])
+                itemsets.update(
+                    (tuple(int(x) for x in row), int(c))
+                    for row, c in zip(level, support[keep])
+                )
+                size += 1
+
+        return catalog, itemsets, n_transactions
+
+    @staticmethod
+    def recommend_association_rules(
+        df: pl.DataFrame,
+        order_id_column: str,
+        item_column: str,
+        min_support: float = 0.01,
+        min_confidence: float = 0.5,
+        max_len: Optional[int] = None,
+        n: int = 20,
+        n_partitions: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """
+        Association rule (antecedent -> consequent) dengan support, confidence, lift
+        Args:
+            df: DataFrame Polars
+            order_id_column: Nama kolom ID pesanan
+            item_column: Nama kolom item
+            min_support: Minimal support itemset (proporsi transaksi, 0-1)
+            min_confidence: Minimal confidence rule (0-1)
+            max_len: Ukuran itemset maksimal (None = tanpa batas)
+            n: Jumlah rule teratas (urut lift, confidence, support)
+            n_partitions: Jumlah partisi transaksi yang dihitung paralel
+        """
+        if (
+            df.is_empty()
+            or order_id_column not in df.columns
+            or item_column not in df.columns
+        ):
+            return []
+
+        catalog, itemsets, n_transactions = PolarsDataProcessor.mine_frequent_itemsets(
+            df, order_id_column, item_column, min_support, max_len, n_partitions
+        )
+
+        rules = []
+        for itemset, count in itemsets.items():
+            for size in range(1, len(itemset)):
+                for antecedent in combinations(itemset, size):
+                    confidence = count / itemsets[antecedent]
+                    if confidence < min_confidence:
+                        continue
+                    consequent = tuple(i for i in itemset if i not in antecedent)
+                    rules.append(
+                        (
+                            antecedent,
+                            consequent,
+                            count,
+                            confidence,
+                            confidence * n_transactions / itemsets[consequent],
+                        )
+                    )
+        rules.sort(key=lambda rule: (-rule[4], -rule[3], -rule[2], rule[0], rule[1]))
+
+        return [
+            {
+                "antecedent": [catalog[i] for i in antecedent],
+                "consequent": [catalog[i] for i in consequent],
+                "support": round(count / n_transactions, 4),
+                "confidence": round(confidence, 4),
+                "lift": round(lift, 4),
+                "count": count,
+            }
+            for antecedent, consequent, count, confidence, lift in rules[:n]
+        ]
+
+    @staticmethod
+    def trend_scores(
+        counts: pl.LazyFrame,
+        item_column: str,
+        date_column: str,
+        recent_periods: int = 7,
+        half_life: Optional[float] = None,
+    ) -> pl.LazyFrame:
+        """
+        Skor trend untuk semua item dari jumlah order per (item, tanggal)
+        Args:
+            counts: LazyFrame dengan kolom item_column, date_column, dan "count"
+            item_column: Nama kolom item
+            date_column: Nama kolom tanggal
+            recent_periods: Jumlah periode terakhir untuk dibandingkan
+            half_life: Half-life (periode) untuk skor time-decay (None = window)
+        Returns:
+            LazyFrame (item_column, trend, recent_count) urut dari trend tertinggi
+        """
+        # Posisi dihitung mundur dari periode terakhir tiap item
+        counts = counts.sort([item_column, date_column]).with_columns(
+            (pl.len().over(item_column) - 1 - pl.int_range(pl.len()).over(item_column))
+            .alias("position"),
+            (pl.col(date_column).rank("dense", descending=True) - 1).alias("age"),
+        )
+
+        recent = pl.col("position") < recent_periods
+        older = (pl.col("position") >= recent_periods) & (
+            pl.col("position") < 2 * recent_periods
+        )
+        aggregations = [
+            pl.len().alias("n_periods"),
+            pl.col("count").filter(recent).sum().alias("recent_count"),
+            pl.col("count").filter(recent).mean().alias("recent_avg"),
+            pl.col("count").filter(older).mean().alias("older_avg"),
+        ]
+
+        if half_life:
+            weight = 0.5 ** (pl.col("age") / half_life)
+            aggregations.append(
+                ((pl.col("count") * weight).sum() / weight.sum()).alias("decayed_avg")
+            )
+            aggregations.append(pl.col("count").mean().alias("overall_avg"))
+            score = pl.col("decayed_avg") / pl.col("overall_avg") - 1
+        else:
+            older_avg = pl.col("older_avg").fill_null(pl.col("recent_avg"))
+            score = (
+                pl.when(older_avg > 0)
+                .then((pl.col("recent_avg") - older_avg) / older_avg)
+                .otherwise(0.0)
+            )
+
+        return (
+            counts.group_by(item_column)
+            .agg(aggregations)
+            .with_columns(
+                pl.when(pl.col("n_periods") >= 2)
+                .then(score)
+                .otherwise(0.0)
+                .alias("trend")
+            )
+            .sort(["trend", "recent_count"], descending=True)
+            .select(item_column, "trend", "recent_count")
+        )
+
     @staticmethod
     def recommend_trending_items(
         df: pl.DataFrame,
@@ -722,6 +2485,7 @@ class PolarsDataProcessor:
         item_column: str,
         n: int = 10,
         recent_periods: int = 7,
+        half_life: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         """
         Rekomendasi item yang sedang tren (meningkat)
@@ -731,6 +2495,8 @@ class PolarsDataProcessor:
             item_column: Nama kolom item
             n: Jumlah rekomendasi
             recent_periods: Jumlah periode terakhir untuk dibandingkan
+            half_life: Jika diisi, trend dihitung dengan bobot time-decay
+                (half-life dalam periode) dibanding rata-rata seluruh periode
         """
         if (
             df.is_empty()
@@ -739,39 +2505,223 @@ class PolarsDataProcessor:
         ):
             return []
 
-        temp_df = df.clone()
-        temp_df = temp_df.sort(date_column)
-
-        all_items = temp_df[item_column].unique().to_list()
+        # Satu group_by untuk semua item, lalu skor dihitung dengan window expression
+        counts = (
+            df.lazy()
+            .group_by([item_column, date_column])
+            .agg(pl.len().alias("count"))
+        )
+        trends = (
+            PolarsDataProcessor.trend_scores(
+                counts, item_column, date_column, recent_periods, half_life
+            )
+            .head(n)
+            .collect()
+        )
 
-        item_trends = []
-        for item in all_items:
-            item_df = temp_df.filter(pl.col(item_column) == item)
-            item_counts = item_df.group_by(date_column).agg([pl.len().alias("count")])
-            counts = item_counts["count"].to_list()
+        return [
+            {"item": item, "trend": trend, "recent_count": recent_count}
+            for item, trend, recent_count in trends.iter_rows()
+        ]
 
-            if len(counts) >= 2:
-                recent = sum(counts[-recent_periods:]) / min(
-                    recent_periods, len(counts)
-                )
-                older = (
-                    sum(counts[-2 * recent_periods : -recent_periods])
-                    / min(recent_periods, len(counts) - recent_periods)
-                    if len(counts) > recent_periods
-                    else recent
-                )
-                trend = (recent - older) / older if older > 0 else 0
-            else:
-                trend = 0
 
-            item_trends.append(
-                {
-                    "item": item,
-                    "trend": trend,
-                    "recent_count": sum(counts[-recent_periods:]) if counts else 0,
-                }
+# Strategi fill_null untuk cleaning plan: ekspresi kolom -> ekspresi terisi
+FILL_NULL_STRATEGIES = {
+    "forward": lambda e: e.fill_null(strategy="forward"),
+    "backward": lambda e: e.fill_null(strategy="backward"),
+    "mean": lambda e: e.fill_null(e.mean()),
+    "median": lambda e: e.fill_null(e.median()),
+    "min": lambda e: e.fill_null(e.min()),
+    "max": lambda e: e.fill_null(e.max()),
+    "zero": lambda e: e.fill_null(0),
+}
+
+# Format tanggal yang dicoba berurutan oleh operasi convert_dates
+DEFAULT_DATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y-%m-%d",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+    "%m-%d-%Y %H:%M",
+    "%d-%m-%Y %H:%M",
+    "%d-%m-%Y",
+]
+
+# Serial tanggal Excel (hari sejak 1899-12-30); rentang dibatasi 1954-2119
+# agar angka biasa tidak terbaca sebagai tanggal
+EXCEL_EPOCH = datetime(1899, 12, 30)
+EXCEL_SERIAL_RANGE = (20_000, 80_000)
+EXCEL_SERIAL_LABEL = "excel_serial"
+
+# Pengali batas outlier default per metode
+OUTLIER_THRESHOLDS = {"iqr": 1.5, "zscore": 3.0, "mad": 3.5}
+
+# Di atas jumlah baris ini profiling memakai n_unique/quantile aproksimasi
+PROFILE_EXACT_ROWS = 1_000_000
+
+# Rentang jam untuk segmentasi rekomendasi: (label, jam mulai)
+HOUR_BANDS = [
+    ("night", 0),
+    ("morning", 6),
+    ("lunch", 11),
+    ("afternoon", 15),
+    ("dinner", 18),
+    ("late_night", 22),
+]
+
+# Similarity item-item dari jumlah keranjang bersama (co), support tiap item, dan
+# total keranjang; berlaku untuk array NumPy maupun ekspresi Polars
+SIMILARITY_METRICS = {
+    "cosine": lambda co, support_a, support_b, total: co / (support_a * support_b) ** 0.5,
+    "jaccard": lambda co, support_a, support_b, total: co / (support_a + support_b - co),
+    "lift": lambda co, support_a, support_b, total: co * total / (support_a * support_b),
+}
+
+
+# Stage instrumentasi per method (Server-Timing dan histogram /metrics)
+instrument_methods(
+    PolarsDataProcessor,
+    parse=[
+        "read_excel_file",
+        "read_csv_file",
+        "read_parquet_file",
+        "read_json_file",
+        "read_upload_file",
+    ],
+    transform=[
+        "normalize_delivery_columns",
+        "clean_delivery_data",
+        "clean_data",
+        "apply_cleaning_plan",
+        "explain_cleaning_plan",
+        "parse_dates",
+        "remove_duplicates",
+        "find_near_duplicates",
+        "fill_missing_values",
+        "handle_outliers",
+        "handle_outliers_multi",
+        "prepare_time_series",
+    ],
+    compute=[
+        "profile_dataframe",
+        "get_sales_summary",
+        "get_delivery_performance",
+        "get_orders_by_hour",
+        "get_orders_by_month",
+        "get_traffic_analysis",
+        "get_pizza_analysis",
+        "get_payment_analysis",
+        "forecast_exponential_smoothing",
+        "forecast_moving_average",
+        "forecast_linear_trend",
+        "backtest_forecasts",
+        "recommend_popular_items",
+        "recommend_by_category",
+        "recommend_by_segment",
+        "recommend_frequently_bought_together",
+        "recommend_similar_items",
+        "recommend_association_rules",
+        "recommend_trending_items",
+        "mine_frequent_itemsets",
+    ],
+    export=[
+        "export_to_csv",
+        "export_to_csv_file",
+        "export_to_json",
+        "export_to_json_file",
+        "export_to_ndjson",
+        "export_to_parquet",
+        "export_to_parquet_file",
+        "export_to_excel",
+        "export_to_excel_file",
+        "export_to_ipc",
+        "export_to_dict",
+    ],
+)
+
+
+def _finite_or_none(value: Any) -> Any:
+    """NaN/inf tidak valid di JSON: diganti None"""
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def _interval_levels_error(levels: Optional[List[float]]) -> Optional[str]:
+    """Pesan error jika ada level prediction interval di luar (0, 1)"""
+    invalid = [level for level in levels or [] if not 0 < level < 1]
+    if invalid:
+        return f"Level interval harus di antara 0 dan 1 (eksklusif): {invalid}"
+    return None
+
+
+# Nama metode -> fungsi forecasting, dipakai oleh backtesting
+FORECAST_METHODS = {
+    "exponential_smoothing": PolarsDataProcessor.forecast_exponential_smoothing,
+    "moving_average": PolarsDataProcessor.forecast_moving_average,
+    "linear_trend": PolarsDataProcessor.forecast_linear_trend,
+}
+
+
+def _run_backtest_fold(
+    series: pl.DataFrame,
+    date_column: str,
+    value_column: str,
+    method: str,
+    origin: int,
+    horizon: int,
+    levels: Optional[List[float]] = None,
+) -> Dict[str, Any]:
+    """Menjalankan satu fold: latih pada series[:origin], uji pada horizon berikutnya"""
+    train = series.head(origin)
+    actual = series[value_column].slice(origin, horizon).to_list()
+
+    result = FORECAST_METHODS[method](
+        df=train,
+        date_column=date_column,
+        value_column=value_column,
+        periods=len(actual),
+        intervals=levels or None,
+        presorted=True,
+    )
+    if "error" in result:
+        return {"method": method, "origin": origin, "error": result["error"]}
+
+    bounds = result.get("intervals", {}).get("bounds", {})
+    rows = []
+    for h, (a, f) in enumerate(zip(actual, result["forecast"])):
+        if a is None:
+            continue
+        covered = []
+        for level in levels or []:
+            band = bounds.get(str(level))
+            covered.append(
+                band["lower"][h] <= a <= band["upper"][h] if band else None
             )
-
-        sorted_trends = sorted(item_trends, key=lambda x: x["trend"], reverse=True)
-
-        return sorted_trends[:n]
+        rows.append((method, origin, h + 1, float(a), float(f), *covered))
+
+    return {"rows": rows}
+
+
+def _run_backtest_chunk(
+    series: pl.DataFrame,
+    date_column: str,
+    value_column: str,
+    tasks: List[Tuple[str, int]],
+    horizon: int,
+    levels: List[float],
+) -> List[Dict[str, Any]]:
+    """Menjalankan beberapa fold (method, origin) atas deret waktu yang sama"""
+    return [
+        _run_backtest_fold(
+            series, date_column, value_column, method, origin, horizon, levels
+        )
+        for method, origin in tasks
+    ]
@@ -0,0 +1,42 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from ..config import settings
+
+# Cache LRU profil data: (sumber, hash/fingerprint dataset, opsi) -> profil
+_profile_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_profile_lock = threading.Lock()
+
+
+def dataset_hash(contents: bytes) -> str:
+    """Hash isi file upload; file yang sama menghasilkan profil yang sama"""
+    return hashlib.sha256(contents).hexdigest()
+
+
+def get_profile(
+    key: Tuple, compute: Callable[[], Dict[str, Any]]
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Mengambil profil dari cache atau menghitungnya
+    Args:
+        key: Key cache yang memuat hash dataset dan opsi profiling
+        compute: Fungsi tanpa argumen yang menghasilkan profil
+    Returns:
+        (profil, True jika diambil dari cache)
+    """
+    with _profile_lock:
+        if key in _profile_cache:
+            _profile_cache.move_to_end(key)
+            return _profile_cache[key], True
+
+    profile = compute()
+
+    with _profile_lock:
+        _profile_cache[key] = profile
+        _profile_cache.move_to_end(key)
+        while len(_profile_cache) > settings.profile_cache_size:
+            _profile_cache.popitem(last=False)
+
+    return profile, False
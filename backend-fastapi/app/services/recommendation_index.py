@@ -0,0 +1,491 @@
+import json
+import os
+import threading
+from datetime import datetime
+from itertools import product
+from typing import Any, Dict, List, Optional
+
+import polars as pl
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import DeliveryData
+from .polars_service import PolarsDataProcessor
+
+# Item yang direkomendasikan dan kolom kategori yang di-index
+INDEX_ITEM_COLUMN = "pizzaType"
+INDEX_CATEGORY_COLUMNS = ["location", "pizzaSize", "trafficLevel", "paymentMethod"]
+
+# DeliveryData menyimpan satu pizza per order, sehingga basket didefinisikan
+# sebagai order dari lokasi yang sama pada jam yang sama
+INDEX_BASKET_FORMAT = "%Y-%m-%d %H"
+
+# Dimensi segmen; "*" pada lookup berarti semua nilai dimensi tersebut
+SEGMENT_COLUMNS = ["location", "hour_band", "day_type"]
+SEGMENT_ALL = "*"
+
+_SCHEMAS = {
+    "item_counts": {"item": pl.Utf8, "count": pl.Int64},
+    "category_counts": {
+        "category_column": pl.Utf8,
+        "category": pl.Utf8,
+        "item": pl.Utf8,
+        "count": pl.Int64,
+    },
+    "segment_counts": {
+        "location": pl.Utf8,
+        "hour_band": pl.Utf8,
+        "day_type": pl.Utf8,
+        "item": pl.Utf8,
+        "count": pl.Int64,
+    },
+    "daily_counts": {"item": pl.Utf8, "date": pl.Date, "count": pl.Int64},
+    "basket_items": {"basket": pl.Utf8, "item": pl.Utf8},
+    "pair_counts": {"item_a": pl.Utf8, "item_b": pl.Utf8, "count": pl.Int64},
+}
+
+
+def _merge_counts(old: pl.DataFrame, new: pl.DataFrame, keys: List[str]) -> pl.DataFrame:
+    """Menjumlahkan dua tabel count dengan key yang sama"""
+    return (
+        pl.concat([old, new.select(old.columns).cast(old.schema)])
+        .group_by(keys)
+        .agg(pl.col("count").sum())
+        .filter(pl.col("count") > 0)
+    )
+
+
+def _basket_pairs(basket_items: pl.DataFrame) -> pl.DataFrame:
+    """Jumlah basket per pasangan item (item_a < item_b)"""
+    return (
+        basket_items.join(basket_items.rename({"item": "item_b"}), on="basket")
+        .filter(pl.col("item") < pl.col("item_b"))
+        .group_by(["item", "item_b"])
+        .agg(pl.len().cast(pl.Int64).alias("count"))
+        .rename({"item": "item_a"})
+    )
+
+
+class RecommendationIndex:
+    """
+    Index rekomendasi yang disimpan di disk dan diperbarui secara incremental
+    Menyimpan statistik count (bisa dijumlahkan) lalu membangun dict lookup O(1)
+    """
+
+    def __init__(self):
+        self.tables = {
+            name: pl.DataFrame(schema=schema) for name, schema in _SCHEMAS.items()
+        }
+        # Keyset (uploadedAt, id) baris terakhir yang masuk ke index, dan
+        # updatedAt terbesar saat index terakhir disinkronkan
+        self.watermark: Optional[datetime] = None
+        self.watermark_id: Optional[str] = None
+        self.updated_watermark: Optional[datetime] = None
+        self.n_rows = 0
+        self.built_at: Optional[str] = None
+        self.refreshed_at: Optional[str] = None
+
+        self.popular: List[Dict[str, Any]] = []
+        self.category_top: Dict[tuple, List[Dict[str, Any]]] = {}
+        self.segment_top: Dict[tuple, List[Dict[str, Any]]] = {}
+        self.bought_with: Dict[str, List[Dict[str, Any]]] = {}
+        self.trends: Dict[str, Dict[str, Any]] = {}
+        self.trending: List[Dict[str, Any]] = []
+
+    # -------------------- update --------------------
+    def apply(self, rows: pl.DataFrame) -> int:
+        """
+        Menambahkan baris DeliveryData baru ke statistik index
+        Args:
+            rows: DataFrame dengan kolom id, uploadedAt, orderTime, item, dan
+                  kategori; semua baris setelah watermark (uploadedAt, id)
+        Returns:
+            Jumlah baris yang ditambahkan
+        """
+        # Watermark: baris terakhir dalam urutan keyset (uploadedAt, id)
+        latest = rows["uploadedAt"].max() if len(rows) else None
+        if latest is not None:
+            self.watermark = latest
+            self.watermark_id = rows.filter(pl.col("uploadedAt") == latest)["id"].max()
+
+        rows = rows.filter(pl.col(INDEX_ITEM_COLUMN).is_not_null())
+        if rows.is_empty():
+            return 0
+
+        item = pl.col(INDEX_ITEM_COLUMN).cast(pl.Utf8).alias("item")
+        t = self.tables
+
+        t["item_counts"] = _merge_counts(
+            t["item_counts"], rows.group_by(item).agg(pl.len().alias("count")), ["item"]
+        )
+
+        categories = (
+            rows.select(item, *[pl.col(c).cast(pl.Utf8) for c in INDEX_CATEGORY_COLUMNS])
+            .unpivot(
+                index="item",
+                on=INDEX_CATEGORY_COLUMNS,
+                variable_name="category_column",
+                value_name="category",
+            )
+            .drop_nulls()
+            .group_by(["category_column", "category", "item"])
+            .agg(pl.len().alias("count"))
+        )
+        t["category_counts"] = _merge_counts(
+            t["category_counts"], categories, ["category_column", "category", "item"]
+        )
+
+        # Segmen lokasi x rentang jam x hari kerja/akhir pekan dalam satu group_by
+        hour = pl.coalesce(
+            pl.col("orderHour").cast(pl.Int32), pl.col("orderTime").dt.hour().cast(pl.Int32)
+        )
+        weekend = pl.coalesce(pl.col("isWeekend"), pl.col("orderTime").dt.weekday() >= 6)
+        segments = (
+            rows.filter(pl.col("location").is_not_null())
+            .group_by(
+                pl.col("location").cast(pl.Utf8),
+                PolarsDataProcessor.hour_band(hour).alias("hour_band"),
+                pl.when(weekend)
+                .then(pl.lit("weekend"))
+                .otherwise(pl.lit("weekday"))
+                .alias("day_type"),
+                item,
+            )
+            .agg(pl.len().alias("count"))
+        )
+        t["segment_counts"] = _merge_counts(
+            t["segment_counts"], segments, [*SEGMENT_COLUMNS, "item"]
+        )
+
+        daily = rows.group_by(item, pl.col("orderTime").dt.date().alias("date")).agg(
+            pl.len().alias("count")
+        )
+        t["daily_counts"] = _merge_counts(t["daily_counts"], daily, ["item", "date"])
+
+        # Co-occurrence: hanya basket yang tersentuh baris baru yang dihitung ulang
+        new_items = (
+            rows.select(
+                pl.concat_str(
+                    pl.col("location"),
+                    pl.col("orderTime").dt.strftime(INDEX_BASKET_FORMAT),
+                    separator="|",
+                ).alias("basket"),
+                item,
+            )
+            .drop_nulls()
+            .unique()
+        )
+        touched = t["basket_items"].filter(
+            pl.col("basket").is_in(new_items["basket"].unique())
+        )
+        merged = pl.concat([touched, new_items]).unique()
+        delta = pl.concat(
+            [
+                _basket_pairs(merged),
+                _basket_pairs(touched).with_columns(-pl.col("count")),
+            ]
+        )
+        t["pair_counts"] = _merge_counts(
+            t["pair_counts"], delta, ["item_a", "item_b"]
+        )
+        t["basket_items"] = pl.concat(
+            [
+                t["basket_items"],
+                new_items.join(t["basket_items"], on=["basket", "item"], how="anti"),
+            ]
+        )
+
+        self.n_rows += len(rows)
+        self._build_lookups()
+        return len(rows)
+
+    def _build_lookups(self) -> None:
+        """Membangun dict lookup dari statistik count (diganti secara atomik)"""
+        k = settings.recommendation_index_top_k
+        t = self.tables
+        total = t["item_counts"]["count"].sum() or 1
+
+        popular = [
+            {
+                "item": row["item"],
+                "order_count": row["count"],
+                "percentage": round(row["count"] / total * 100, 2),
+            }
+            for row in t["item_counts"]
+            .sort(["count", "item"], descending=[True, False])
+            .iter_rows(named=True)
+        ]
+
+        category_top = {}
+        for row in (
+            t["category_counts"]
+            .sort(
+                ["category_column", "category", "count", "item"],
+                descending=[False, False, True, False],
+            )
+            .group_by(["category_column", "category"], maintain_order=True)
+            .agg(pl.col("item").head(k), pl.col("count").head(k))
+            .iter_rows(named=True)
+        ):
+            category_top[(row["category_column"], row["category"])] = [
+                {"item": i, "order_count": c} for i, c in zip(row["item"], row["count"])
+            ]
+
+        # Rollup ke semua kombinasi dimensi (dimensi yang di-rollup bernilai "*")
+        segment_counts = t["segment_counts"]
+        rollups = []
+        for mask in product([False, True], repeat=len(SEGMENT_COLUMNS)):
+            kept = [c for c, rolled in zip(SEGMENT_COLUMNS, mask) if not rolled]
+            rollups.append(
+                segment_counts.group_by([*kept, "item"])
+                .agg(pl.col("count").sum())
+                .with_columns(
+                    pl.lit(SEGMENT_ALL).alias(c)
+                    for c, rolled in zip(SEGMENT_COLUMNS, mask)
+                    if rolled
+                )
+                .select(*SEGMENT_COLUMNS, "item", "count")
+            )
+        segment_top = {}
+        for row in (
+            pl.concat(rollups)
+            .sort(
+                [*SEGMENT_COLUMNS, "count", "item"],
+                descending=[False] * len(SEGMENT_COLUMNS) + [True, False],
+            )
+            .group_by(SEGMENT_COLUMNS, maintain_order=True)
+            .agg(pl.col("item").head(k), pl.col("count").head(k))
+            .iter_rows(named=True)
+        ):
+            segment_top[tuple(row[c] for c in SEGMENT_COLUMNS)] = [
+                {"item": i, "order_count": c} for i, c in zip(row["item"], row["count"])
+            ]
+
+        pairs = t["pair_counts"]
+        symmetric = pl.concat(
+            [
+                pairs.rename({"item_a": "item", "item_b": "other"}),
+                pairs.rename({"item_b": "item", "item_a": "other"}).select(
+                    "item", "other", "count"
+                ),
+            ]
+        )
+        bought_with = {}
+        for row in (
+            symmetric.sort(["item", "count", "other"], descending=[False, True, False])
+            .group_by("item", maintain_order=True)
+            .agg(pl.col("other").head(k), pl.col("count").head(k))
+            .iter_rows(named=True)
+        ):
+            bought_with[row["item"]] = [
+                {"item": o, "count": c} for o, c in zip(row["other"], row["count"])
+            ]
+
+        trend_rows = (
+            PolarsDataProcessor.trend_scores(t["daily_counts"].lazy(), "item", "date")
+            .collect()
+            .to_dicts()
+        )
+
+        self.popular = popular
+        self.category_top = category_top
+        self.segment_top = segment_top
+        self.bought_with = bought_with
+        self.trends = {row["item"]: row for row in trend_rows}
+        self.trending = trend_rows[:k]
+
+    # -------------------- persistence --------------------
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+        for name, table in self.tables.items():
+            table.write_parquet(os.path.join(tmp_path, f"{name}.parquet"))
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump(self.status(), f)
+
+        if os.path.isdir(path):
+            old_path = f"{path}.old"
+            os.replace(path, old_path)
+            os.replace(tmp_path, path)
+            for name in os.listdir(old_path):
+                os.remove(os.path.join(old_path, name))
+            os.rmdir(old_path)
+        else:
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["RecommendationIndex"]:
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+
+        index = cls()
+        for name in _SCHEMAS:
+            table_path = os.path.join(path, f"{name}.parquet")
+            if not os.path.exists(table_path):
+                # Index dari versi lama tanpa tabel ini: bangun ulang dari awal
+                return None
+            index.tables[name] = pl.read_parquet(table_path)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if "watermark_id" not in meta:
+            # Index dari versi lama (watermark berupa daftar id): bangun ulang
+            return None
+        index.watermark = _parse_timestamp(meta["watermark"])
+        index.watermark_id = meta["watermark_id"]
+        index.updated_watermark = _parse_timestamp(meta["updated_watermark"])
+        index.n_rows = meta["n_rows"]
+        index.built_at = meta["built_at"]
+        index.refreshed_at = meta["refreshed_at"]
+        index._build_lookups()
+        return index
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "n_rows": self.n_rows,
+            "n_items": len(self.tables["item_counts"]),
+            "n_baskets": self.tables["basket_items"]["basket"].n_unique(),
+            "n_segments": len(self.segment_top),
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "watermark_id": self.watermark_id,
+            "updated_watermark": (
+                self.updated_watermark.isoformat() if self.updated_watermark else None
+            ),
+            "built_at": self.built_at,
+            "refreshed_at": self.refreshed_at,
+        }
+
+
+# ==================== INDEX GLOBAL ====================
+_index: Optional[RecommendationIndex] = None
+_index_lock = threading.Lock()
+_background_refresh = threading.Lock()
+
+
+def _index_path() -> str:
+    return os.path.join(settings.artifact_dir, "recommendation_index")
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _after_watermark(index: RecommendationIndex):
+    """Kondisi SQL keyset: (uploadedAt, id) > (watermark, watermark_id)"""
+    return or_(
+        DeliveryData.uploadedAt > index.watermark,
+        and_(
+            DeliveryData.uploadedAt == index.watermark,
+            DeliveryData.id > index.watermark_id,
+        ),
+    )
+
+
+def _read_rows(db: Session, index: RecommendationIndex) -> pl.DataFrame:
+    columns = [
+        "id",
+        "uploadedAt",
+        "orderTime",
+        "orderHour",
+        "isWeekend",
+        INDEX_ITEM_COLUMN,
+    ] + [
+        c for c in INDEX_CATEGORY_COLUMNS if c != INDEX_ITEM_COLUMN
+    ]
+    query = select(*[getattr(DeliveryData, c) for c in dict.fromkeys(columns)])
+    if index.watermark is not None:
+        query = query.where(_after_watermark(index))
+    return pl.read_database(query, connection=db)
+
+
+def _max_updated_at(db: Session) -> Optional[datetime]:
+    return db.execute(select(func.max(DeliveryData.updatedAt))).scalar()
+
+
+def _has_updated_rows(
+    db: Session, index: RecommendationIndex, updated_at: Optional[datetime]
+) -> bool:
+    """
+    Ada baris yang sudah masuk index lalu diubah upsert (updatedAt lebih baru
+    dari updated_watermark, keyset tidak setelah watermark)
+    """
+    if index.watermark is None or updated_at is None:
+        return False
+    query = select(DeliveryData.id).where(
+        DeliveryData.updatedAt <= updated_at, ~_after_watermark(index)
+    )
+    if index.updated_watermark is not None:
+        query = query.where(DeliveryData.updatedAt > index.updated_watermark)
+    return db.execute(query.limit(1)).first() is not None
+
+
+def _build_index(db: Session) -> RecommendationIndex:
+    """Index baru dari seluruh DeliveryData (dipanggil dengan _index_lock)"""
+    global _index
+    index = RecommendationIndex()
+    index.updated_watermark = _max_updated_at(db)
+    index.apply(_read_rows(db, index))
+    index.built_at = index.refreshed_at = datetime.utcnow().isoformat()
+    index.save(_index_path())
+    _index = index
+    return index
+
+
+def get_recommendation_index() -> RecommendationIndex:
+    """Index aktif (dimuat dari disk saat pertama kali dipakai)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = RecommendationIndex.load(_index_path()) or RecommendationIndex()
+    return _index
+
+
+def rebuild_recommendation_index(db: Session) -> RecommendationIndex:
+    """Membangun ulang index dari seluruh DeliveryData"""
+    with _index_lock:
+        return _build_index(db)
+
+
+def refresh_recommendation_index(db: Session) -> int:
+    """
+    Menambahkan baris DeliveryData yang masuk sejak refresh terakhir
+    Statistik index hanya bisa ditambah, sehingga jika ada baris ter-index
+    yang diubah upsert sejak refresh terakhir, index dibangun ulang agar
+    kontribusi lamanya tidak terhitung dua kali. Baris yang dihapus tetap
+    memerlukan rebuild manual.
+    Returns:
+        Jumlah baris yang dibaca ke index (semua baris jika dibangun ulang)
+    """
+    index = get_recommendation_index()
+    with _index_lock:
+        updated_at = _max_updated_at(db)
+        if _has_updated_rows(db, index, updated_at):
+            return _build_index(db).n_rows
+        index.updated_watermark = updated_at or index.updated_watermark
+        added = index.apply(_read_rows(db, index))
+        index.refreshed_at = datetime.utcnow().isoformat()
+        index.built_at = index.built_at or index.refreshed_at
+        index.save(_index_path())
+    return added
+
+
+def index_is_stale(index: RecommendationIndex) -> bool:
+    if index.refreshed_at is None:
+        return True
+    age = datetime.utcnow() - datetime.fromisoformat(index.refreshed_at)
+    return age.total_seconds() > settings.recommendation_index_refresh_seconds
+
+
+def refresh_index_in_background() -> None:
+    """Refresh incremental untuk BackgroundTasks (maksimal satu berjalan)"""
+    if not _background_refresh.acquire(blocking=False):
+        return
+    db = SessionLocal()
+    try:
+        refresh_recommendation_index(db)
+    finally:
+        db.close()
+        _background_refresh.release()
@@ -0,0 +1,148 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import polars as pl
+from sqlalchemy import String, case, func, literal_column, select, type_coerce
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import DeliveryData
+
+# Metrik yang bisa di-forecast, diagregasi di database per time bucket
+SERIES_METRICS = {
+    "orders": lambda: func.count(DeliveryData.id),
+    "avg_delivery_duration": lambda: func.avg(DeliveryData.deliveryDuration),
+    "avg_estimated_duration": lambda: func.avg(DeliveryData.estimatedDuration),
+    "avg_delay": lambda: func.avg(DeliveryData.delayMin),
+    "delay_rate": lambda: func.avg(case((DeliveryData.isDelayed, 1.0), else_=0.0)),
+    "total_distance": lambda: func.sum(DeliveryData.distanceKm),
+}
+
+SERIES_INTERVALS = ("hour", "day", "week", "month")
+
+# Cache LRU: (restaurant_id, metric, interval) -> (fingerprint, DataFrame)
+_series_cache: "OrderedDict[Tuple, Tuple[Tuple, pl.DataFrame]]" = OrderedDict()
+_series_lock = threading.Lock()
+
+
+def _sqlite_strftime(fmt: str, col, *modifiers):
+    """
+    strftime SQLite untuk kolom tanggal yang bisa tersimpan sebagai teks
+    (SQLAlchemy) atau INTEGER epoch milidetik (Prisma)
+    Args:
+        fmt: Format strftime
+        col: Kolom tanggal
+        modifiers: Modifier tambahan strftime (mis. "weekday 0")
+    """
+    return case(
+        (
+            func.typeof(col).in_(("integer", "real")),
+            func.strftime(fmt, col / 1000, "unixepoch", *modifiers),
+        ),
+        else_=func.strftime(fmt, col, *modifiers),
+    )
+
+
+def _bucket_expr(dialect: str, interval: str):
+    """Ekspresi SQL untuk memotong orderTime ke awal time bucket"""
+    col = DeliveryData.orderTime
+    if dialect == "sqlite":
+        if interval == "hour":
+            return _sqlite_strftime("%Y-%m-%d %H:00:00", col)
+        if interval == "day":
+            return _sqlite_strftime("%Y-%m-%d 00:00:00", col)
+        if interval == "week":
+            # Senin sebagai awal minggu
+            return _sqlite_strftime(
+                "%Y-%m-%d 00:00:00", col, "weekday 0", "-6 days"
+            )
+        return _sqlite_strftime("%Y-%m-01 00:00:00", col)
+    if dialect == "postgresql":
+        return func.date_trunc(literal_column(f"'{interval}'"), col)
+    raise ValueError(f"Database {dialect} belum didukung untuk forecast-from-database")
+
+
+def delivery_fingerprint(db: Session, restaurant_id: Optional[str]) -> Tuple[Any, ...]:
+    """Ringkasan murah isi tabel; berubah saat ada baris baru / update versi"""
+    query = select(
+        func.count(DeliveryData.id),
+        # Nilai mentah: tabel Prisma di SQLite menyimpan epoch milidetik yang
+        # tidak bisa diproses tipe DateTime SQLAlchemy
+        type_coerce(func.max(DeliveryData.uploadedAt), String),
+        func.coalesce(func.sum(DeliveryData.version), 0),
+    )
+    if restaurant_id:
+        query = query.where(DeliveryData.restaurantId == restaurant_id)
+    return tuple(db.execute(query).one())
+
+
+def get_aggregated_series(
+    db: Session,
+    metric: str = "orders",
+    interval: str = "day",
+    restaurant_id: Optional[str] = None,
+) -> Tuple[pl.DataFrame, bool]:
+    """
+    Mengambil deret waktu agregat (kolom "period", "value") dari DeliveryData
+    Args:
+        db: Session database
+        metric: Salah satu SERIES_METRICS
+        interval: "hour", "day", "week", atau "month"
+        restaurant_id: Filter restoran (None = semua)
+    Returns:
+        (DataFrame urut berdasarkan period, True jika diambil dari cache)
+    """
+    if metric not in SERIES_METRICS:
+        raise ValueError(f"Metric harus salah satu dari: {', '.join(SERIES_METRICS)}")
+    if interval not in SERIES_INTERVALS:
+        raise ValueError(
+            f"Interval harus salah satu dari: {', '.join(SERIES_INTERVALS)}"
+        )
+
+    key = (restaurant_id, metric, interval)
+    fingerprint = delivery_fingerprint(db, restaurant_id)
+
+    with _series_lock:
+        cached = _series_cache.get(key)
+        if cached and cached[0] == fingerprint:
+            _series_cache.move_to_end(key)
+            return cached[1], True
+
+    bucket = _bucket_expr(db.get_bind().dialect.name, interval).label("period")
+    query = select(bucket, SERIES_METRICS[metric]().label("value"))
+    if restaurant_id:
+        query = query.where(DeliveryData.restaurantId == restaurant_id)
+    query = query.group_by(bucket).order_by(bucket)
+
+    rows = db.execute(query).all()
+    series = pl.DataFrame(
+        {
+            "period": [row[0] for row in rows],
+            "value": [float(row[1]) if row[1] is not None else None for row in rows],
+        },
+        schema_overrides={"value": pl.Float64},
+    )
+    if series["period"].dtype == pl.Utf8:
+        series = series.with_columns(
+            pl.col("period").str.to_datetime("%Y-%m-%d %H:%M:%S", strict=False)
+        )
+    series = series.drop_nulls().sort("period")
+
+    with _series_lock:
+        _series_cache[key] = (fingerprint, series)
+        _series_cache.move_to_end(key)
+        while len(_series_cache) > settings.series_cache_size:
+            _series_cache.popitem(last=False)
+
+    return series, False
+
+
+def invalidate_series_cache(restaurant_id: Optional[str] = None) -> None:
+    """Menghapus cache deret waktu (restoran tertentu atau semua)"""
+    with _series_lock:
+        if restaurant_id is None:
+            _series_cache.clear()
+            return
+        for key in [k for k in _series_cache if k[0] in (restaurant_id, None)]:
+            del _series_cache[key]
@@ -0,0 +1,674 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import polars as pl
+
+# Port dari src/services/cleansing.ts (cleanseData): setiap aturan dievaluasi
+# sebagai ekspresi boolean untuk seluruh baris sekaligus
+PIZZA_SIZES = ["Small", "Medium", "Large", "XL"]
+PIZZA_TYPES = [
+    "Veg",
+    "Non-Veg",
+    "Vegan",
+    "Cheese Burst",
+    "Supreme",
+    "Meat Lovers",
+    "Margherita",
+    "Pepperoni",
+    "Hawaiian",
+    "BBQ Chicken",
+    "Seafood",
+    "Mushroom",
+]
+TRAFFIC_LEVELS = ["Low", "Medium", "High"]
+PAYMENT_METHODS = ["Card", "Cash", "Wallet", "UPI", "Hut Points"]
+PAYMENT_CATEGORIES = ["Online", "Offline"]
+MONTHS = [
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+]
+
+# Alias (huruf kecil) -> nilai baku
+MONTH_ALIASES = {
+    **{month.lower(): month for month in MONTHS},
+    **{month[:3].lower(): month for month in MONTHS},
+    "sept": "September",
+}
+PIZZA_SIZE_ALIASES = {
+    "small": "Small",
+    "s": "Small",
+    "medium": "Medium",
+    "med": "Medium",
+    "m": "Medium",
+    "large": "Large",
+    "l": "Large",
+    "xl": "XL",
+    "extra large": "XL",
+    "extra-large": "XL",
+}
+TRAFFIC_LEVEL_ALIASES = {
+    "low": "Low",
+    "l": "Low",
+    "medium": "Medium",
+    "med": "Medium",
+    "m": "Medium",
+    "high": "High",
+    "h": "High",
+}
+PAYMENT_CATEGORY_ALIASES = {
+    "online": "Online",
+    "digital": "Online",
+    "electronic": "Online",
+    "offline": "Offline",
+    "cash": "Offline",
+    "in-store": "Offline",
+}
+
+# Kata kunci (substring huruf kecil) -> nilai baku; dicek berurutan
+PIZZA_TYPE_KEYWORDS = [
+    (["vegan"], [], "Vegan"),
+    (["plant"], [], "Vegan"),
+    (["veg"], ["non"], "Veg"),
+    (["non", "veg"], [], "Non-Veg"),
+    (["cheese", "burst"], [], "Cheese Burst"),
+    (["supreme"], [], "Supreme"),
+    (["meat"], [], "Meat Lovers"),
+    (["lover"], [], "Meat Lovers"),
+    (["margherita"], [], "Margherita"),
+    (["margarita"], [], "Margherita"),
+    (["pepperoni"], [], "Pepperoni"),
+    (["hawaiian"], [], "Hawaiian"),
+    (["bbq"], [], "BBQ Chicken"),
+    (["chicken"], [], "BBQ Chicken"),
+    (["seafood"], [], "Seafood"),
+    (["mushroom"], [], "Mushroom"),
+]
+PAYMENT_METHOD_KEYWORDS = [
+    (["card"], [], "Card"),
+    (["credit"], [], "Card"),
+    (["debit"], [], "Card"),
+    (["cash"], [], "Cash"),
+    (["wallet"], [], "Wallet"),
+    (["upi"], [], "UPI"),
+    (["transfer"], [], "UPI"),
+    (["hut"], [], "Hut Points"),
+    (["points"], [], "Hut Points"),
+]
+
+# Nilai valid kolom kategori, per header Excel dan nama kolom DeliveryData
+CATEGORY_DOMAINS = {
+    "Pizza Size": PIZZA_SIZES,
+    "Pizza Type": PIZZA_TYPES,
+    "Traffic Level": TRAFFIC_LEVELS,
+    "Payment Method": PAYMENT_METHODS,
+    "Payment Category": PAYMENT_CATEGORIES,
+    "Order Month": MONTHS,
+    "pizzaSize": PIZZA_SIZES,
+    "pizzaType": PIZZA_TYPES,
+    "trafficLevel": TRAFFIC_LEVELS,
+    "paymentMethod": PAYMENT_METHODS,
+    "paymentCategory": PAYMENT_CATEGORIES,
+    "orderMonth": MONTHS,
+}
+
+REQUIRED_HEADERS = [
+    "Order ID",
+    "Restaurant Name",
+    "Location",
+    "Order Time",
+    "Delivery Time",
+    "Delivery Duration (min)",
+    "Pizza Size",
+    "Pizza Type",
+    "Toppings Count",
+    "Distance (km)",
+    "Traffic Level",
+    "Payment Method",
+    "Is Peak Hour",
+    "Is Weekend",
+    "Order Month",
+    "Payment Category",
+]
+OPTIONAL_HEADERS = [
+    "Estimated Duration (min)",
+    "Delay (min)",
+    "Is Delayed",
+    "Pizza Complexity",
+    "Traffic Impact",
+    "Order Hour",
+]
+EXTRA_HEADERS = [
+    "Topping Density",
+    "Delivery Efficiency (min/km)",
+    "Restaurant Avg Time",
+]
+
+# Format teks tanggal yang dicoba berurutan (bulan/tanggal lebih dulu seperti JS)
+UPLOAD_DATETIME_FORMATS = [
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m-%d-%Y %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+]
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+
+def validate_headers(headers: List[str]) -> List[Dict[str, Any]]:
+    """Port validateExcelHeaders: kolom wajib dan opsional yang tidak ada"""
+    errors = []
+    missing = [h for h in REQUIRED_HEADERS if h not in headers]
+    if missing:
+        errors.append(
+            {
+                "row": 1,
+                "column": "Header",
+                "message": f"Missing required columns: {', '.join(missing)}",
+                "severity": "error",
+            }
+        )
+
+    missing_optional = [h for h in OPTIONAL_HEADERS if h not in headers]
+    if missing_optional and not missing:
+        errors.append(
+            {
+                "row": 1,
+                "column": "Header",
+                "message": "Optional columns not found (will use defaults): "
+                + ", ".join(missing_optional),
+                "severity": "warning",
+            }
+        )
+    return errors
+
+
+# ==================== PARSER KOLOM ====================
+def _js_string(raw: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """String(value) untuk nilai non-null: angka bulat tanpa akhiran ".0" """
+    if dtype.is_float():
+        return (
+            pl.when(raw == raw.floor())
+            .then(raw.cast(pl.Int64, strict=False).cast(pl.Utf8))
+            .otherwise(raw.cast(pl.Utf8))
+        )
+    return raw.cast(pl.Utf8)
+
+
+def _text(raw: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """String(value || '').trim()"""
+    return (
+        pl.when(_is_blank(raw, dtype))
+        .then(pl.lit(""))
+        .otherwise(_js_string(raw, dtype))
+        .str.strip_chars()
+    )
+
+
+def _is_blank(raw: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """
+    !value: null, string kosong, angka 0/NaN, atau false; string "0" tidak
+    dianggap kosong (truthy di JavaScript)
+    """
+    if dtype.is_float():
+        return raw.is_null() | (raw == 0) | raw.is_nan()
+    if dtype.is_numeric():
+        return raw.is_null() | (raw == 0)
+    if dtype == pl.Boolean:
+        return ~raw.fill_null(False)
+    if dtype == pl.Utf8:
+        return raw.is_null() | (raw == "")
+    return raw.is_null()
+
+
+def _number(raw: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """parseNumber: koma dan spasi dibuang, seluruh teks harus angka"""
+    if dtype.is_numeric():
+        return raw.cast(pl.Float64)
+    return (
+        raw.cast(pl.Utf8).str.replace_all(r"[,\s]", "").cast(pl.Float64, strict=False)
+    )
+
+
+def _float(raw: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """parseFloatValue: seperti parseFloat, prefix angka di awal teks dipakai"""
+    if dtype.is_numeric():
+        return raw.cast(pl.Float64)
+    return (
+        raw.cast(pl.Utf8)
+        .str.replace_all(r"[,\s]", "")
+        .str.extract(r"^([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)")
+        .cast(pl.Float64, strict=False)
+    )
+
+
+def _boolean(raw: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """
+    parseBoolean: boolean apa adanya, teks true/yes/1 -> True, selain itu
+    (termasuk angka 1) False
+    """
+    if dtype == pl.Boolean:
+        return raw.fill_null(False)
+    if dtype != pl.Utf8:
+        return pl.lit(False)
+    return raw.str.to_lowercase().is_in(["true", "yes", "1"]).fill_null(False)
+
+
+def _datetime(raw: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """parseDate: datetime, serial Excel (angka), atau teks dalam beberapa format"""
+    if dtype == pl.Datetime or dtype == pl.Date:
+        return raw.cast(pl.Datetime("us"))
+
+    serial = _number(raw, dtype) if dtype != pl.Null else pl.lit(None, pl.Float64)
+    from_serial = pl.lit(EXCEL_EPOCH) + pl.duration(
+        milliseconds=(serial * 86_400_000).round()
+    )
+    if dtype.is_numeric():
+        return from_serial.cast(pl.Datetime("us"))
+
+    text = raw.cast(pl.Utf8).str.strip_chars()
+    return pl.coalesce(
+        [text.str.to_datetime(fmt, strict=False) for fmt in UPLOAD_DATETIME_FORMATS]
+        + [from_serial.cast(pl.Datetime("us"))]
+    )
+
+
+def _alias(text: pl.Expr, aliases: Dict[str, str]) -> pl.Expr:
+    """Nilai baku dari alias huruf kecil; teks lain dibiarkan"""
+    return text.str.to_lowercase().replace_strict(aliases, default=text)
+
+
+def _keywords(
+    text: pl.Expr, keywords: List[Tuple[List[str], List[str], str]]
+) -> pl.Expr:
+    """Nilai baku dari kata kunci (contains semua / tidak contains); berurutan"""
+    lower = text.str.to_lowercase()
+    result = pl.when(pl.lit(False)).then(pl.lit(None, pl.Utf8))
+    for required, excluded, value in keywords:
+        condition = pl.lit(True)
+        for word in required:
+            condition = condition & lower.str.contains(word, literal=True)
+        for word in excluded:
+            condition = condition & ~lower.str.contains(word, literal=True)
+        result = result.when(condition).then(pl.lit(value))
+    return result.otherwise(text)
+
+
+# ==================== CLEANSING ====================
+def cleanse_delivery_upload(
+    df: pl.DataFrame,
+    restaurant_id: Optional[str] = None,
+    uploaded_by: Optional[str] = None,
+    unique_order_ids: bool = True,
+    now: Optional[datetime] = None,
+    derive_fields: bool = False,
+) -> Tuple[pl.DataFrame, pl.DataFrame, float]:
+    """
+    Validasi dan cleansing data upload delivery secara vektor (port cleanseData)
+    Args:
+        df: DataFrame dengan header Excel (misal "Order ID", "Distance (km)")
+        restaurant_id: ID restoran untuk semua baris
+        uploaded_by: ID/email pengunggah
+        unique_order_ids: Tambahkan akhiran _<timestamp>_<index> ke Order ID
+            seperti cleansing.ts
+        now: Waktu upload (default: sekarang)
+        derive_fields: Turunkan Delivery Duration, Order Month, dan Order Hour
+            dari Order/Delivery Time jika kosong atau tidak valid (bukan default)
+    Returns:
+        (data ber-kolom DeliveryData + qualityScore per baris, daftar error
+        {row, column, message, severity} urut per baris, rata-rata qualityScore)
+    """
+    now = now or datetime.now()
+    stamp = int(now.timestamp() * 1000)
+    headers = REQUIRED_HEADERS + OPTIONAL_HEADERS + EXTRA_HEADERS
+    schema = {h: df.schema[h] if h in df.columns else pl.Null for h in headers}
+    raw = df.select(
+        pl.col(h) if h in df.columns else pl.lit(None).alias(h) for h in headers
+    ).with_row_index("_index")
+    c = pl.col
+
+    # Nilai yang dinormalisasi; flag pelanggaran dihitung di pass yang sama
+    order_id = _text(c("Order ID"), schema["Order ID"]).str.to_uppercase()
+    order_time = _datetime(c("Order Time"), schema["Order Time"])
+    delivery_time = _datetime(c("Delivery Time"), schema["Delivery Time"])
+    duration = _number(c("Delivery Duration (min)"), schema["Delivery Duration (min)"])
+    month = _alias(_text(c("Order Month"), schema["Order Month"]), MONTH_ALIASES)
+    hour = _number(c("Order Hour"), schema["Order Hour"])
+    pizza_size = _alias(
+        _text(c("Pizza Size"), schema["Pizza Size"]), PIZZA_SIZE_ALIASES
+    )
+    pizza_type = _keywords(
+        _text(c("Pizza Type"), schema["Pizza Type"]), PIZZA_TYPE_KEYWORDS
+    )
+    toppings = _number(c("Toppings Count"), schema["Toppings Count"])
+    complexity = _number(c("Pizza Complexity"), schema["Pizza Complexity"])
+    distance = _float(c("Distance (km)"), schema["Distance (km)"])
+    traffic_level = _alias(
+        _text(c("Traffic Level"), schema["Traffic Level"]), TRAFFIC_LEVEL_ALIASES
+    )
+    traffic_impact = _number(c("Traffic Impact"), schema["Traffic Impact"])
+    payment_method = _keywords(
+        _text(c("Payment Method"), schema["Payment Method"]), PAYMENT_METHOD_KEYWORDS
+    )
+    payment_category = _alias(
+        _text(c("Payment Category"), schema["Payment Category"]),
+        PAYMENT_CATEGORY_ALIASES,
+    )
+    estimated = _float(
+        c("Estimated Duration (min)"), schema["Estimated Duration (min)"]
+    )
+    delay = _float(c("Delay (min)"), schema["Delay (min)"])
+
+    parsed = raw.with_columns(
+        order_id.alias("orderId"),
+        order_time.alias("_orderTime"),
+        delivery_time.alias("_deliveryTime"),
+        duration.alias("_deliveryDuration"),
+        month.alias("orderMonth"),
+        hour.alias("_orderHour"),
+        pizza_size.alias("pizzaSize"),
+        pizza_type.alias("_pizzaType"),
+        toppings.alias("_toppingsCount"),
+        complexity.alias("_pizzaComplexity"),
+        distance.alias("_distanceKm"),
+        traffic_level.alias("trafficLevel"),
+        traffic_impact.alias("_trafficImpact"),
+        payment_method.alias("paymentMethod"),
+        payment_category.alias("paymentCategory"),
+        estimated.alias("_estimatedDuration"),
+        delay.alias("_delayMin"),
+    )
+
+    if derive_fields:
+        derived_duration = (
+            (c("_deliveryTime") - c("_orderTime")).dt.total_seconds() / 60
+        ).round()
+        parsed = parsed.with_columns(
+            pl.when(c("_deliveryDuration").is_null() | (c("_deliveryDuration") <= 0))
+            .then(derived_duration)
+            .otherwise(c("_deliveryDuration"))
+            .alias("_deliveryDuration"),
+            pl.when(~c("orderMonth").is_in(MONTHS) & c("_orderTime").is_not_null())
+            .then(c("_orderTime").dt.strftime("%B"))
+            .otherwise(c("orderMonth"))
+            .alias("orderMonth"),
+            pl.when(c("_orderHour").is_null() | ~c("_orderHour").is_between(0, 23))
+            .then(c("_orderTime").dt.hour().cast(pl.Float64))
+            .otherwise(c("_orderHour"))
+            .alias("_orderHour"),
+        )
+
+    order_time_value = c("_orderTime").fill_null(pl.lit(now))
+    # (kolom, pelanggaran, pesan, severity, penalti skor)
+    rules = [
+        (
+            "Order ID",
+            _is_blank(c("Order ID"), schema["Order ID"]),
+            "Order ID diperlukan, menggunakan default",
+            "warning",
+            10,
+        ),
+        (
+            "Order ID",
+            ~_is_blank(c("Order ID"), schema["Order ID"])
+            & ~c("orderId").str.contains(r"^ORD\d+$"),
+            "Format Order ID tidak standar",
+            "warning",
+            5,
+        ),
+        (
+            "Restaurant Name",
+            _is_blank(c("Restaurant Name"), schema["Restaurant Name"]),
+            "Nama restoran tidak tersedia",
+            "warning",
+            5,
+        ),
+        (
+            "Location",
+            _is_blank(c("Location"), schema["Location"]),
+            "Lokasi diperlukan",
+            "warning",
+            5,
+        ),
+        (
+            "Order Time",
+            c("_orderTime").is_null(),
+            "Format Order Time tidak valid, menggunakan waktu sekarang",
+            "warning",
+            5,
+        ),
+        (
+            "Delivery Time",
+            c("_deliveryTime").is_null(),
+            "Format Delivery Time tidak valid, menggunakan estimasi",
+            "warning",
+            5,
+        ),
+        (
+            "Delivery Time",
+            c("_deliveryTime") < order_time_value,
+            "Delivery Time lebih kecil dari Order Time, diperbaiki",
+            "warning",
+            5,
+        ),
+        (
+            "Delivery Duration",
+            c("_deliveryDuration").is_null() | (c("_deliveryDuration") <= 0),
+            "Delivery Duration harus lebih dari 0",
+            "error",
+            10,
+        ),
+        (
+            "Order Month",
+            ~c("orderMonth").is_in(MONTHS),
+            f"Order Month harus salah satu dari: {', '.join(MONTHS)}",
+            "warning",
+            5,
+        ),
+        (
+            "Order Hour",
+            c("_orderHour").is_null() | ~c("_orderHour").is_between(0, 23),
+            "Order Hour harus antara 0-23",
+            "warning",
+            3,
+        ),
+        (
+            "Pizza Size",
+            ~c("pizzaSize").is_in(PIZZA_SIZES),
+            f"Pizza Size harus salah satu dari: {', '.join(PIZZA_SIZES)}",
+            "warning",
+            5,
+        ),
+        (
+            "Toppings Count",
+            c("_toppingsCount").is_null() | (c("_toppingsCount") < 0),
+            "Toppings Count harus >= 0",
+            "warning",
+            3,
+        ),
+        (
+            "Pizza Complexity",
+            c("_pizzaComplexity").is_null() | (c("_pizzaComplexity") < 0),
+            "Pizza Complexity harus >= 0",
+            "warning",
+            3,
+        ),
+        (
+            "Distance",
+            c("_distanceKm").is_null() | (c("_distanceKm") <= 0),
+            "Distance tidak valid, menggunakan default 5 km",
+            "warning",
+            5,
+        ),
+        (
+            "Traffic Level",
+            ~c("trafficLevel").is_in(TRAFFIC_LEVELS),
+            f"Traffic Level harus salah satu dari: {', '.join(TRAFFIC_LEVELS)}",
+            "warning",
+            3,
+        ),
+        (
+            "Traffic Impact",
+            c("_trafficImpact").is_null() | ~c("_trafficImpact").is_between(1, 3),
+            "Traffic Impact harus antara 1-3",
+            "warning",
+            2,
+        ),
+        (
+            "Payment Method",
+            ~c("paymentMethod").is_in(PAYMENT_METHODS),
+            pl.format(
+                'Payment Method "{}" tidak dikenali. Harus salah satu dari: '
+                + ", ".join(PAYMENT_METHODS),
+                c("Payment Method").cast(pl.Utf8).fill_null("undefined"),
+            ),
+            "warning",
+            3,
+        ),
+        (
+            "Payment Category",
+            ~c("paymentCategory").is_in(PAYMENT_CATEGORIES),
+            f"Payment Category harus salah satu dari: {', '.join(PAYMENT_CATEGORIES)}",
+            "warning",
+            3,
+        ),
+        (
+            "Estimated Duration",
+            c("_estimatedDuration").is_null() | (c("_estimatedDuration") <= 0),
+            "Estimated Duration harus > 0",
+            "warning",
+            3,
+        ),
+        (
+            "Delay",
+            c("_delayMin").is_null() | (c("_delayMin") < 0),
+            "Delay harus >= 0",
+            "warning",
+            2,
+        ),
+    ]
+
+    # Flag setiap aturan dihitung sekali; skor = 100 - total penalti
+    parsed = parsed.with_columns(
+        flag.fill_null(False).alias(f"_rule_{i}")
+        for i, (_, flag, _, _, _) in enumerate(rules)
+    )
+    penalty = pl.sum_horizontal(
+        [
+            c(f"_rule_{i}").cast(pl.Int32) * points
+            for i, (*_, points) in enumerate(rules)
+        ]
+    )
+
+    # Error hanya dibentuk untuk baris yang melanggar, urut per baris lalu aturan
+    errors = (
+        pl.concat(
+            [
+                parsed.lazy()
+                .filter(c(f"_rule_{i}"))
+                .select(
+                    (c("_index") + 2).cast(pl.Int64).alias("row"),
+                    pl.lit(i).alias("_rule"),
+                    pl.lit(column).alias("column"),
+                    (message if isinstance(message, pl.Expr) else pl.lit(message))
+                    .cast(pl.Utf8)
+                    .alias("message"),
+                    pl.lit(severity).alias("severity"),
+                )
+                for i, (column, _, message, severity, _) in enumerate(rules)
+            ]
+        )
+        .sort(["row", "_rule"])
+        .drop("_rule")
+        .collect()
+    )
+
+    order_ids = (
+        pl.when(_is_blank(c("Order ID"), schema["Order ID"]))
+        .then(pl.format("ORD{}{}", pl.lit(stamp), c("_index")))
+        .otherwise(
+            pl.format("{}_{}_{}", c("orderId"), pl.lit(stamp), c("_index"))
+            if unique_order_ids
+            else c("orderId")
+        )
+    )
+    estimated_delivery = order_time_value + pl.duration(minutes=30)
+
+    data = parsed.select(
+        order_ids.alias("orderId"),
+        pl.lit(restaurant_id, pl.Utf8).alias("restaurantId"),
+        pl.when(_is_blank(c("Restaurant Name"), schema["Restaurant Name"]))
+        .then(pl.lit("Unknown"))
+        .otherwise(_js_string(c("Restaurant Name"), schema["Restaurant Name"]))
+        .alias("restaurantName"),
+        _text(c("Location"), schema["Location"]).alias("location"),
+        order_time_value.alias("orderTime"),
+        pl.when(c("_deliveryTime").is_null() | (c("_deliveryTime") < order_time_value))
+        .then(estimated_delivery)
+        .otherwise(c("_deliveryTime"))
+        .alias("deliveryTime"),
+        c("_deliveryDuration").fill_null(0).alias("deliveryDuration"),
+        pl.when(c("orderMonth") == "")
+        .then(pl.lit("Unknown"))
+        .otherwise(c("orderMonth"))
+        .alias("orderMonth"),
+        c("_orderHour").fill_null(0).alias("orderHour"),
+        pl.when(c("pizzaSize") == "")
+        .then(pl.lit("Unknown"))
+        .otherwise(c("pizzaSize"))
+        .alias("pizzaSize"),
+        pl.when(c("_pizzaType").is_in(PIZZA_TYPES))
+        .then(c("_pizzaType"))
+        .otherwise(pl.lit("Unknown"))
+        .alias("pizzaType"),
+        c("_toppingsCount").fill_null(0).alias("toppingsCount"),
+        c("_pizzaComplexity").fill_null(0).alias("pizzaComplexity"),
+        _float(c("Topping Density"), schema["Topping Density"]).alias("toppingDensity"),
+        pl.when(c("_distanceKm").is_null() | (c("_distanceKm") <= 0))
+        .then(pl.lit(5.0))
+        .otherwise(c("_distanceKm"))
+        .alias("distanceKm"),
+        pl.when(c("trafficLevel") == "")
+        .then(pl.lit("Unknown"))
+        .otherwise(c("trafficLevel"))
+        .alias("trafficLevel"),
+        c("_trafficImpact").fill_null(1).alias("trafficImpact"),
+        _boolean(c("Is Peak Hour"), schema["Is Peak Hour"]).alias("isPeakHour"),
+        _boolean(c("Is Weekend"), schema["Is Weekend"]).alias("isWeekend"),
+        pl.when(c("paymentMethod") == "")
+        .then(pl.lit("Unknown"))
+        .otherwise(c("paymentMethod"))
+        .alias("paymentMethod"),
+        pl.when(c("paymentCategory") == "")
+        .then(pl.lit("Unknown"))
+        .otherwise(c("paymentCategory"))
+        .alias("paymentCategory"),
+        c("_estimatedDuration").fill_null(0).alias("estimatedDuration"),
+        _float(
+            c("Delivery Efficiency (min/km)"), schema["Delivery Efficiency (min/km)"]
+        ).alias("deliveryEfficiency"),
+        c("_delayMin").fill_null(0).alias("delayMin"),
+        _boolean(c("Is Delayed"), schema["Is Delayed"]).alias("isDelayed"),
+        _float(c("Restaurant Avg Time"), schema["Restaurant Avg Time"]).alias(
+            "restaurantAvgTime"
+        ),
+        pl.lit(uploaded_by, pl.Utf8).alias("uploadedBy"),
+        pl.lit(now).alias("uploadedAt"),
+        (100 - penalty).clip(lower_bound=0).cast(pl.Float64).alias("qualityScore"),
+    )
+
+    quality_score = data["qualityScore"].mean() if len(data) else 0.0
+    return data, errors, quality_score
@@ -0,0 +1 @@
+# Benchmark scripts untuk PolarsDataProcessor
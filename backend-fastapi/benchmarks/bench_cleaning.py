@@ -0,0 +1,90 @@
+"""
+Benchmark clean_data (cleaning plan satu lazy query) pada sheet lebar
+
+Jalankan dari folder backend-fastapi:
+    python -m benchmarks.bench_cleaning [n_rows] [n_string_cols] [n_numeric_cols]
+"""
+import sys
+import time
+
+import numpy as np
+import polars as pl
+
+from app.services.polars_service import PolarsDataProcessor
+
+
+def make_sheet(
+    n_rows: int, n_string_cols: int, n_numeric_cols: int, seed: int = 3
+) -> pl.DataFrame:
+    """Sheet lebar dengan spasi berlebih, null, duplikat, dan kolom tanggal teks"""
+    rng = np.random.default_rng(seed)
+    words = pl.Series([f"  value {i}  " for i in range(1000)])
+    columns = {}
+    for i in range(n_string_cols):
+        columns[f"text_{i}"] = words.gather(rng.integers(0, 1000, n_rows))
+    for i in range(n_numeric_cols):
+        values = rng.normal(100, 20, n_rows)
+        values[rng.random(n_rows) < 0.05] = np.nan
+        columns[f"num_{i}"] = pl.Series(values).fill_nan(None)
+    days = rng.integers(0, 365, n_rows)
+    columns["order_date"] = pl.Series(
+        np.datetime64("2024-01-01") + days.astype("timedelta64[D]")
+    ).dt.strftime("%Y-%m-%d")
+    df = pl.DataFrame(columns)
+    return pl.concat([df, df.head(n_rows // 100)])
+
+
+def legacy_clean(df: pl.DataFrame, fill_null_strategy, date_columns) -> pl.DataFrame:
+    """Implementasi lama (with_columns per kolom, try/except per tanggal)"""
+    result = df.clone()
+    result = result.unique()
+    for col in [c for c in result.columns if result[c].dtype == pl.Utf8]:
+        result = result.with_columns(pl.col(col).str.strip_chars())
+    for col, strategy in fill_null_strategy.items():
+        if strategy == "mean":
+            result = result.with_columns(pl.col(col).fill_null(pl.col(col).mean()))
+    for col in date_columns:
+        try:
+            result = result.with_columns(
+                pl.col(col).str.to_datetime("%Y-%m-%d %H:%M:%S")
+            )
+        except Exception:
+            try:
+                result = result.with_columns(pl.col(col).str.to_date())
+            except Exception:
+                pass
+    return result
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_string_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    n_numeric_cols = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    df = make_sheet(n_rows, n_string_cols, n_numeric_cols)
+    print(f"{len(df):,} rows x {df.width} columns")
+
+    fill = {col: "mean" for col in df.columns if col.startswith("num_")}
+    kwargs = dict(
+        drop_nulls=False,
+        fill_null_strategy=fill,
+        date_columns=["order_date"],
+    )
+    cleaned, t_plan = timed(PolarsDataProcessor.clean_data, df, **kwargs)
+    legacy, t_old = timed(legacy_clean, df, fill, ["order_date"])
+    explain, t_explain = timed(
+        PolarsDataProcessor.explain_cleaning_plan,
+        df,
+        PolarsDataProcessor.build_cleaning_plan(**kwargs),
+    )
+
+    print(f"cleaning plan     : {t_plan:8.3f} s  ({t_old / t_plan:.1f}x)")
+    print(f"legacy per-column : {t_old:8.3f} s")
+    print(f"dry-run / explain : {t_explain:8.3f} s")
+    print("stages:", [stage["stage"] for stage in explain["stages"]])
+    print("rows  :", len(cleaned), len(legacy))
@@ -0,0 +1,81 @@
+"""
+Benchmark recommend_frequently_bought_together pada 1 juta order
+
+Jalankan dari folder backend-fastapi:
+    python -m benchmarks.bench_cooccurrence [n_orders]
+"""
+import sys
+import time
+from collections import defaultdict
+from itertools import combinations
+
+import numpy as np
+import polars as pl
+
+from app.services.polars_service import PolarsDataProcessor
+
+
+def make_orders(n_orders: int, n_items: int = 40, seed: int = 42) -> pl.DataFrame:
+    """Basket 1-4 item dengan popularitas item mengikuti distribusi Zipf"""
+    rng = np.random.default_rng(seed)
+    basket_sizes = rng.integers(1, 5, size=n_orders)
+    order_ids = np.repeat(np.arange(n_orders), basket_sizes)
+    weights = 1 / np.arange(1, n_items + 1)
+    items = rng.choice(n_items, size=len(order_ids), p=weights / weights.sum())
+    return pl.DataFrame(
+        {
+            "order_id": order_ids,
+            "item": pl.Series([f"Pizza {i:02d}" for i in items]),
+        }
+    )
+
+
+def legacy_pair_counts(df: pl.DataFrame, n: int):
+    """Implementasi lama (itertools.combinations + defaultdict) sebagai pembanding"""
+    orders = df.group_by("order_id").agg(pl.col("item").alias("items"))
+    pair_counts = defaultdict(int)
+    for order in orders.iter_rows():
+        for pair in combinations(sorted(set(order[1])), 2):
+            pair_counts[pair] += 1
+    sorted_pairs = sorted(pair_counts.items(), key=lambda x: x[1], reverse=True)
+    return [
+        {"item1": pair[0], "item2": pair[1], "count": count}
+        for pair, count in sorted_pairs[:n]
+    ]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = make_orders(n_orders)
+    print(f"{n_orders:,} orders, {len(df):,} order lines")
+
+    columnar, t_new = timed(
+        PolarsDataProcessor.recommend_frequently_bought_together,
+        df,
+        order_id_column="order_id",
+        item_column="item",
+        n=10,
+    )
+    join, t_join = timed(
+        PolarsDataProcessor.recommend_frequently_bought_together,
+        df,
+        order_id_column="order_id",
+        item_column="item",
+        n=10,
+        max_dense_items=0,
+    )
+    legacy, t_old = timed(legacy_pair_counts, df, 10)
+
+    print(f"order x item matmul: {t_new:8.3f} s  ({t_old / t_new:.1f}x)")
+    print(f"polars self-join   : {t_join:8.3f} s  ({t_old / t_join:.1f}x)")
+    print(f"legacy combinations: {t_old:8.3f} s")
+    assert columnar == join
+    assert [r["count"] for r in columnar] == [r["count"] for r in legacy]
+    for row in columnar[:5]:
+        print(row)
@@ -0,0 +1,92 @@
+"""
+Benchmark memori beberapa worker yang memakai dataset upload yang sama
+
+Setiap worker (proses spawn, seperti worker uvicorn) memuat file yang sama:
+- parse : PolarsDataProcessor.read_upload_file (salinan penuh per worker)
+- shared: dataset_cache.load_upload (parsing sekali, worker lain memetakan
+          file Arrow IPC yang sama)
+Memori privat diukur dari RssAnon, memori bersama dari RssFile + RssShmem.
+Jalankan dari folder backend-fastapi:
+    python -m benchmarks.bench_dataset_cache [n_rows] [n_workers]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DEBUG", "false")
+_cache_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+os.environ.setdefault("DATASET_CACHE_DIR", _cache_dir.name)
+
+from benchmarks.datagen import make_workbook, to_bytes  # noqa: E402
+
+
+def _rss_mb() -> dict:
+    with open("/proc/self/status") as f:
+        fields = dict(line.split(":", 1) for line in f)
+    return {
+        key: int(fields[key].split()[0]) / 1024
+        for key in ("RssAnon", "RssFile", "RssShmem")
+    }
+
+
+def worker(mode: str, contents: bytes, barrier, results) -> None:
+    from app.services.dataset_cache import load_upload
+    from app.services.polars_service import PolarsDataProcessor
+
+    before = _rss_mb()
+    start = time.perf_counter()
+    if mode == "shared":
+        df = load_upload(contents, "upload.parquet")
+    else:
+        df = PolarsDataProcessor.read_upload_file(contents, "upload.parquet")
+    # Sentuh semua kolom agar halaman memory-map benar-benar dimuat
+    df.hash_rows().sum()
+    elapsed = time.perf_counter() - start
+    after = _rss_mb()
+    results.put(
+        (
+            elapsed,
+            after["RssAnon"] - before["RssAnon"],
+            after["RssFile"]
+            + after["RssShmem"]
+            - before["RssFile"]
+            - before["RssShmem"],
+        )
+    )
+    # Tahan frame sampai semua worker selesai mengukur
+    barrier.wait()
+
+
+def run(mode: str, contents: bytes, n_workers: int) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(n_workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker, args=(mode, contents, barrier, results))
+        for _ in range(n_workers)
+    ]
+    for process in processes:
+        process.start()
+    rows = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    load_times = [row[0] for row in rows]
+    private = sum(row[1] for row in rows)
+    shared = max(row[2] for row in rows)
+    print(
+        f"{mode:6s}: load max {max(load_times):6.2f} s  "
+        f"privat total {private:8.1f} MB  bersama {shared:8.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    contents = to_bytes(make_workbook(n_rows), "parquet")
+    print(f"{n_rows:,} rows, {n_workers} worker, parquet {len(contents) / 1e6:.1f} MB")
+    run("parse", contents, n_workers)
+    run("shared", contents, n_workers)
@@ -0,0 +1,108 @@
+"""
+Load test latensi endpoint ringan (/health) saat endpoint berat berjalan
+
+App dijalankan in-process lewat httpx.ASGITransport pada satu event loop,
+sama seperti satu worker uvicorn: jika route async menjalankan Polars
+langsung di event loop, semua request lain (termasuk /health) ikut menunggu.
+Jalankan dari folder backend-fastapi:
+    python -m benchmarks.bench_offload [n_rows] [heavy_concurrency] [duration_s]
+"""
+
+import asyncio
+import sys
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.datagen import make_workbook, to_bytes
+from app.main import app
+
+HEAVY_REQUESTS = [
+    (
+        "/api/v1/export-clean/remove-duplicates",
+        {
+            "mode": "near",
+            "subset": "Location,Pizza Type,Pizza Size",
+            "time_column": "Order Time",
+        },
+    ),
+    ("/api/v1/export-clean/outliers", {"method": "mad", "mode": "flag"}),
+    ("/api/v1/export-clean/parse-dates", {}),
+]
+
+
+def summarize(latencies) -> str:
+    values = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return (
+        f"n={len(values):5d}  p50={p50:8.1f} ms  p95={p95:8.1f} ms  "
+        f"p99={p99:8.1f} ms  max={values.max():8.1f} ms"
+    )
+
+
+async def probe_light(client, stop: asyncio.Event, latencies, interval=0.01):
+    """
+    Request /health terjadwal setiap interval sampai stop di-set
+    Latensi diukur dari waktu jadwal (bukan waktu kirim) agar periode event
+    loop terblokir ikut terhitung (menghindari coordinated omission).
+    """
+    scheduled = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        response = await client.get("/health")
+        response.raise_for_status()
+        finished = time.perf_counter()
+        latencies.append(finished - scheduled)
+        scheduled = max(scheduled + interval, finished)
+
+
+async def run_heavy(client, contents: bytes, stop: asyncio.Event, worker: int, log):
+    """Mengulang request berat (bergiliran) sampai stop di-set"""
+    i = worker
+    while not stop.is_set():
+        path, params = HEAVY_REQUESTS[i % len(HEAVY_REQUESTS)]
+        start = time.perf_counter()
+        response = await client.post(
+            path, params=params, files={"file": ("upload.parquet", contents)}
+        )
+        response.raise_for_status()
+        log.append(time.perf_counter() - start)
+        i += 1
+
+
+async def main(n_rows: int, heavy_concurrency: int, duration: float):
+    contents = to_bytes(make_workbook(n_rows), "parquet")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        stop = asyncio.Event()
+        idle = []
+        probe = asyncio.create_task(probe_light(client, stop, idle))
+        await asyncio.sleep(min(duration, 3))
+        stop.set()
+        await probe
+
+        stop = asyncio.Event()
+        loaded, heavy = [], []
+        tasks = [
+            asyncio.create_task(run_heavy(client, contents, stop, i, heavy))
+            for i in range(heavy_concurrency)
+        ]
+        probe = asyncio.create_task(probe_light(client, stop, loaded))
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(probe, *tasks)
+
+    print(f"{n_rows:,} rows, {heavy_concurrency} request berat bersamaan")
+    print(f"/health idle  : {summarize(idle)}")
+    print(f"/health beban : {summarize(loaded)}")
+    print(f"request berat : {summarize(heavy)}")
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    heavy_concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 20.0
+    asyncio.run(main(n_rows, heavy_concurrency, duration))
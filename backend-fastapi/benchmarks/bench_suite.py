@@ -0,0 +1,737 @@
+"""
+Benchmark suite: semua method publik PolarsDataProcessor, reader/exporter,
+dan endpoint utama lewat ASGI test client, di atas data sintetis
+benchmarks.datagen (10k/100k/1m/10m baris)
+
+Hasil disimpan sebagai JSON (default benchmarks/results/<waktu>.json) agar
+run bisa dibandingkan; case yang median-nya melambat melewati --threshold
+(dan lebih dari --min-delta-ms) ditandai REGRESI dan exit code menjadi 1;
+case yang error (misal dependency hilang) juga dihitung gagal.
+Database SQLite, artifact, dan cache dataset memakai folder sementara; cache
+dataset dimatikan agar setiap repeat mengukur parsing, bukan memory-map.
+Jalankan dari folder backend-fastapi:
+    python -m benchmarks.bench_suite [--sizes 10k,100k] [--groups methods,io,api]
+        [--filter REGEX] [--repeat 3] [--baseline lama.json] [--output baru.json]
+    python -m benchmarks.bench_suite --compare lama.json baru.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import cached_property, partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Database, artifact, dan file sementara; dihapus saat proses selesai
+_workdir_handle = tempfile.TemporaryDirectory(
+    prefix="pizza-bench-", ignore_cleanup_errors=True
+)
+_workdir = _workdir_handle.name
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_workdir, 'bench.db')}")
+os.environ.setdefault("ARTIFACT_DIR", os.path.join(_workdir, "artifacts"))
+os.environ.setdefault("DATASET_CACHE_ENABLED", "false")
+os.environ.setdefault("DEBUG", "false")
+
+import polars as pl  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services.polars_service import PolarsDataProcessor  # noqa: E402
+from app.services.upload_validation import CATEGORY_DOMAINS  # noqa: E402
+from benchmarks.datagen import (  # noqa: E402
+    make_analysis_frame,
+    make_order_lines,
+    make_text_dates,
+    make_workbook,
+    parse_size,
+    to_bytes,
+)
+
+P = PolarsDataProcessor
+GROUPS = ("methods", "io", "api")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+CLEAN_KWARGS = dict(
+    drop_nulls=False,
+    fill_null_strategy={"Delivery Duration (min)": "mean"},
+    date_columns=["Order Time", "Delivery Time"],
+)
+ORDER_LINES = ("Order ID", "Pizza Type")
+
+
+class Fixtures:
+    """Dataset satu ukuran; setiap bentuk dibuat sekali saat pertama dipakai"""
+
+    def __init__(self, n_rows: int, seed: int = 11):
+        self.n_rows = n_rows
+        self.seed = seed
+        self.tmpdir = tempfile.mkdtemp(dir=_workdir)
+        self._files: Dict[str, bytes] = {}
+
+    @cached_property
+    def workbook(self) -> pl.DataFrame:
+        return make_workbook(self.n_rows, self.seed)
+
+    @cached_property
+    def analysis(self) -> pl.DataFrame:
+        return make_analysis_frame(self.n_rows, self.seed)
+
+    @cached_property
+    def text_dates(self) -> pl.DataFrame:
+        return make_text_dates(self.n_rows, self.seed)
+
+    @cached_property
+    def lines(self) -> pl.DataFrame:
+        return make_order_lines(self.n_rows)
+
+    @cached_property
+    def series(self) -> pl.DataFrame:
+        """Deret harian (date, value) dari workbook"""
+        return P.prepare_time_series(
+            self.workbook, "Order Time", "Distance (km)", interval="1d"
+        ).rename({"Order Time": "date", "Distance (km)": "value"})
+
+    @cached_property
+    def cleaning_plan(self) -> List[Dict[str, Any]]:
+        return P.build_cleaning_plan(**CLEAN_KWARGS)
+
+    def file(self, fmt: str, frame: str = "workbook") -> bytes:
+        """Isi file upload dari salah satu dataset (di-cache per format)"""
+        key = f"{frame}.{fmt}"
+        if key not in self._files:
+            self._files[key] = to_bytes(getattr(self, frame), fmt)
+        return self._files[key]
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmpdir, name)
+
+
+# (nama, batas baris atau None, factory(fixtures) -> callable tanpa argumen)
+Case = Tuple[str, Optional[int], Callable[[Fixtures], Callable[[], Any]]]
+
+# Excel (tulis/baca) dan to_dicts/JSON sangat lambat di ukuran besar
+EXCEL_MAX_ROWS = 100_000
+DICT_MAX_ROWS = 1_000_000
+
+
+def _method(
+    name: str, frame: Optional[str], *args, max_rows: Optional[int] = None, **kwargs
+) -> Case:
+    """Case PolarsDataProcessor.<name>(fixtures.<frame>, *args, **kwargs)"""
+
+    def factory(fx: Fixtures) -> Callable[[], Any]:
+        leading = (getattr(fx, frame),) if frame else ()
+        return partial(getattr(P, name), *leading, *args, **kwargs)
+
+    return name, max_rows, factory
+
+
+def _custom(name: str, factory: Callable[[Fixtures], Callable[[], Any]]) -> Case:
+    """Case untuk method yang mengembalikan Expr/LazyFrame (dievaluasi penuh)"""
+    return name, None, factory
+
+
+DATES = CLEAN_KWARGS["date_columns"]
+SEGMENT = ["Location", "Pizza Type", "Pizza Size"]
+
+METHOD_CASES: List[Case] = [
+    _method("normalize_delivery_columns", "workbook"),
+    _method("clean_delivery_data", "analysis"),
+    _method("clean_data", "text_dates", **CLEAN_KWARGS),
+    _method("build_cleaning_plan", None, **CLEAN_KWARGS),
+    _custom(
+        "compile_cleaning_plan",
+        lambda fx: lambda: P.compile_cleaning_plan(
+            fx.text_dates.lazy(), fx.cleaning_plan
+        )[0].collect(),
+    ),
+    _custom(
+        "resolve_date_formats",
+        lambda fx: partial(P.resolve_date_formats, fx.text_dates, fx.cleaning_plan),
+    ),
+    _custom(
+        "apply_cleaning_plan",
+        lambda fx: partial(P.apply_cleaning_plan, fx.text_dates, fx.cleaning_plan),
+    ),
+    _custom(
+        "explain_cleaning_plan",
+        lambda fx: partial(P.explain_cleaning_plan, fx.text_dates, fx.cleaning_plan),
+    ),
+    _custom(
+        "date_parse_expr",
+        lambda fx: lambda: fx.text_dates.select(
+            P.date_parse_expr(pl.col("Order Time"))
+        ),
+    ),
+    _custom(
+        "detect_date_formats",
+        lambda fx: partial(P.detect_date_formats, fx.text_dates["Order Time"]),
+    ),
+    _method("parse_dates", "text_dates", columns=DATES),
+    _method("remove_duplicates", "workbook", subset=["Order ID"]),
+    _method(
+        "find_near_duplicates", "workbook", subset=SEGMENT, time_column="Order Time"
+    ),
+    _method("fill_missing_values", "workbook", "Delivery Duration (min)", "mean"),
+    _method("handle_outliers", "workbook", "Distance (km)", "iqr"),
+    _method("handle_outliers_multi", "workbook", method="mad"),
+    _method("profile_dataframe", "workbook", valid_values=CATEGORY_DOMAINS),
+    _method("get_sales_summary", "analysis"),
+    _method("get_delivery_performance", "analysis"),
+    _method("get_orders_by_hour", "analysis"),
+    _method("get_orders_by_month", "analysis"),
+    _method("get_traffic_analysis", "analysis"),
+    _method("get_pizza_analysis", "analysis"),
+    _method("get_payment_analysis", "analysis"),
+    _method(
+        "prepare_time_series", "workbook", "Order Time", "Distance (km)", interval="1d"
+    ),
+    _method("forecast_exponential_smoothing", "series", "date", "value"),
+    _method("forecast_moving_average", "series", "date", "value"),
+    _method("forecast_linear_trend", "series", "date", "value"),
+    _custom(
+        "compute_prediction_intervals",
+        lambda fx: partial(
+            P.compute_prediction_intervals,
+            [float(fx.series["value"].mean())] * 7,
+            (fx.series["value"] - fx.series["value"].mean()).to_list(),
+            [0.8, 0.95],
+            seed=0,
+        ),
+    ),
+    _method("backtest_forecasts", "series", "date", "value"),
+    _method("recommend_popular_items", "workbook", "Pizza Type"),
+    _method("recommend_by_category", "workbook", "Location", "Pizza Type"),
+    _custom(
+        "hour_band",
+        lambda fx: lambda: fx.analysis.select(P.hour_band(pl.col("order_hour"))),
+    ),
+    _method(
+        "recommend_by_segment",
+        "analysis",
+        ["location"],
+        "pizza_type",
+        hour_column="order_hour",
+    ),
+    _custom(
+        "encode_items",
+        lambda fx: lambda: fx.lines.select(P.encode_items(fx.lines, "Pizza Type")[1]),
+    ),
+    _method("item_cooccurrence_matrix", "lines", *ORDER_LINES),
+    _method("recommend_frequently_bought_together", "lines", *ORDER_LINES),
+    _method("recommend_similar_items", "lines", *ORDER_LINES),
+    _method("transaction_bitmaps", "lines", *ORDER_LINES),
+    _method("mine_frequent_itemsets", "lines", *ORDER_LINES),
+    _method("recommend_association_rules", "lines", *ORDER_LINES, min_confidence=0.3),
+    _custom(
+        "trend_scores",
+        lambda fx: lambda: P.trend_scores(
+            fx.lines.lazy()
+            .group_by(["Pizza Type", "Order Date"])
+            .agg(pl.len().alias("count")),
+            "Pizza Type",
+            "Order Date",
+        ).collect(),
+    ),
+    _method("recommend_trending_items", "lines", "Order Date", "Pizza Type"),
+]
+
+IO_CASES: List[Case] = [
+    _custom("read_csv_file", lambda fx: partial(P.read_csv_file, fx.file("csv"))),
+    _custom(
+        "read_parquet_file", lambda fx: partial(P.read_parquet_file, fx.file("parquet"))
+    ),
+    _custom("read_json_file", lambda fx: partial(P.read_json_file, fx.file("json"))),
+    (
+        "read_excel_file",
+        EXCEL_MAX_ROWS,
+        lambda fx: partial(P.read_excel_file, fx.file("xlsx")),
+    ),
+    _custom(
+        "read_upload_file",
+        lambda fx: partial(P.read_upload_file, fx.file("parquet"), "upload.parquet"),
+    ),
+    _method("export_to_csv", "workbook"),
+    _method("export_to_json", "workbook", max_rows=DICT_MAX_ROWS),
+    _method("export_to_ndjson", "workbook", max_rows=DICT_MAX_ROWS),
+    _method("export_to_parquet", "workbook"),
+    _method("export_to_ipc", "workbook"),
+    _method("export_to_excel", "workbook", max_rows=EXCEL_MAX_ROWS),
+    _method("export_to_dict", "workbook", max_rows=DICT_MAX_ROWS),
+    _custom(
+        "export_to_csv_file",
+        lambda fx: partial(P.export_to_csv_file, fx.workbook, fx.path("out.csv")),
+    ),
+    (
+        "export_to_json_file",
+        DICT_MAX_ROWS,
+        lambda fx: partial(P.export_to_json_file, fx.workbook, fx.path("out.json")),
+    ),
+    _custom(
+        "export_to_parquet_file",
+        lambda fx: partial(
+            P.export_to_parquet_file, fx.workbook, fx.path("out.parquet")
+        ),
+    ),
+    (
+        "export_to_excel_file",
+        EXCEL_MAX_ROWS,
+        lambda fx: partial(P.export_to_excel_file, fx.workbook, fx.path("out.xlsx")),
+    ),
+]
+
+
+def _request(
+    client: TestClient,
+    method: str,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    upload: Optional[Tuple[str, bytes]] = None,
+) -> Callable[[], Any]:
+    """Callable satu request; status selain 200 dianggap gagal"""
+
+    def call():
+        files = {"file": upload} if upload else None
+        response = client.request(method, path, params=params, files=files)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+        return response
+
+    return call
+
+
+def api_cases(client: TestClient) -> List[Case]:
+    """Endpoint utama; ingest dijalankan pertama agar endpoint DB berisi data"""
+    E = "/api/v1/export-clean"
+    lines_params = {
+        "item_column": "Pizza Type",
+        "order_id_column": "Order ID",
+        "category_column": "Location",
+        "date_column": "Order Date",
+    }
+    series_params = {"date_column": "date", "value_column": "value"}
+
+    def upload(fx: Fixtures, fmt: str = "parquet", frame: str = "workbook"):
+        return (f"upload.{fmt}", fx.file(fmt, frame))
+
+    return [
+        (
+            "POST /delivery-data/ingest",
+            None,
+            lambda fx: _request(
+                client,
+                "POST",
+                "/api/v1/delivery-data/ingest",
+                {"restaurant_id": "bench-restaurant", "mode": "upsert"},
+                upload(fx),
+            ),
+        ),
+        (
+            "POST /analytics/analyze/full",
+            EXCEL_MAX_ROWS,
+            lambda fx: _request(
+                client,
+                "POST",
+                "/api/v1/analytics/analyze/full",
+                upload=upload(fx, "xlsx"),
+            ),
+        ),
+        (
+            "POST /export-clean/validate-upload",
+            None,
+            lambda fx: _request(
+                client,
+                "POST",
+                f"{E}/validate-upload",
+                {"include_data": False},
+                upload(fx),
+            ),
+        ),
+        (
+            "POST /export-clean/profile",
+            None,
+            lambda fx: _request(client, "POST", f"{E}/profile", upload=upload(fx)),
+        ),
+        (
+            "POST /export-clean/outliers",
+            DICT_MAX_ROWS,
+            lambda fx: _request(
+                client, "POST", f"{E}/outliers", {"method": "mad"}, upload(fx)
+            ),
+        ),
+        (
+            "POST /export-clean/parse-dates",
+            DICT_MAX_ROWS,
+            lambda fx: _request(
+                client,
+                "POST",
+                f"{E}/parse-dates",
+                upload=upload(fx, "csv", "text_dates"),
+            ),
+        ),
+        (
+            "POST /export-clean/remove-duplicates",
+            DICT_MAX_ROWS,
+            lambda fx: _request(
+                client,
+                "POST",
+                f"{E}/remove-duplicates",
+                {
+                    "mode": "near",
+                    "subset": "Location,Pizza Type,Pizza Size",
+                    "time_column": "Order Time",
+                },
+                upload(fx),
+            ),
+        ),
+        (
+            "POST /export-clean/export/parquet",
+            None,
+            lambda fx: _request(
+                client, "POST", f"{E}/export/parquet", upload=upload(fx)
+            ),
+        ),
+        (
+            "POST /forecasting/all-methods",
+            None,
+            lambda fx: _request(
+                client,
+                "POST",
+                "/api/v1/forecasting/all-methods",
+                series_params,
+                upload(fx, frame="series"),
+            ),
+        ),
+        (
+            "POST /forecasting/backtest",
+            None,
+            lambda fx: _request(
+                client,
+                "POST",
+                "/api/v1/forecasting/backtest",
+                series_params,
+                upload(fx, frame="series"),
+            ),
+        ),
+        (
+            "POST /recommendation/all-methods",
+            None,
+            lambda fx: _request(
+                client,
+                "POST",
+                "/api/v1/recommendation/all-methods",
+                lines_params,
+                upload(fx, frame="lines"),
+            ),
+        ),
+        (
+            "POST /delivery-model/train/upload",
+            None,
+            lambda fx: _request(
+                client, "POST", "/api/v1/delivery-model/train/upload", upload=upload(fx)
+            ),
+        ),
+        (
+            "GET /export-clean/profile/db",
+            None,
+            lambda fx: _request(client, "GET", f"{E}/profile/db"),
+        ),
+        (
+            "GET /forecasting/db/all-methods",
+            None,
+            lambda fx: _request(client, "GET", "/api/v1/forecasting/db/all-methods"),
+        ),
+        (
+            "GET /analytics-data/summary",
+            None,
+            lambda fx: _request(client, "GET", "/api/v1/analytics-data/summary"),
+        ),
+        (
+            "POST /delivery-model/train",
+            None,
+            lambda fx: _request(client, "POST", "/api/v1/delivery-model/train"),
+        ),
+        (
+            "POST /recommendation/index/rebuild",
+            None,
+            lambda fx: _request(client, "POST", "/api/v1/recommendation/index/rebuild"),
+        ),
+    ]
+
+
+def uncovered_methods() -> List[str]:
+    """Method publik PolarsDataProcessor yang belum punya case"""
+    covered = {name for name, _, _ in METHOD_CASES + IO_CASES}
+    return sorted(
+        name
+        for name, value in vars(PolarsDataProcessor).items()
+        if isinstance(value, staticmethod)
+        and not name.startswith("_")
+        and name not in covered
+    )
+
+
+def run_case(
+    group: str,
+    name: str,
+    n_rows: int,
+    max_rows: Optional[int],
+    factory,
+    fx: Fixtures,
+    repeat: int,
+    budget: float,
+) -> Dict[str, Any]:
+    """Menjalankan satu case sampai repeat kali (berhenti lebih awal jika lewat budget)"""
+    result: Dict[str, Any] = {"group": group, "name": name, "rows": n_rows}
+    if max_rows is not None and n_rows > max_rows:
+        return {**result, "status": "skipped", "error": f"> {max_rows:,} baris"}
+    try:
+        fn = factory(fx)
+        seconds = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            fn()
+            seconds.append(time.perf_counter() - start)
+            if sum(seconds) > budget:
+                break
+    except Exception as e:
+        return {**result, "status": "error", "error": f"{type(e).__name__}: {e}"[:300]}
+    median = statistics.median(seconds)
+    return {
+        **result,
+        "status": "ok",
+        "seconds": [round(s, 6) for s in seconds],
+        "min": round(min(seconds), 6),
+        "median": round(median, 6),
+        "rows_per_second": round(n_rows / median) if median > 0 else None,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    min_delta_ms: float,
+) -> List[Dict[str, Any]]:
+    """
+    Membandingkan median per (group, name, rows) dengan run sebelumnya
+    Returns:
+        List perubahan melewati threshold, dengan flag "regression"; case yang
+        error di run sekarang selalu masuk sebagai regresi (dengan "error")
+    """
+    base = {
+        (r["group"], r["name"], r["rows"]): r
+        for r in baseline["results"]
+        if r["status"] == "ok"
+    }
+    changes = []
+    for result in current["results"]:
+        previous = base.get((result["group"], result["name"], result["rows"]))
+        if result["status"] == "error":
+            changes.append(
+                {
+                    "group": result["group"],
+                    "name": result["name"],
+                    "rows": result["rows"],
+                    "baseline": previous["median"] if previous else None,
+                    "current": None,
+                    "ratio": None,
+                    "regression": True,
+                    "error": result["error"],
+                }
+            )
+            continue
+        if result["status"] != "ok" or previous is None or previous["median"] <= 0:
+            continue
+        ratio = result["median"] / previous["median"]
+        delta_ms = (result["median"] - previous["median"]) * 1000
+        if abs(ratio - 1) <= threshold or abs(delta_ms) <= min_delta_ms:
+            continue
+        changes.append(
+            {
+                "group": result["group"],
+                "name": result["name"],
+                "rows": result["rows"],
+                "baseline": previous["median"],
+                "current": result["median"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > 1,
+            }
+        )
+    return changes
+
+
+def print_comparison(changes: List[Dict[str, Any]]) -> int:
+    """Mencetak perubahan; mengembalikan jumlah regresi"""
+    if not changes:
+        print("Tidak ada perubahan melewati threshold")
+        return 0
+    errors = [c for c in changes if "error" in c]
+    for change in errors:
+        print(
+            f"{'ERROR':11s} {change['group']:7s} {change['name']:42s} "
+            f"{change['rows']:>11,}  {change['error']}"
+        )
+    timed = [c for c in changes if "error" not in c]
+    for change in sorted(timed, key=lambda c: -c["ratio"]):
+        label = "REGRESI" if change["regression"] else "lebih cepat"
+        print(
+            f"{label:11s} {change['group']:7s} {change['name']:42s} {change['rows']:>11,}  "
+            f"{change['baseline'] * 1000:10.1f} -> {change['current'] * 1000:10.1f} ms  "
+            f"({change['ratio']:.2f}x)"
+        )
+    regressions = sum(1 for c in timed if c["regression"])
+    print(
+        f"{len(errors)} error, {regressions} regresi, "
+        f"{len(timed) - regressions} lebih cepat"
+    )
+    return len(errors) + regressions
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    sizes = sorted(parse_size(size) for size in args.sizes.split(","))
+    groups = [group for group in args.groups.split(",") if group]
+    pattern = re.compile(args.filter) if args.filter else None
+    missing = uncovered_methods()
+    if missing:
+        print(f"Peringatan: method tanpa benchmark: {', '.join(missing)}")
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "polars": pl.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": sizes,
+            "groups": groups,
+            "repeat": args.repeat,
+        },
+        "results": [],
+    }
+    with TestClient(app) as client:
+        cases = {"methods": METHOD_CASES, "io": IO_CASES, "api": api_cases(client)}
+        for n_rows in sizes:
+            fx = Fixtures(n_rows)
+            for group in groups:
+                for name, max_rows, factory in cases[group]:
+                    if pattern and not pattern.search(f"{group}/{name}"):
+                        continue
+                    result = run_case(
+                        group,
+                        name,
+                        n_rows,
+                        max_rows,
+                        factory,
+                        fx,
+                        args.repeat,
+                        args.budget,
+                    )
+                    report["results"].append(result)
+                    if result["status"] == "ok":
+                        detail = f"{result['median'] * 1000:10.1f} ms"
+                    else:
+                        detail = f"{result['status']}: {result['error']}"
+                    print(f"{group:7s} {name:42s} {n_rows:>11,}  {detail}", flush=True)
+            del fx
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", default="10k,100k", help="10k,100k,1m,10m atau angka"
+    )
+    parser.add_argument("--groups", default=",".join(GROUPS), help="methods,io,api")
+    parser.add_argument("--filter", help="Regex atas 'group/nama' case")
+    parser.add_argument("--repeat", type=int, default=3, help="Maksimum run per case")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=10.0,
+        help="Detik per case sebelum berhenti mengulang",
+    )
+    parser.add_argument(
+        "--output", help="File JSON hasil (default benchmarks/results/<waktu>.json)"
+    )
+    parser.add_argument("--baseline", help="JSON run sebelumnya untuk dibandingkan")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="Bandingkan dua file saja",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Batas perlambatan relatif (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--min-delta-ms", type=float, default=5.0, help="Abaikan selisih di bawah ini"
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        return (
+            1
+            if print_comparison(
+                compare(baseline, current, args.threshold, args.min_delta_ms)
+            )
+            else 0
+        )
+
+    report = run_suite(args)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil: {output}")
+
+    errors = sum(1 for result in report["results"] if result["status"] == "error")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return (
+            1
+            if print_comparison(
+                compare(baseline, report, args.threshold, args.min_delta_ms)
+            )
+            else 0
+        )
+    if errors:
+        print(f"{errors} case error")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
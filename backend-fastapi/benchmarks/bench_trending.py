@@ -0,0 +1,87 @@
+"""
+Benchmark recommend_trending_items dengan 10 ribu item
+
+Jalankan dari folder backend-fastapi:
+    python -m benchmarks.bench_trending [n_items] [n_rows]
+"""
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import polars as pl
+
+from app.services.polars_service import PolarsDataProcessor
+
+
+def make_sales(n_items: int, n_rows: int, n_days: int = 90, seed: int = 7) -> pl.DataFrame:
+    """Penjualan harian; sebagian item diberi tren naik di akhir periode"""
+    rng = np.random.default_rng(seed)
+    items = rng.integers(0, n_items, size=n_rows)
+    days = rng.integers(0, n_days, size=n_rows)
+    rising = items % 10 == 0
+    days[rising] = np.maximum(days[rising], rng.integers(0, n_days, size=rising.sum()))
+    start = date(2024, 1, 1)
+    return pl.DataFrame(
+        {
+            "order_date": pl.Series([start + timedelta(days=int(d)) for d in days]),
+            "item": pl.Series([f"Item {i:05d}" for i in items]),
+        }
+    )
+
+
+def legacy_trending(df: pl.DataFrame, n: int = 10, recent_periods: int = 7):
+    """Implementasi lama (filter per item) sebagai pembanding"""
+    temp_df = df.sort("order_date")
+    item_trends = []
+    for item in temp_df["item"].unique().to_list():
+        item_df = temp_df.filter(pl.col("item") == item)
+        counts = item_df.group_by("order_date").agg(pl.len().alias("count"))
+        counts = counts["count"].to_list()
+        if len(counts) >= 2:
+            recent = sum(counts[-recent_periods:]) / min(recent_periods, len(counts))
+            older = (
+                sum(counts[-2 * recent_periods : -recent_periods])
+                / min(recent_periods, len(counts) - recent_periods)
+                if len(counts) > recent_periods
+                else recent
+            )
+            trend = (recent - older) / older if older > 0 else 0
+        else:
+            trend = 0
+        item_trends.append({"item": item, "trend": trend})
+    return sorted(item_trends, key=lambda x: x["trend"], reverse=True)[:n]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    df = make_sales(n_items, n_rows)
+    print(f"{n_items:,} items, {n_rows:,} rows")
+
+    window, t_window = timed(
+        PolarsDataProcessor.recommend_trending_items,
+        df,
+        date_column="order_date",
+        item_column="item",
+    )
+    decayed, t_decay = timed(
+        PolarsDataProcessor.recommend_trending_items,
+        df,
+        date_column="order_date",
+        item_column="item",
+        half_life=7,
+    )
+    legacy, t_old = timed(legacy_trending, df)
+
+    print(f"single-pass window : {t_window:8.3f} s  ({t_old / t_window:.0f}x)")
+    print(f"single-pass decay  : {t_decay:8.3f} s")
+    print(f"legacy per-item    : {t_old:8.3f} s")
+    print("top window:", [r["item"] for r in window[:5]])
+    print("top decay :", [r["item"] for r in decayed[:5]])
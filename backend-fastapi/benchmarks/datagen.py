@@ -0,0 +1,240 @@
+"""
+Generator data delivery pizza sintetis (deterministik per seed) untuk benchmark
+
+Kategori diambil dari app/services/upload_validation.py (port cleansing.ts),
+dan kolom saling konsisten: jam sibuk makan siang/malam, traffic lebih padat
+di jam sibuk, estimasi durasi dari jarak + traffic + kompleksitas pizza,
+delay dari durasi aktual. Bentuk yang tersedia:
+- make_workbook       : sheet upload dengan header Excel ("Order ID", ...)
+- make_delivery_frame : kolom tabel DeliveryData (camelCase), hasil cleansing
+- make_analysis_frame : kolom snake_case untuk method analisis PolarsDataProcessor
+- make_order_lines    : beberapa pizza per order (untuk co-occurrence/asosiasi)
+- make_text_dates     : workbook dengan tanggal teks campuran format
+Jalankan dari folder backend-fastapi untuk menulis file contoh:
+    python -m benchmarks.datagen [size: 10k|100k|1m|10m|angka] [format] [path]
+"""
+
+import io
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import polars as pl
+
+from app.services.upload_validation import (
+    MONTHS,
+    PAYMENT_METHODS,
+    PIZZA_SIZES,
+    PIZZA_TYPES,
+    TRAFFIC_LEVELS,
+    cleanse_delivery_upload,
+)
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+FORMATS = ("parquet", "csv", "json", "xlsx")
+
+RESTAURANTS = ["Pizza Hub", "Slice House"]
+LOCATIONS = ["Jakarta", "Bandung", "Surabaya", "Medan"]
+# Jam order: ramai saat makan siang (11-13) dan makan malam (18-21)
+HOUR_WEIGHTS = np.array(
+    [1, 1, 1, 1, 1, 1, 2, 4, 5, 6, 8, 14, 15, 12, 7, 6, 7, 10, 15, 16, 14, 11, 6, 3],
+    dtype=float,
+)
+PEAK_HOURS = [11, 12, 13, 18, 19, 20, 21]
+
+
+def parse_size(value: str) -> int:
+    """'100k' / '1m' / '250000' -> jumlah baris"""
+    return SIZES.get(value.lower()) or int(value.replace("_", ""))
+
+
+def _weights(n: int, skew: float = 0.8) -> np.ndarray:
+    """Popularitas kategori menurun (Zipf ringan) agar top-N bermakna"""
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+
+def make_workbook(n_rows: int, seed: int = 11) -> pl.DataFrame:
+    """
+    Sheet upload delivery dengan header Excel
+    ~1% baris tanpa durasi delivery dan ~0.1% Order ID ganda (seperti export
+    manual dari POS), sehingga jalur validasi dan dedup ikut teruji.
+    """
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 366, n_rows).astype("timedelta64[D]")
+    hours = rng.choice(24, n_rows, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    minutes = hours * 60 + rng.integers(0, 60, n_rows)
+    order_time = (
+        np.datetime64("2024-01-01T00:00:00") + days + minutes.astype("timedelta64[m]")
+    ).astype("datetime64[us]")
+    is_peak = np.isin(hours, PEAK_HOURS)
+
+    traffic_idx = np.where(
+        is_peak,
+        rng.choice(3, n_rows, p=[0.15, 0.35, 0.5]),
+        rng.choice(3, n_rows, p=[0.45, 0.4, 0.15]),
+    )
+    traffic = pl.Series(TRAFFIC_LEVELS).gather(traffic_idx)
+    traffic_impact = traffic_idx + 1
+
+    size_idx = rng.choice(len(PIZZA_SIZES), n_rows, p=[0.2, 0.35, 0.3, 0.15])
+    type_idx = rng.choice(len(PIZZA_TYPES), n_rows, p=_weights(len(PIZZA_TYPES)))
+    toppings = rng.integers(0, 6, n_rows)
+    complexity = toppings * 2 + size_idx + 1 + type_idx % 4
+    distance = np.round(rng.gamma(2.0, 2.5, n_rows).clip(0.5, 15), 1)
+
+    estimated = np.round(
+        10 + 2.0 * distance + 2.5 * traffic_impact + 0.4 * complexity, 1
+    )
+    duration = np.maximum(5, np.round(estimated + rng.normal(-3, 6, n_rows))).astype(
+        np.int64
+    )
+    delay = np.round(np.maximum(0.0, duration - estimated), 1)
+    duration_col = pl.Series(duration).cast(pl.Float64)
+    duration_col = duration_col.scatter(np.flatnonzero(rng.random(n_rows) < 0.01), None)
+
+    payment_idx = rng.choice(
+        len(PAYMENT_METHODS), n_rows, p=_weights(len(PAYMENT_METHODS), 0.5)
+    )
+    payment = pl.Series(PAYMENT_METHODS).gather(payment_idx)
+
+    order_ids = pl.Series(np.arange(n_rows)).cast(pl.Utf8)
+    order_ids = order_ids.scatter(np.flatnonzero(rng.random(n_rows) < 0.001), "0")
+    order_time_col = pl.Series(order_time)
+
+    def pick(values):
+        return pl.Series(values).gather(rng.integers(0, len(values), n_rows))
+
+    return pl.DataFrame(
+        {
+            "Order ID": "ORD" + order_ids,
+            "Restaurant Name": pick(RESTAURANTS),
+            "Location": pick(LOCATIONS),
+            "Order Time": order_time_col,
+            "Delivery Time": order_time_col
+            + pl.Series(duration.astype("timedelta64[m]").astype("timedelta64[us]")),
+            "Delivery Duration (min)": duration_col,
+            "Pizza Size": pl.Series(PIZZA_SIZES).gather(size_idx),
+            "Pizza Type": pl.Series(PIZZA_TYPES).gather(type_idx),
+            "Toppings Count": toppings,
+            "Distance (km)": distance,
+            "Traffic Level": traffic,
+            "Payment Method": payment,
+            "Is Peak Hour": is_peak,
+            "Is Weekend": order_time_col.dt.weekday() >= 6,
+            "Order Month": pl.Series(MONTHS).gather(order_time_col.dt.month() - 1),
+            "Payment Category": np.where(
+                np.array(PAYMENT_METHODS)[payment_idx] == "Cash", "Offline", "Online"
+            ),
+            "Estimated Duration (min)": estimated,
+            "Delay (min)": delay,
+            "Is Delayed": delay > 0,
+            "Pizza Complexity": complexity,
+            "Traffic Impact": traffic_impact,
+        }
+    )
+
+
+def make_delivery_frame(
+    n_rows: int, seed: int = 11, restaurant_id: str = "bench-restaurant"
+) -> pl.DataFrame:
+    """Baris DeliveryData (camelCase) hasil cleansing workbook, seperti di database"""
+    data, _, _ = cleanse_delivery_upload(
+        make_workbook(n_rows, seed),
+        restaurant_id=restaurant_id,
+        uploaded_by="bench",
+        unique_order_ids=False,
+        now=datetime(2025, 1, 1),
+        derive_fields=True,
+    )
+    return data
+
+
+def make_analysis_frame(n_rows: int, seed: int = 11) -> pl.DataFrame:
+    """DeliveryData dengan nama kolom snake_case (order_hour, is_delayed, ...)"""
+    data = make_delivery_frame(n_rows, seed)
+    return data.rename(
+        {
+            col: "".join(f"_{c.lower()}" if c.isupper() else c for c in col)
+            for col in data.columns
+        }
+    )
+
+
+def make_order_lines(n_lines: int, seed: int = 5) -> pl.DataFrame:
+    """
+    Baris item per order (1-4 pizza per order) dengan pasangan favorit,
+    sehingga co-occurrence dan aturan asosiasi tidak acak murni
+    """
+    rng = np.random.default_rng(seed)
+    n_items = len(PIZZA_TYPES)
+    basket_sizes = rng.choice([1, 2, 3, 4], n_lines, p=[0.45, 0.3, 0.17, 0.08])
+    basket_sizes = basket_sizes[: np.searchsorted(np.cumsum(basket_sizes), n_lines) + 1]
+    order_index = np.repeat(np.arange(len(basket_sizes)), basket_sizes)[:n_lines]
+    first = np.repeat(
+        rng.choice(n_items, len(basket_sizes), p=_weights(n_items)), basket_sizes
+    )[:n_lines]
+    # Item berikutnya dalam order: 40% pasangan tetap dari item pertama
+    companion = (first * 5 + 3) % n_items
+    random_item = rng.choice(n_items, n_lines, p=_weights(n_items))
+    position = np.arange(n_lines) - np.searchsorted(order_index, order_index)
+    items = np.where(
+        position == 0,
+        first,
+        np.where(rng.random(n_lines) < 0.4, companion, random_item),
+    )
+    days = rng.integers(0, 90, len(basket_sizes)).astype("timedelta64[D]")
+    order_dates = (np.datetime64("2024-01-01") + days)[order_index]
+    return pl.DataFrame(
+        {
+            "Order ID": pl.Series(order_index).cast(pl.Utf8).str.zfill(9),
+            "Pizza Type": pl.Series(PIZZA_TYPES).gather(items),
+            "Pizza Size": pl.Series(PIZZA_SIZES).gather(
+                rng.integers(0, len(PIZZA_SIZES), n_lines)
+            ),
+            "Location": pl.Series(LOCATIONS).gather(
+                rng.integers(0, len(LOCATIONS), len(basket_sizes))[order_index]
+            ),
+            "Order Date": pl.Series(order_dates).cast(pl.Date),
+        }
+    )
+
+
+def make_text_dates(n_rows: int, seed: int = 11) -> pl.DataFrame:
+    """Workbook dengan Order/Delivery Time sebagai teks (80% ISO, 20% d/m/Y)"""
+    workbook = make_workbook(n_rows, seed)
+    rng = np.random.default_rng(seed + 1)
+    local = pl.Series(rng.random(n_rows) < 0.2)
+    return workbook.with_columns(
+        pl.when(local)
+        .then(pl.col(col).dt.strftime("%d/%m/%Y %H:%M"))
+        .otherwise(pl.col(col).dt.strftime("%Y-%m-%d %H:%M:%S"))
+        .alias(col)
+        for col in ("Order Time", "Delivery Time")
+    )
+
+
+def to_bytes(df: pl.DataFrame, fmt: str) -> bytes:
+    """Isi file upload dalam format parquet/csv/json/xlsx (ditulis di memori)"""
+    buffer = io.BytesIO()
+    if fmt == "parquet":
+        df.write_parquet(buffer)
+    elif fmt == "csv":
+        df.write_csv(buffer, datetime_format="%Y-%m-%d %H:%M:%S")
+    elif fmt == "json":
+        df.write_json(buffer)
+    elif fmt == "xlsx":
+        df.write_excel(buffer)
+    else:
+        raise ValueError(f"Format tidak didukung: {fmt}")
+    return buffer.getvalue()
+
+
+if __name__ == "__main__":
+    n_rows = parse_size(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    fmt = sys.argv[2] if len(sys.argv) > 2 else "parquet"
+    path = sys.argv[3] if len(sys.argv) > 3 else f"delivery-{n_rows}.{fmt}"
+    with open(path, "wb") as f:
+        f.write(to_bytes(make_workbook(n_rows), fmt))
+    print(f"{n_rows:,} rows -> {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
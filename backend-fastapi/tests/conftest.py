@@ -0,0 +1,55 @@
+"""
+Fixture bersama: database SQLite dan artifact_dir sementara
+Environment di-set sebelum modul app diimpor karena settings dan engine
+dibuat saat import.
+"""
+
+import os
+import tempfile
+
+_tmp = tempfile.TemporaryDirectory(prefix="pizza-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'test.db')}"
+os.environ["ARTIFACT_DIR"] = os.path.join(_tmp.name, "artifacts")
+os.environ["DATASET_CACHE_DIR"] = os.path.join(_tmp.name, "datasets")
+os.environ["DEBUG"] = "false"
+
+import polars as pl  # noqa: E402
+import pytest  # noqa: E402
+
+from app.database import SessionLocal, init_db  # noqa: E402
+from app.models import DeliveryData  # noqa: E402
+from app.services.ingestion import ingest_delivery_upload  # noqa: E402
+from benchmarks.datagen import make_workbook, to_bytes  # noqa: E402
+
+init_db()
+
+
+@pytest.fixture
+def db():
+    """Session database; tabel DeliveryData dikosongkan setelah test"""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.query(DeliveryData).delete()
+        session.commit()
+        session.close()
+
+
+@pytest.fixture
+def workbook() -> pl.DataFrame:
+    """Sheet upload delivery sintetis tanpa Order ID ganda"""
+    return make_workbook(300).unique("Order ID", keep="first", maintain_order=True)
+
+
+@pytest.fixture
+def ingest(db):
+    """Ingest DataFrame (sebagai file Parquet) ke restoran "r1" """
+
+    def run(df: pl.DataFrame, mode: str = "insert", **kwargs) -> dict:
+        return ingest_delivery_upload(
+            to_bytes(df, "parquet"), "upload.parquet", "r1", mode=mode, **kwargs
+        )
+
+    return run
@@ -0,0 +1,42 @@
+import io
+import re
+
+import polars as pl
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.polars_service import PolarsDataProcessor
+from benchmarks.datagen import make_workbook, to_bytes
+
+
+def test_analytics_routes_parse_each_upload_once(monkeypatch):
+    calls = []
+
+    def read_excel_file(contents: bytes, sheet_name: str = "Sheet1"):
+        # Excel diganti Parquet agar test tidak bergantung pada fastexcel
+        calls.append(len(contents))
+        return pl.read_parquet(io.BytesIO(contents))
+
+    monkeypatch.setattr(PolarsDataProcessor, "read_excel_file", read_excel_file)
+    # Endpoint analytics membaca nama kolom snake_case (pizza_size, is_delayed)
+    workbook = make_workbook(150)
+    workbook = workbook.rename(
+        {
+            name: re.sub(r"\W+", "_", name.lower()).strip("_")
+            for name in workbook.columns
+        }
+    )
+    contents = to_bytes(workbook, "parquet")
+    client = TestClient(app)
+
+    for route in ("summary", "pizza", "full"):
+        response = client.post(
+            f"/api/v1/analytics/analyze/{route}",
+            files={"file": ("orders.xlsx", contents)},
+        )
+        assert response.status_code == 200, response.text
+    response = client.post(
+        "/api/v1/analytics/upload-excel", files={"file": ("orders.xlsx", contents)}
+    )
+    assert response.json()["rows"] == 150
+    assert len(calls) == 1
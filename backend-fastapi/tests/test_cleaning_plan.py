@@ -0,0 +1,150 @@
+from datetime import datetime
+
+import polars as pl
+import pytest
+
+from app.services.polars_service import FILL_NULL_STRATEGIES, PolarsDataProcessor
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "order_id": ["A1", "A2", "A2", "A3", "A4", "A5", "A6", "A6"],
+            "location": [" Jakarta", "Bandung ", "Bandung ", None, "Medan", "Medan", " Surabaya ", " Surabaya "],
+            "distance": [1.5, None, None, 3.0, None, 4.5, 2.0, 2.0],
+            "duration": [20, 25, 25, None, 30, None, 18, 18],
+            "order_time": [
+                "2024-01-05 10:00:00",
+                "2024-01-05 11:30:00",
+                "2024-01-05 11:30:00",
+                "2024-01-06 09:15:00",
+                None,
+                "2024-01-07 19:45:00",
+                "2024-01-08 12:00:00",
+                "2024-01-08 12:00:00",
+            ],
+        }
+    )  # fmt: skip
+
+
+def _baseline_clean_data(
+    df: pl.DataFrame,
+    drop_nulls: bool = True,
+    drop_duplicates: bool = True,
+    fill_null_strategy=None,
+    trim_strings: bool = True,
+    convert_dates: bool = True,
+    date_columns=None,
+) -> pl.DataFrame:
+    """
+    clean_data sebelum cleaning plan, langkah demi langkah (with_columns per
+    kolom), dengan dua bug crash-nya diperbaiki: nama parameter
+    fill_null_strategy dan str.strip yang sudah tidak ada di Polars
+    """
+    result = df.clone()
+    if drop_nulls:
+        result = result.drop_nulls()
+    if drop_duplicates:
+        result = result.unique(maintain_order=True)
+    if trim_strings:
+        for col in [c for c in result.columns if result[c].dtype == pl.Utf8]:
+            result = result.with_columns(pl.col(col).str.strip_chars())
+    for col, strategy in (fill_null_strategy or {}).items():
+        if col in result.columns:
+            result = result.with_columns(
+                FILL_NULL_STRATEGIES[strategy](pl.col(col)).alias(col)
+            )
+    if convert_dates and date_columns:
+        for col in date_columns:
+            if col in result.columns:
+                result = result.with_columns(
+                    pl.col(col).str.to_datetime("%Y-%m-%d %H:%M:%S")
+                )
+    return result
+
+
+@pytest.mark.parametrize("drop_nulls", [True, False])
+@pytest.mark.parametrize("drop_duplicates", [True, False])
+@pytest.mark.parametrize("trim_strings", [True, False])
+def test_clean_data_matches_step_by_step_baseline(
+    frame, drop_nulls, drop_duplicates, trim_strings
+):
+    kwargs = dict(
+        drop_nulls=drop_nulls,
+        drop_duplicates=drop_duplicates,
+        trim_strings=trim_strings,
+        date_columns=["order_time"],
+    )
+    expected = _baseline_clean_data(frame, **kwargs)
+    assert PolarsDataProcessor.clean_data(frame, **kwargs).equals(expected)
+
+
+@pytest.mark.parametrize("strategy", sorted(FILL_NULL_STRATEGIES))
+def test_fill_null_strategies_match_baseline(frame, strategy):
+    kwargs = dict(
+        drop_nulls=False,
+        fill_null_strategy={"distance": strategy, "duration": strategy},
+        date_columns=["order_time"],
+    )
+    expected = _baseline_clean_data(frame, **kwargs)
+    assert PolarsDataProcessor.clean_data(frame, **kwargs).equals(expected)
+
+
+def test_column_operations_compile_into_one_stage(frame):
+    plan = [
+        {"op": "drop_duplicates"},
+        {"op": "trim_strings"},
+        {"op": "fill_null", "columns": ["distance"], "strategy": "median"},
+        {"op": "cast", "columns": ["duration"], "dtype": "Float64"},
+        {"op": "fill_null", "columns": ["duration"], "strategy": "custom", "value": -1},
+        {"op": "convert_dates", "columns": ["order_time"]},
+        {"op": "drop_nulls", "subset": ["order_time"]},
+    ]
+    explained = PolarsDataProcessor.explain_cleaning_plan(frame, plan)
+    cleaned = PolarsDataProcessor.apply_cleaning_plan(frame, plan)
+
+    assert [stage["stage"] for stage in explained["stages"]] == [
+        "drop_duplicates",
+        "with_columns",
+        "drop_nulls",
+    ]
+    assert explained["cleaned_rows"] == len(cleaned) == 5
+    assert (
+        explained["schema_after"]["order_time"]
+        == "Datetime(time_unit='us', time_zone=None)"
+    )
+    assert explained["null_counts_after"]["duration"] == 0
+    assert cleaned["order_id"].to_list() == ["A1", "A2", "A3", "A5", "A6"]
+    assert cleaned["duration"].to_list() == [20.0, 25.0, -1.0, -1.0, 18.0]
+    assert cleaned["location"][0] == "Jakarta"
+
+
+def test_convert_dates_detects_mixed_formats():
+    df = pl.DataFrame(
+        {"order_time": ["2024-01-05 10:00:00", "25/01/2024 08:30", "2024-02-01", None]}
+    )
+    plan = [{"op": "convert_dates", "columns": ["order_time"]}]
+    resolved = PolarsDataProcessor.resolve_date_formats(df, plan)
+    cleaned = PolarsDataProcessor.apply_cleaning_plan(df, plan)
+
+    assert set(resolved[0]["formats"]) == {
+        "%Y-%m-%d %H:%M:%S",
+        "%d/%m/%Y %H:%M",
+        "%Y-%m-%d",
+    }
+    assert cleaned["order_time"].to_list() == [
+        datetime(2024, 1, 5, 10),
+        datetime(2024, 1, 25, 8, 30),
+        datetime(2024, 2, 1),
+        None,
+    ]
+
+
+def test_unknown_operation_is_rejected(frame):
+    with pytest.raises(ValueError):
+        PolarsDataProcessor.apply_cleaning_plan(frame, [{"op": "normalize"}])
+    with pytest.raises(ValueError):
+        PolarsDataProcessor.apply_cleaning_plan(
+            frame, [{"op": "fill_null", "columns": ["distance"], "strategy": "mode"}]
+        )
@@ -0,0 +1,32 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import database
+
+
+@pytest.fixture
+def legacy_engine(tmp_path, monkeypatch):
+    """Database lama: DeliveryData tanpa kolom updatedAt dan rowHash"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    database.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text('ALTER TABLE "DeliveryData" DROP COLUMN "updatedAt"'))
+        conn.execute(text('ALTER TABLE "DeliveryData" DROP COLUMN "rowHash"'))
+    monkeypatch.setattr(database, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def test_init_db_reports_missing_columns_without_altering(legacy_engine, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.database"):
+        database.init_db()
+    assert "DeliveryData.updatedAt, DeliveryData.rowHash" in caplog.text
+    assert database.missing_columns() == {"DeliveryData": ["updatedAt", "rowHash"]}
+
+
+def test_add_missing_columns_is_explicit_and_idempotent(legacy_engine):
+    assert database.add_missing_columns() == {"DeliveryData": ["updatedAt", "rowHash"]}
+    assert database.missing_columns() == {}
+    assert database.add_missing_columns() == {}
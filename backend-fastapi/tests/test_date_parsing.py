@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import polars as pl
+
+from app.services.polars_service import EXCEL_SERIAL_LABEL, PolarsDataProcessor
+
+
+def _mixed() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "order_time": [
+                "2024-03-01 10:15:00",
+                "2024-03-02 11:00:00",
+                "25/03/2024 19:30",
+                "2024-03-04",
+                "45385",
+                " 2024-03-05 08:00:00 ",
+                "bukan tanggal",
+                None,
+            ],
+            "customer": ["a", "b", "c", "d", "e", "f", "g", "h"],
+        }
+    )
+
+
+def test_detect_date_formats_counts_hits_per_format():
+    hits = PolarsDataProcessor.detect_date_formats(_mixed()["order_time"])
+    assert hits == {
+        "%Y-%m-%d %H:%M:%S": 3,
+        "%d/%m/%Y %H:%M": 1,
+        "%Y-%m-%d": 1,
+        EXCEL_SERIAL_LABEL: 1,
+    }
+    assert list(hits)[0] == "%Y-%m-%d %H:%M:%S"
+
+
+def test_parse_dates_mixed_formats_in_one_pass():
+    parsed, report = PolarsDataProcessor.parse_dates(_mixed(), columns=["order_time"])
+
+    assert parsed["order_time"].dtype == pl.Datetime("us")
+    assert parsed["order_time"].to_list() == [
+        datetime(2024, 3, 1, 10, 15),
+        datetime(2024, 3, 2, 11),
+        datetime(2024, 3, 25, 19, 30),
+        datetime(2024, 3, 4),
+        datetime(2024, 4, 3),
+        datetime(2024, 3, 5, 8),
+        None,
+        None,
+    ]
+    assert report["order_time"]["hits"] == {
+        "%Y-%m-%d %H:%M:%S": 3,
+        "%d/%m/%Y %H:%M": 1,
+        "%Y-%m-%d": 1,
+        EXCEL_SERIAL_LABEL: 1,
+    }
+    assert report["order_time"]["unparsed"] == 1
+
+
+def test_formats_outside_the_sample_are_parsed_by_fallback():
+    df = pl.DataFrame(
+        {"order_time": ["2024-01-01 00:00:00"] * 50 + ["31-12-2023 23:59"]}
+    )
+    parsed, report = PolarsDataProcessor.parse_dates(
+        df, columns=["order_time"], sample_size=10
+    )
+    assert parsed["order_time"][-1] == datetime(2023, 12, 31, 23, 59)
+    assert report["order_time"]["hits"]["%d-%m-%Y %H:%M"] == 1
+    assert report["order_time"]["unparsed"] == 0
+
+
+def test_numeric_excel_serials():
+    df = pl.DataFrame({"order_date": [45292.0, 45292.5, 12.0, None]})
+    parsed, report = PolarsDataProcessor.parse_dates(df, columns=["order_date"])
+    assert parsed["order_date"].to_list() == [
+        datetime(2024, 1, 1),
+        datetime(2024, 1, 1, 12),
+        None,
+        None,
+    ]
+    assert report["order_date"]["unparsed"] == 1
+
+    untouched, _ = PolarsDataProcessor.parse_dates(
+        df, columns=["order_date"], excel_serial=False
+    )
+    assert untouched["order_date"].null_count() == 4
+
+
+def test_auto_detection_skips_non_date_text():
+    parsed, report = PolarsDataProcessor.parse_dates(_mixed(), min_hit_rate=0.7)
+    assert list(report) == ["order_time"]
+    assert parsed["customer"].to_list() == _mixed()["customer"].to_list()
+
+    _, strict = PolarsDataProcessor.parse_dates(_mixed(), min_hit_rate=0.9)
+    assert strict == {}
+
+
+def test_clean_delivery_data_parses_non_iso_dates():
+    df = pl.DataFrame(
+        {
+            "order_time": ["25/03/2024 19:30", "2024-03-26 12:00:00"],
+            "delivery_time": ["25/03/2024 20:05", "2024-03-26 12:40:00"],
+            "location": ["Medan", "Bandung"],
+        }
+    )
+    cleaned = PolarsDataProcessor.clean_delivery_data(df)
+    assert cleaned["order_time"].to_list() == [
+        datetime(2024, 3, 25, 19, 30),
+        datetime(2024, 3, 26, 12),
+    ]
+    assert cleaned["delivery_time"].null_count() == 0
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.config import settings
+from app.services import executor
+
+
+class _Tracker:
+    """Mencatat jumlah fungsi yang berjalan bersamaan di thread pool"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def sleep(self, seconds: float) -> float:
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(seconds)
+        finally:
+            with self.lock:
+                self.running -= 1
+        return seconds
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    monkeypatch.setattr(settings, "executor_backend", "thread")
+    monkeypatch.setattr(settings, "analytics_concurrency", 2)
+    return _Tracker()
+
+
+def test_timed_out_methods_keep_their_slot(tracker):
+    async def scenario():
+        results = await executor.run_methods_concurrently(
+            "analytics",
+            {f"slow_{i}": lambda: tracker.sleep(0.3) for i in range(4)},
+            timeout=0.05,
+        )
+        # Komputasi yang timeout masih berjalan dan masih memegang slot
+        assert executor.executor_stats()["analytics"]["active"] == 2
+        assert await executor.run_service("analytics", tracker.sleep, 0.01) == 0.01
+        return results
+
+    results = asyncio.run(scenario())
+    assert all("Timeout" in r["error"] for r in results.values())
+    assert tracker.peak == 2
+    assert executor.executor_stats()["analytics"]["active"] == 0
+
+
+def test_timeout_excludes_time_waiting_for_a_slot(tracker, monkeypatch):
+    monkeypatch.setattr(settings, "analytics_concurrency", 1)
+    results = asyncio.run(
+        executor.run_methods_concurrently(
+            "analytics",
+            {
+                "first": lambda: tracker.sleep(0.3),
+                "second": lambda: tracker.sleep(0.2),
+            },
+            timeout=0.4,
+        )
+    )
+    assert results == {"first": 0.3, "second": 0.2}
+    assert tracker.peak == 1
+
+
+def test_errors_are_reported_per_method(tracker):
+    def fail():
+        raise ValueError("kolom tidak ada")
+
+    results = asyncio.run(
+        executor.run_methods_concurrently(
+            "analytics", {"ok": lambda: tracker.sleep(0), "bad": fail}
+        )
+    )
+    assert results == {"ok": 0, "bad": {"error": "kolom tidak ada"}}
+    assert executor.executor_stats()["analytics"]["active"] == 0
@@ -0,0 +1,72 @@
+import polars as pl
+import pytest
+
+from app.services import executor
+from app.services.polars_service import PolarsDataProcessor
+
+
+@pytest.fixture
+def series() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "date": pl.date_range(
+                pl.date(2024, 1, 1), pl.date(2024, 3, 1), eager=True
+            ),
+        }
+    ).with_columns(
+        (100 + pl.int_range(pl.len()) + (pl.int_range(pl.len()) % 7) * 3)
+        .cast(pl.Float64)
+        .alias("value")
+    )
+
+
+@pytest.mark.parametrize("level", [0, 1, -0.5, 1.5, 95, float("nan")])
+def test_prediction_intervals_reject_levels_outside_unit_interval(level):
+    result = PolarsDataProcessor.compute_prediction_intervals(
+        [10.0, 11.0], [0.5, -0.3, 0.2, -0.1], [0.8, level]
+    )
+    assert "0 dan 1" in result["error"]
+
+
+@pytest.mark.parametrize("method", ["bootstrap", "analytic"])
+def test_prediction_intervals_are_nested(method):
+    result = PolarsDataProcessor.compute_prediction_intervals(
+        [10.0, 11.0, 12.0], [0.5, -0.3, 0.2, -0.1, 0.4], [0.8, 0.95], method=method
+    )
+    narrow, wide = result["bounds"]["0.8"], result["bounds"]["0.95"]
+    for h in range(3):
+        assert wide["lower"][h] <= narrow["lower"][h] <= narrow["upper"][h]
+        assert narrow["upper"][h] <= wide["upper"][h]
+
+
+def test_forecast_reports_invalid_interval_levels(series):
+    result = PolarsDataProcessor.forecast_moving_average(
+        series, "date", "value", intervals=[95]
+    )
+    assert len(result["forecast"]) == result["periods"]
+    assert "error" in result["intervals"]
+
+
+def test_backtest_rejects_invalid_interval_levels(series):
+    result = PolarsDataProcessor.backtest_forecasts(
+        series, "date", "value", max_workers=1, intervals=[0.8, 1.0]
+    )
+    assert "0 dan 1" in result["error"]
+
+
+def test_parallel_backtest_matches_sequential_and_reuses_pool(series):
+    kwargs = {"horizon": 5, "n_folds": 4, "intervals": [0.8]}
+    sequential = PolarsDataProcessor.backtest_forecasts(
+        series, "date", "value", max_workers=1, **kwargs
+    )
+    parallel = PolarsDataProcessor.backtest_forecasts(
+        series, "date", "value", max_workers=2, **kwargs
+    )
+    pool = executor.get_process_pool()
+    again = PolarsDataProcessor.backtest_forecasts(
+        series, "date", "value", max_workers=3, **kwargs
+    )
+
+    assert executor.get_process_pool() is pool
+    assert parallel["metrics"] == sequential["metrics"] == again["metrics"]
+    assert parallel["best_method"] == sequential["best_method"]
@@ -0,0 +1,82 @@
+import polars as pl
+
+from app.models import DeliveryData
+
+
+def _stored(db) -> dict:
+    return {
+        row.orderId: row
+        for row in db.query(
+            DeliveryData.orderId,
+            DeliveryData.version,
+            DeliveryData.uploadedAt,
+            DeliveryData.updatedAt,
+            DeliveryData.distanceKm,
+        )
+    }
+
+
+def test_insert_rejects_existing_order_ids(db, workbook, ingest):
+    first = ingest(workbook)
+    second = ingest(workbook)
+    assert first["inserted"] > 0
+    assert second["inserted"] == 0
+    assert second["rejected"] == len(workbook)
+
+
+def test_upsert_identical_file_is_noop(db, workbook, ingest):
+    first = ingest(workbook)
+    before = _stored(db)
+    report = ingest(workbook, mode="upsert")
+    assert report["inserted"] == report["updated"] == 0
+    assert report["unchanged"] == first["inserted"]
+    assert _stored(db) == before
+
+
+def test_upsert_versions_changed_rows_only(db, workbook, ingest):
+    ingest(workbook)
+    before = _stored(db)
+    changed_ids = workbook["Order ID"].head(5).to_list()
+    corrected = workbook.with_columns(
+        pl.when(pl.col("Order ID").is_in(changed_ids))
+        .then(pl.col("Distance (km)") + 1)
+        .otherwise(pl.col("Distance (km)"))
+    )
+    new_row = workbook.head(1).with_columns(pl.lit("ORD-NEW").alias("Order ID"))
+
+    report = ingest(pl.concat([corrected, new_row]), mode="upsert")
+    after = _stored(db)
+
+    assert report["updated"] == 5
+    assert report["inserted"] == 1
+    for order_id, row in before.items():
+        stored = after[order_id]
+        # uploadedAt tetap (watermark index rekomendasi), updatedAt mencatat upsert
+        assert stored.uploadedAt == row.uploadedAt
+        if order_id in changed_ids:
+            assert stored.version == 2
+            assert stored.updatedAt is not None
+            assert stored.updatedAt > row.uploadedAt
+            assert stored.distanceKm == row.distanceKm + 1
+        else:
+            assert stored.version == 1
+            assert stored.updatedAt is None
+    assert after["ORD-NEW"].version == 1
+
+
+def test_insert_rejects_rows_taken_by_concurrent_writer(db, workbook, ingest):
+    taken = workbook["Order ID"][150]
+
+    def progress(fraction, message=None):
+        # Writer lain meng-insert Order ID yang sama setelah pengecekan awal
+        if message == "inserting":
+            ingest(workbook.filter(pl.col("Order ID") == taken))
+
+    report = ingest(workbook, batch_size=40, progress=progress)
+
+    assert report["inserted"] == len(workbook) - 1
+    assert report["rejected"] == 1
+    assert report["rejects"] == [
+        {"row": 152, "reason": ["Order ID sudah ada di database"]}
+    ]
+    assert db.query(DeliveryData).count() == len(workbook)
@@ -0,0 +1,67 @@
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import polars as pl
+import pytest
+
+from app.services.polars_service import PolarsDataProcessor
+
+
+def _transactions(n_orders: int = 400, seed: int = 7) -> pl.DataFrame:
+    rng = np.random.default_rng(seed)
+    weights = np.linspace(3, 0.2, 14)
+    orders, items = [], []
+    for order in range(n_orders):
+        basket = rng.choice(
+            14, size=rng.integers(1, 7), replace=False, p=weights / weights.sum()
+        )
+        orders += [f"O{order}"] * len(basket)
+        items += [f"item-{i:02d}" for i in basket]
+    return pl.DataFrame({"order": orders, "item": items})
+
+
+def _brute_force(df: pl.DataFrame, min_count: int) -> dict:
+    baskets = df.group_by("order").agg(pl.col("item").unique().sort())["item"]
+    counts = Counter(
+        subset
+        for basket in baskets
+        for size in range(1, len(basket) + 1)
+        for subset in combinations(basket, size)
+    )
+    return {itemset: c for itemset, c in counts.items() if c >= min_count}
+
+
+@pytest.mark.parametrize(
+    "n_partitions,block_bytes", [(1, 64 << 20), (3, 64 << 20), (2, 64)]
+)
+def test_itemsets_match_brute_force(n_partitions, block_bytes):
+    df = _transactions()
+    catalog, itemsets, n_transactions = PolarsDataProcessor.mine_frequent_itemsets(
+        df,
+        "order",
+        "item",
+        min_support=0.03,
+        n_partitions=n_partitions,
+        block_bytes=block_bytes,
+    )
+    named = {
+        tuple(sorted(catalog[i] for i in itemset)): c for itemset, c in itemsets.items()
+    }
+    assert n_transactions == 400
+    assert max(map(len, named)) >= 3
+    assert named == _brute_force(df, min_count=12)
+
+
+def test_max_len_limits_itemset_size():
+    _, itemsets, _ = PolarsDataProcessor.mine_frequent_itemsets(
+        _transactions(), "order", "item", min_support=0.03, max_len=2
+    )
+    assert max(map(len, itemsets)) == 2
+
+
+def test_candidates_are_pruned_by_infrequent_subsets():
+    level = np.array([[0, 1], [0, 2], [0, 3], [1, 2]])
+    parents, items = PolarsDataProcessor._apriori_candidates(level)
+    # (0, 1, 3) dan (0, 2, 3) gugur karena (1, 3) dan (2, 3) tidak frequent
+    assert np.column_stack([level[parents], items]).tolist() == [[0, 1, 2]]
@@ -0,0 +1,129 @@
+import fcntl
+import multiprocessing
+import os
+import time
+import uuid
+
+import pytest
+
+from app.services import job_queue
+from benchmarks.datagen import make_workbook, to_bytes
+
+
+@pytest.fixture
+def root():
+    root = job_queue._ensure_store()
+    yield root
+    with job_queue._connect(root) as conn:
+        conn.execute("DELETE FROM jobs")
+
+
+def _add_job(root: str, owner, status: str = "running") -> str:
+    job_id = uuid.uuid4().hex
+    with job_queue._connect(root) as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, status, owner, created_at) "
+            "VALUES (?, 'profile', ?, ?, ?)",
+            (job_id, status, owner, job_queue._now()),
+        )
+    return job_id
+
+
+def _status(job_id: str) -> str:
+    return job_queue.get_job(job_id)["status"]
+
+
+def _hold_owner_lock(root: str, owner: str):
+    """Mensimulasikan worker server lain yang masih hidup"""
+    f = open(job_queue._owner_path(root, owner), "a")
+    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    return f
+
+
+def _start_store() -> None:
+    job_queue._ensure_store()
+
+
+def test_recovery_only_fails_jobs_of_dead_owners(root):
+    other = _hold_owner_lock(root, "other-worker")
+    live = [
+        _add_job(root, "other-worker", "running"),
+        _add_job(root, "other-worker", "queued"),
+        _add_job(root, job_queue._owner, "queued"),
+    ]
+    dead = [_add_job(root, "crashed-worker"), _add_job(root, None, "queued")]
+
+    assert job_queue.recover_orphaned_jobs(root) == 2
+    assert [_status(job_id) for job_id in live] == ["running", "queued", "queued"]
+    assert {_status(job_id) for job_id in dead} == {"failed"}
+
+    other.close()
+    assert job_queue.recover_orphaned_jobs(root) == 2
+    assert _status(live[0]) == _status(live[1]) == "failed"
+    assert _status(live[2]) == "queued"
+    assert not os.path.exists(job_queue._owner_path(root, "other-worker"))
+
+
+def test_starting_another_worker_keeps_active_jobs(root):
+    job_id = _add_job(root, job_queue._owner, "queued")
+    process = multiprocessing.get_context("spawn").Process(target=_start_store)
+    process.start()
+    process.join(60)
+    assert process.exitcode == 0
+    assert _status(job_id) == "queued"
+
+    # Lock owner proses yang sudah selesai dilepas dan dibersihkan
+    assert job_queue.recover_orphaned_jobs(root) == 0
+    assert os.listdir(os.path.join(root, "owners")) == [f"{job_queue._owner}.lock"]
+
+
+def test_submitted_job_completes(root):
+    contents = to_bytes(make_workbook(200), "parquet")
+    job = job_queue.submit_job("profile", {}, contents, "upload.parquet")
+    assert job["owner"] == job_queue._owner
+
+    deadline = time.monotonic() + 120
+    while _status(job["id"]) in ("queued", "running"):
+        assert time.monotonic() < deadline
+        time.sleep(0.1)
+    assert _status(job["id"]) == "completed"
+    assert job_queue.get_job_result(job["id"])["rows"] == 200
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"mode": "insert"},
+        {"restaurant_id": " "},
+        {"restaurant_id": "r1", "mode": "replace"},
+        {"restaurant_id": "r1", "batch_size": 0},
+    ],
+)
+def test_invalid_ingest_params_fail_before_submit(root, params):
+    contents = to_bytes(make_workbook(20), "parquet")
+    with pytest.raises(ValueError):
+        job_queue.submit_job("ingest", params, contents, "upload.parquet")
+    with pytest.raises(ValueError, match="memerlukan file"):
+        job_queue.submit_job("ingest", {"restaurant_id": "r1"})
+    assert job_queue.list_jobs() == []
+
+
+def test_ingest_endpoints_return_400_for_invalid_params(root):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    client = TestClient(app)
+    upload = {"file": ("upload.parquet", to_bytes(make_workbook(20), "parquet"))}
+    response = client.post(
+        "/api/v1/delivery-data/ingest",
+        params={"restaurant_id": "r1", "mode": "replace", "background": True},
+        files=upload,
+    )
+    assert response.status_code == 400
+    response = client.post(
+        "/api/v1/jobs/", data={"kind": "ingest", "params": "{}"}, files=upload
+    )
+    assert response.status_code == 400
+    assert "restaurant_id" in response.json()["detail"]
+    assert job_queue.list_jobs() == []
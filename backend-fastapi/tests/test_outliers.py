@@ -0,0 +1,79 @@
+import polars as pl
+import pytest
+
+from app.services.polars_service import PolarsDataProcessor
+
+
+@pytest.fixture
+def frame() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "distance": [1.0, 2.0, 2.5, 3.0, 3.5, 4.0, None, 40.0, 2.2, -30.0],
+            "duration": [20, 22, 25, 24, 300, 23, 21, 26, None, 22],
+            "label": list("abcdefghij"),
+        }
+    )
+
+
+def _baseline_handle_outliers(df: pl.DataFrame, column: str, method: str):
+    """Implementasi handle_outliers sebelum engine multi-kolom"""
+    if method == "iqr":
+        q1 = df[column].quantile(0.25)
+        q3 = df[column].quantile(0.75)
+        iqr = q3 - q1
+        lower = q1 - 1.5 * iqr
+        upper = q3 + 1.5 * iqr
+        return df.filter((pl.col(column) >= lower) & (pl.col(column) <= upper))
+    mean = df[column].mean()
+    std = df[column].std()
+    return df.filter((pl.col(column) - mean).abs() <= 3 * std)
+
+
+@pytest.mark.parametrize("method", ["iqr", "zscore"])
+@pytest.mark.parametrize("column", ["distance", "duration"])
+def test_handle_outliers_matches_baseline(frame, column, method):
+    result = PolarsDataProcessor.handle_outliers(frame, column, method)
+    assert result.equals(_baseline_handle_outliers(frame, column, method))
+    assert result[column].null_count() == 0
+
+
+def test_multi_statistics_come_from_the_original_frame(frame):
+    _, report = PolarsDataProcessor.handle_outliers_multi(
+        frame, ["distance", "duration"], mode="drop"
+    )
+    for column in ("distance", "duration"):
+        _, single = PolarsDataProcessor.handle_outliers_multi(frame, [column])
+        assert report[column] == single[column]
+    assert report["distance"]["outliers"] == 2
+    assert report["duration"]["outliers"] == 1
+
+
+def test_multi_modes(frame):
+    columns = ["distance", "duration"]
+    flagged, report = PolarsDataProcessor.handle_outliers_multi(frame, columns)
+    assert flagged["distance_outlier"].to_list() == [
+        False, False, False, False, False, False, False, True, False, True
+    ]  # fmt: skip
+    assert flagged["is_outlier"].sum() == 3
+
+    clipped, _ = PolarsDataProcessor.handle_outliers_multi(frame, columns, mode="clip")
+    assert clipped["distance"].max() == report["distance"]["upper"]
+    assert clipped["distance"].min() == report["distance"]["lower"]
+    assert clipped["distance"].null_count() == 1
+
+    dropped, _ = PolarsDataProcessor.handle_outliers_multi(frame, columns, mode="drop")
+    # Null bukan outlier: baris g (distance null) dan i (duration null) tetap ada
+    assert dropped["label"].to_list() == list("abcdfgi")
+
+
+def test_multi_defaults_to_numeric_columns_and_mad(frame):
+    result, report = PolarsDataProcessor.handle_outliers_multi(frame, method="mad")
+    assert set(report) == {"distance", "duration"}
+    assert result.filter(pl.col("is_outlier"))["label"].to_list() == ["e", "h", "j"]
+
+
+def test_multi_rejects_unknown_method_and_mode(frame):
+    with pytest.raises(ValueError):
+        PolarsDataProcessor.handle_outliers_multi(frame, method="tukey")
+    with pytest.raises(ValueError):
+        PolarsDataProcessor.handle_outliers_multi(frame, mode="winsorize")
@@ -0,0 +1,74 @@
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from app.services.recommendation_index import (
+    RecommendationIndex,
+    _read_rows,
+    get_recommendation_index,
+    rebuild_recommendation_index,
+    refresh_recommendation_index,
+)
+
+
+def _assert_matches_full_build(db, index: RecommendationIndex) -> None:
+    """Statistik incremental harus sama dengan index yang dibangun dari nol"""
+    fresh = RecommendationIndex()
+    fresh.apply(_read_rows(db, fresh))
+    assert index.n_rows == fresh.n_rows
+    for name, table in fresh.tables.items():
+        keys = [c for c in table.columns if c != "count"]
+        assert_frame_equal(
+            index.tables[name].sort(keys), table.sort(keys), check_dtypes=False
+        )
+
+
+def test_refresh_adds_only_new_rows(db, workbook, ingest):
+    ingest(workbook.head(200))
+    rebuild_recommendation_index(db)
+    assert refresh_recommendation_index(db) == 0
+
+    assert ingest(workbook.tail(100))["inserted"] == 100
+    assert refresh_recommendation_index(db) == 100
+    assert refresh_recommendation_index(db) == 0
+    _assert_matches_full_build(db, get_recommendation_index())
+
+
+def test_refresh_during_ingest_does_not_skip_batches(db, workbook, ingest):
+    rebuild_recommendation_index(db)
+    refreshed = []
+    ingest(
+        workbook,
+        batch_size=40,
+        progress=lambda fraction, message=None: refreshed.append(
+            refresh_recommendation_index(db)
+        ),
+    )
+    refresh_recommendation_index(db)
+    assert sum(refreshed) == len(workbook)
+    _assert_matches_full_build(db, get_recommendation_index())
+
+
+def test_upserted_rows_are_not_counted_twice(db, workbook, ingest):
+    ingest(workbook)
+    rebuild_recommendation_index(db)
+    changed_ids = workbook["Order ID"].head(20).to_list()
+    corrected = workbook.with_columns(
+        pl.when(pl.col("Order ID").is_in(changed_ids))
+        .then(pl.lit("Jakarta"))
+        .otherwise(pl.col("Location"))
+        .alias("Location")
+    )
+
+    assert ingest(corrected, mode="upsert")["updated"] > 0
+    refresh_recommendation_index(db)
+    index = get_recommendation_index()
+    assert index.n_rows == len(workbook)
+    _assert_matches_full_build(db, index)
+
+
+def test_status_reports_keyset_watermark(db, workbook, ingest):
+    ingest(workbook)
+    status = rebuild_recommendation_index(db).status()
+    assert status["n_rows"] == len(workbook)
+    assert isinstance(status["watermark_id"], str)
+    assert "watermark_ids" not in status
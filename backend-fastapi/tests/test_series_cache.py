@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services import series_cache
+from app.services.series_cache import get_aggregated_series
+
+# 2024-01-05 11:22:48 UTC dan 2024-01-06 23:59:59.999 UTC dalam epoch milidetik
+_MS_ROWS = [("a", 1704453768000), ("b", 1704453768000), ("c", 1704585599999)]
+
+
+@pytest.fixture
+def prisma_db(tmp_path):
+    """Tabel DeliveryData ala Prisma: orderTime INTEGER epoch milidetik"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'prisma.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                'CREATE TABLE "DeliveryData" (id TEXT PRIMARY KEY, '
+                '"restaurantId" TEXT, "orderTime" DATETIME, '
+                '"uploadedAt" DATETIME, version INTEGER)'
+            )
+        )
+        for row_id, order_time in _MS_ROWS:
+            conn.execute(
+                text(
+                    'INSERT INTO "DeliveryData" VALUES '
+                    "(:id, 'r1', :order_time, :order_time, 1)"
+                ),
+                {"id": row_id, "order_time": order_time},
+            )
+    series_cache._series_cache.clear()
+    with Session(engine) as session:
+        yield session
+    series_cache._series_cache.clear()
+    engine.dispose()
+
+
+def test_integer_epoch_ms_is_bucketed(prisma_db):
+    series, _ = get_aggregated_series(prisma_db, "orders", "day")
+    assert series.rows() == [
+        (datetime(2024, 1, 5), 2.0),
+        (datetime(2024, 1, 6), 1.0),
+    ]
+
+    hourly, _ = get_aggregated_series(prisma_db, "orders", "hour")
+    assert hourly["period"].to_list() == [
+        datetime(2024, 1, 5, 11),
+        datetime(2024, 1, 6, 23),
+    ]
+
+
+def test_text_and_integer_storage_share_buckets(prisma_db):
+    prisma_db.execute(
+        text(
+            'INSERT INTO "DeliveryData" VALUES '
+            "('d', 'r1', '2024-01-08 09:00:00.000000', 1704585600000, 1)"
+        )
+    )
+    prisma_db.commit()
+
+    weekly, _ = get_aggregated_series(prisma_db, "orders", "week")
+    assert weekly.rows() == [
+        (datetime(2024, 1, 1), 3.0),
+        (datetime(2024, 1, 8), 1.0),
+    ]
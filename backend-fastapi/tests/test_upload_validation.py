@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import polars as pl
+
+from app.services.upload_validation import cleanse_delivery_upload
+
+NOW = datetime(2024, 3, 1, 12)
+STAMP = int(NOW.timestamp() * 1000)
+
+
+def _cleanse(columns: dict) -> tuple:
+    data, errors, _ = cleanse_delivery_upload(pl.DataFrame(columns), now=NOW)
+    return data, errors
+
+
+def _messages(errors: pl.DataFrame, column: str) -> list:
+    return errors.filter(pl.col("column") == column)[["row", "message"]].rows()
+
+
+def test_parse_boolean_matches_cleansing_ts():
+    # parseBoolean: hanya boolean dan teks true/yes/1; angka selalu false
+    data, _ = _cleanse(
+        {
+            "Is Peak Hour": [1, 0, 1],
+            "Is Weekend": [1.0, 0.0, None],
+            "Is Delayed": ["1", "0", "Yes"],
+        }
+    )
+    assert data["isPeakHour"].to_list() == [False, False, False]
+    assert data["isWeekend"].to_list() == [False, False, False]
+    assert data["isDelayed"].to_list() == [True, False, True]
+
+    data, _ = _cleanse({"Is Delayed": [True, False, None]})
+    assert data["isDelayed"].to_list() == [True, False, False]
+
+
+def test_blank_follows_javascript_truthiness():
+    # !value: string "0" truthy, angka 0 falsy
+    data, errors = _cleanse(
+        {"Order ID": ["0", "", "ORD7"], "Location": ["0", " ", None]}
+    )
+    assert _messages(errors, "Order ID") == [
+        (2, "Format Order ID tidak standar"),
+        (3, "Order ID diperlukan, menggunakan default"),
+    ]
+    assert _messages(errors, "Location") == [(4, "Lokasi diperlukan")]
+    assert data["orderId"].to_list() == [
+        f"0_{STAMP}_0",
+        f"ORD{STAMP}1",
+        f"ORD7_{STAMP}_2",
+    ]
+    assert data["location"].to_list() == ["0", "", ""]
+
+    data, errors = _cleanse({"Order ID": [0.0, 1001.0, 12.5]})
+    assert _messages(errors, "Order ID")[0] == (
+        2,
+        "Order ID diperlukan, menggunakan default",
+    )
+    # String(1001) di JavaScript tanpa akhiran ".0"
+    assert data["orderId"].to_list()[1:] == [
+        f"1001_{STAMP}_1",
+        f"12.5_{STAMP}_2",
+    ]
@@ -0,0 +1,11 @@
+-- Kolom upsert ingest FastAPI (backend-fastapi/app/services/ingestion.py).
+-- Aman untuk database yang dibuat lewat `prisma db push` (kolom mungkin sudah
+-- ada) maupun database kosong (tabel dibuat oleh migrasi berikutnya).
+DO $$
+BEGIN
+  IF to_regclass('"DeliveryData"') IS NOT NULL THEN
+    ALTER TABLE "DeliveryData"
+      ADD COLUMN IF NOT EXISTS "updatedAt" TIMESTAMP(3),
+      ADD COLUMN IF NOT EXISTS "rowHash" TEXT;
+  END IF;
+END $$;